@@ -2,6 +2,7 @@ import asyncio
 from sqlalchemy import select
 from src.db.session import get_session
 from src.db.models import Company
+from src.db.generation import bump_generation
 from src.semantic.classifier_company import company_classifier
 
 async def backfill_classifications():
@@ -30,6 +31,7 @@ async def backfill_classifications():
             if not company.category:
                 company.category = "Agency / Consultancy" if company.classification == "Competitor" else "SaaS / Tools"
             
+        await bump_generation(session, reason="backfill_classification")
         await session.commit()
         print("Backfill complete.")
 
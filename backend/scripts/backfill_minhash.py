@@ -0,0 +1,60 @@
+import argparse
+import asyncio
+import sys
+import os
+
+from sqlalchemy import select
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.db.session import AsyncSessionLocal
+from src.db.models import Job, JobDescription
+from src.ingestion.minhash import (
+    minhasher, minhash_text, signature_bytes, bulk_signature_stmt, insert_bands_stmt, band_rows,
+)
+
+BANDS_PER_INSERT = 10000
+
+async def main(args):
+    print("Computing MinHash signatures for jobs without one...")
+    last_id, total, skipped = 0, 0, 0
+    async with AsyncSessionLocal() as session:
+        while True:
+            result = await session.execute(
+                select(Job.id, Job.title, JobDescription.body)
+                .outerjoin(JobDescription, JobDescription.content_hash == Job.description_hash)
+                .where(Job.minhash.is_(None), Job.id > last_id)
+                .order_by(Job.id)
+                .limit(args.chunk_size)
+            )
+            rows = result.all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            signatures, bands = [], []
+            for row in rows:
+                signature = minhasher.signature(minhash_text(row.title, row.body))
+                if signature is None:
+                    skipped += 1
+                    continue
+                signatures.append((row.id, signature_bytes(signature)))
+                bands.extend(band_rows(row.id, minhasher.band_keys(signature)))
+
+            if signatures and not args.dry_run:
+                await session.execute(bulk_signature_stmt(signatures))
+                # 3 bind parameters per band row; stay under asyncpg's 32767 limit
+                for i in range(0, len(bands), BANDS_PER_INSERT):
+                    await session.execute(insert_bands_stmt(bands[i:i + BANDS_PER_INSERT]))
+                await session.commit()
+            total += len(signatures)
+            print(f"  ... {total} jobs (up to id {last_id})")
+
+    verb = "Would sign" if args.dry_run else "Signed"
+    print(f"Done! {verb} {total} jobs ({skipped} without text skipped).")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill jobs.minhash and job_minhash_bands for near-duplicate detection.")
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--dry-run", action="store_true")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,87 @@
+import argparse
+import asyncio
+import sys
+import os
+import time
+
+from sqlalchemy import select, func
+from sqlalchemy.orm import selectinload
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.db.session import AsyncSessionLocal
+from src.db.models import Job, Company
+from src.semantic.schema import JobOut
+from src.api.queries import job_list_select
+
+def orm_stmt(limit: int):
+    # What list_jobs used to run: full Job rows + a second selectinload query for Company
+    return (
+        select(Job)
+        .options(selectinload(Job.company))
+        .join(Job.company)
+        .where(Job.is_ai_search.is_(True))
+        .order_by(Job.posted_at.desc().nullslast(), Job.id.desc())
+        .limit(limit)
+    )
+
+def projection_stmt(limit: int):
+    return (
+        job_list_select()
+        .where(Job.is_ai_search.is_(True))
+        .order_by(Job.posted_at.desc().nullslast(), Job.id.desc())
+        .limit(limit)
+    )
+
+async def payload_bytes(session, stmt) -> int:
+    # Approximate bytes sent by Postgres: on-disk size of every returned row
+    sub = stmt.subquery()
+    result = await session.execute(select(func.coalesce(func.sum(func.pg_column_size(sub.table_valued())), 0)))
+    return int(result.scalar_one())
+
+async def run_orm(session, limit):
+    result = await session.execute(orm_stmt(limit))
+    jobs = result.scalars().all()
+    out = []
+    for job in jobs:
+        job.company_name = job.company.name
+        out.append(JobOut.model_validate(job, from_attributes=True))
+    session.expunge_all()
+    return out
+
+async def run_projection(session, limit):
+    result = await session.execute(projection_stmt(limit))
+    return [JobOut.model_validate(row) for row in result.mappings().all()]
+
+async def timed(fn, session, limit, iterations):
+    await fn(session, limit)  # warm-up
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await fn(session, limit)
+    return (time.perf_counter() - started) / iterations * 1000
+
+async def main(args):
+    async with AsyncSessionLocal() as session:
+        orm_ms = await timed(run_orm, session, args.limit, args.iterations)
+        proj_ms = await timed(run_projection, session, args.limit, args.iterations)
+
+        # ORM path also fetched each distinct company row in the selectinload query
+        orm_bytes = await payload_bytes(session, select(Job).where(Job.is_ai_search.is_(True))
+                                        .order_by(Job.posted_at.desc().nullslast(), Job.id.desc()).limit(args.limit))
+        orm_bytes += await payload_bytes(session, select(Company).where(
+            Company.id.in_(select(orm_stmt(args.limit).subquery().c.company_id))
+        ))
+        proj_bytes = await payload_bytes(session, projection_stmt(args.limit))
+
+    print(f"list_jobs limit={args.limit}, {args.iterations} iterations")
+    print(f"{'':12s} {'bytes':>12s} {'ms/request':>12s}")
+    print(f"{'orm':12s} {orm_bytes:12d} {orm_ms:12.1f}")
+    print(f"{'projection':12s} {proj_bytes:12d} {proj_ms:12.1f}")
+    if orm_bytes and orm_ms:
+        print(f"reduction: {100 * (1 - proj_bytes / orm_bytes):.0f}% bytes, {100 * (1 - proj_ms / orm_ms):.0f}% time")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare full-ORM vs column-projection job list queries.")
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
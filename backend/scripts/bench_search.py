@@ -0,0 +1,58 @@
+import argparse
+import asyncio
+import statistics
+import sys
+import os
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.api.filters import JobFilters
+from src.api.search import hybrid_search, text_candidates, query_embedding
+
+DEFAULT_QUERIES = [
+    "answer engine optimization",
+    "AEO lead",
+    "technical seo python",
+    "search relevance engineer",
+    "generative search strategist",
+    "\"head of seo\" -intern",
+]
+
+def no_filters() -> JobFilters:
+    return JobFilters(
+        role_tier=None, source=None, remote_flag=None, seniority=None,
+        opp_athena_view=None, posted_after=None, posted_before=None, open_only=False,
+    )
+
+async def timed(fn, queries, iterations) -> list[float]:
+    samples = []
+    for _ in range(iterations):
+        for q in queries:
+            started = time.perf_counter()
+            await fn(q)
+            samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+def report(name: str, samples: list[float]):
+    samples = sorted(samples)
+    p95 = samples[max(0, int(len(samples) * 0.95) - 1)]
+    print(f"{name:8s} p50={statistics.median(samples):7.1f} ms  p95={p95:7.1f} ms  n={len(samples)}")
+
+async def main(args):
+    filters = no_filters()
+    queries = args.query or DEFAULT_QUERIES
+    for q in queries:
+        query_embedding(q)  # model load + embedding cache warm-up
+
+    text = await timed(lambda q: text_candidates(q, filters, args.limit), queries, args.iterations)
+    hybrid = await timed(lambda q: hybrid_search(q, filters, args.limit), queries, args.iterations)
+    report("text", text)
+    report("hybrid", hybrid)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Latency of text vs hybrid job search against the configured DB.")
+    parser.add_argument("--query", action="append", help="Query to run (repeatable)")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=10)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,82 @@
+import argparse
+import json
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.db.models import Job, Company
+from src.semantic.schema import JobOut
+from src.api.responses import rows_response
+
+def sample_rows(n: int) -> list[dict]:
+    base = datetime(2025, 1, 1)
+    return [
+        {
+            "id": i,
+            "title": f"Senior AI Search Engineer {i}",
+            "company_name": f"Company {i % 50}",
+            "location": "Remote - US",
+            "posted_at": base - timedelta(hours=i),
+            "url": f"https://example.com/jobs/{i}",
+            "relevance_score": 0.5 + (i % 40) / 100,
+            "source": "seojobs",
+            "is_ai_search": True,
+            "role_tier": "core_ai_search",
+            "remote_flag": "remote",
+            "employment_type": "full_time",
+            "seniority": "senior",
+            "ai_forward": True,
+            "opp_athena_view": "Hot Lead",
+            "opp_role_type": "practitioner",
+            "opp_confidence": 0.8,
+        }
+        for i in range(n)
+    ]
+
+def orm_path(rows: list[dict]) -> bytes:
+    # Old path: hydrate ORM entities, validate into JobOut, then FastAPI re-validates
+    # against response_model and encodes via jsonable_encoder + json.dumps
+    jobs = []
+    for row in rows:
+        fields = {k: v for k, v in row.items() if k != "company_name"}
+        job = Job(**fields)
+        job.company = Company(id=row["id"] % 50, name=row["company_name"])
+        jobs.append(job)
+    items = [JobOut.model_validate(j).model_copy(update={"company_name": j.company.name}) for j in jobs]
+    adapter = TypeAdapter(list[JobOut])
+    validated = adapter.validate_python([i.model_dump() for i in items])
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+def fast_path(rows: list[dict]) -> bytes:
+    return rows_response(rows, JobOut).body
+
+def bench(fn, rows, repeats: int) -> float:
+    fn(rows)  # warm up
+    started = time.perf_counter()
+    for _ in range(repeats):
+        fn(rows)
+    return (time.perf_counter() - started) / repeats * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare list serialization paths (no DB needed).")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = sample_rows(args.rows)
+    orm_ms = bench(orm_path, rows, args.repeats)
+    fast_ms = bench(fast_path, rows, args.repeats)
+
+    print(f"{args.rows} rows, {args.repeats} repeats")
+    print(f"  ORM + pydantic + jsonable_encoder: {orm_ms:8.2f} ms")
+    print(f"  row mappings + orjson:             {fast_ms:8.2f} ms")
+    print(f"  speedup: {orm_ms / fast_ms:.1f}x")
+
+if __name__ == "__main__":
+    main()
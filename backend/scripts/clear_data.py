@@ -6,6 +6,7 @@ from sqlalchemy import text
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
 from src.db.session import AsyncSessionLocal
+from src.db.generation import bump_generation
 
 async def clear_data():
     print("Clearing all jobs and companies...")
@@ -15,6 +16,7 @@ async def clear_data():
         # We don't know exact DB type for sure here (pg vs sqlite), so standard DELETE is safer
         await session.execute(text("DELETE FROM jobs"))
         await session.execute(text("DELETE FROM companies"))
+        await bump_generation(session, reason="clear_data")
         await session.commit()
     print("Data cleared.")
 
@@ -0,0 +1,33 @@
+import argparse
+import asyncio
+import sys
+import os
+from collections import Counter
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.db.session import AsyncSessionLocal
+from src.semantic.clustering import CompanyClusterer, update_company_clusters, CLUSTER_LABELS
+
+async def main(args):
+    clusterer = CompanyClusterer(n_clusters=args.n_clusters)
+    if args.rebuild:
+        print("Rebuilding cluster model from scratch...")
+        clusterer.reset()
+
+    async with AsyncSessionLocal() as session:
+        assignments = await update_company_clusters(session, clusterer=clusterer)
+
+    if not assignments:
+        print("No companies with embeddings (or too few to cluster).")
+        return
+
+    print(f"Assigned {len(assignments)} companies:")
+    for cluster_id, count in sorted(Counter(assignments.values()).items()):
+        print(f"  cluster {cluster_id} ({CLUSTER_LABELS.get(cluster_id, '-')}): {count}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cluster all companies from their stored job embeddings.")
+    parser.add_argument("--rebuild", action="store_true", help="Discard the saved model and start over")
+    parser.add_argument("--n-clusters", type=int, default=None)
+    asyncio.run(main(parser.parse_args()))
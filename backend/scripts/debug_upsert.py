@@ -45,7 +45,7 @@ async def main():
             db_job = result.scalars().first()
             if db_job:
                 print(f"Success! Job inserted with ID {db_job.id}", flush=True)
-                print(f"Meta: {db_job.description[:50]}...", flush=True)
+                print(f"Meta: remote={db_job.remote_flag} seniority={db_job.seniority} ai_forward={db_job.ai_forward}", flush=True)
             else:
                 print("Failed! Job not found.", flush=True)
     except Exception as e:
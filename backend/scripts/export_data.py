@@ -0,0 +1,61 @@
+import argparse
+import asyncio
+import sys
+import os
+from datetime import datetime
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.api.filters import CompanyFilters, JobFilters
+from src.db.export import FORMATS, export_companies_stmt, export_jobs_stmt, export_stream
+from src.core.config import settings
+
+def build_stmt(args):
+    if args.kind == "jobs":
+        filters = JobFilters(
+            role_tier=args.role_tier,
+            source=args.source,
+            remote_flag=args.remote_flag,
+            seniority=args.seniority,
+            opp_athena_view=args.opp_athena_view,
+            posted_after=args.posted_after,
+            posted_before=args.posted_before,
+            open_only=args.open_only,
+        )
+        return filters.apply(export_jobs_stmt())
+    filters = CompanyFilters(min_roles=args.min_roles, category=args.category, region=args.region)
+    return filters.apply(export_companies_stmt())
+
+async def main(args):
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    written = 0
+    try:
+        async for chunk in export_stream(build_stmt(args), args.format, args.chunk_size):
+            out.write(chunk)
+            written += len(chunk)
+    finally:
+        if args.output:
+            out.close()
+    if args.output:
+        print(f"Wrote {written} bytes to {args.output}", file=sys.stderr)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stream jobs or companies to NDJSON, CSV or Parquet.")
+    parser.add_argument("kind", choices=["jobs", "companies"])
+    parser.add_argument("--format", choices=FORMATS, default="ndjson")
+    parser.add_argument("--output", "-o", default=None, help="File to write (default: stdout)")
+    parser.add_argument("--chunk-size", type=int, default=settings.EXPORT_CHUNK_SIZE)
+    # Job filters (same as /api/jobs)
+    parser.add_argument("--role-tier")
+    parser.add_argument("--source")
+    parser.add_argument("--remote-flag")
+    parser.add_argument("--seniority")
+    parser.add_argument("--opp-athena-view")
+    parser.add_argument("--posted-after", type=datetime.fromisoformat)
+    parser.add_argument("--posted-before", type=datetime.fromisoformat)
+    parser.add_argument("--open-only", action="store_true", help="Skip jobs closed by the liveness sweep")
+    # Company filters (same as /api/companies)
+    parser.add_argument("--min-roles", type=int, default=1)
+    parser.add_argument("--category")
+    parser.add_argument("--region")
+    asyncio.run(main(parser.parse_args()))
@@ -1,20 +1,20 @@
 import asyncio
 import sys
 import os
-from sqlalchemy import select
+from sqlalchemy import select, func
 
 # Add backend to path
 sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
 
 from src.db.session import AsyncSessionLocal
-from src.db.models import Job
+from src.db.models import Job, JobDescription
 
 async def main():
     async with AsyncSessionLocal() as session:
-        # Find jobs with None or empty description
-        stmt = select(Job).where((Job.description == None) | (Job.description == ""))
+        # Jobs without a stored description body
+        stmt = select(Job.id, Job.title, Job.source).where(Job.description_hash.is_(None))
         result = await session.execute(stmt)
-        jobs = result.scalars().all()
+        jobs = result.all()
         
         print(f"Total jobs missing description: {len(jobs)}")
         
@@ -26,13 +26,16 @@ async def main():
             print("Success! All jobs have descriptions.")
 
         # Also print stats on description length
-        stmt_all = select(Job)
-        res_all = await session.execute(stmt_all)
-        all_jobs = res_all.scalars().all()
-        print(f"Total jobs in DB: {len(all_jobs)}")
-        if all_jobs:
-            avg_len = sum(len(j.description or "") for j in all_jobs) / len(all_jobs)
-            print(f"Average description length: {avg_len:.0f} chars")
+        total = (await session.execute(select(func.count(Job.id)))).scalar_one()
+        print(f"Total jobs in DB: {total}")
+        if total:
+            avg_len = (await session.execute(
+                select(func.avg(func.coalesce(func.length(JobDescription.body), 0)))
+                .select_from(Job)
+                .outerjoin(JobDescription, JobDescription.content_hash == Job.description_hash)
+            )).scalar_one()
+            distinct = (await session.execute(select(func.count()).select_from(JobDescription))).scalar_one()
+            print(f"Average description length: {float(avg_len or 0):.0f} chars ({distinct} distinct bodies)")
 
 if __name__ == "__main__":
     asyncio.run(main())
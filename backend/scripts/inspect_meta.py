@@ -12,12 +12,15 @@ async def inspect():
     async with AsyncSessionLocal() as session:
         result = await session.execute(select(Job).limit(5))
         jobs = result.scalars().all()
-        print(f"Found {len(jobs)} jobs. Checking for OPP_META...")
+        print(f"Found {len(jobs)} jobs. Checking opportunity metadata...")
         for job in jobs:
-            if "OPP_META" in (job.description or ""):
-                print(f"MATCH [Job {job.id}]: {job.description[:150]}...")
+            if job.opp_athena_view:
+                print(
+                    f"MATCH [Job {job.id}]: athena_view={job.opp_athena_view}; role_type={job.opp_role_type}; "
+                    f"buyer_or_seller={job.opp_buyer_or_seller}; confidence={job.opp_confidence}"
+                )
             else:
-                print(f"NO MATCH [Job {job.id}]: {job.description[:50]}...")
+                print(f"NO MATCH [Job {job.id}]: {job.title[:50]}...")
 
 if __name__ == "__main__":
     asyncio.run(inspect())
@@ -0,0 +1,53 @@
+import argparse
+import asyncio
+import sys
+import os
+
+from sqlalchemy import select
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.db.session import AsyncSessionLocal
+from src.db.models import Company
+from src.db.generation import bump_generation
+from src.ingestion.entities import (
+    similar_pairs_stmt, set_similarity_threshold_stmt, job_counts_stmt, merge_plan, merge_companies_stmts,
+)
+from src.core.config import settings
+
+async def main(args):
+    async with AsyncSessionLocal() as session:
+        await session.execute(set_similarity_threshold_stmt(args.threshold))
+        pairs = (await session.execute(similar_pairs_stmt(args.threshold))).all()
+        if not pairs:
+            print(f"No near-duplicate companies at similarity >= {args.threshold}.")
+            return
+
+        ids = {p.id_a for p in pairs} | {p.id_b for p in pairs}
+        counts = dict((await session.execute(job_counts_stmt(ids))).all())
+        names = dict((await session.execute(select(Company.id, Company.name).where(Company.id.in_(ids)))).all())
+        plan = merge_plan([(p.id_a, p.id_b) for p in pairs], counts)
+
+        by_canonical: dict[int, list[int]] = {}
+        for duplicate_id, canonical_id in plan.items():
+            by_canonical.setdefault(canonical_id, []).append(duplicate_id)
+        for canonical_id, duplicates in sorted(by_canonical.items()):
+            print(f"{names[canonical_id]!r} [{canonical_id}, {counts.get(canonical_id, 0)} jobs] <- "
+                  + ", ".join(f"{names[d]!r} [{d}, {counts.get(d, 0)} jobs]" for d in sorted(duplicates)))
+
+        print(f"{len(plan)} companies would merge into {len(by_canonical)}.")
+        if not args.apply:
+            print("Dry run; pass --apply to merge.")
+            return
+
+        for stmt in merge_companies_stmts(plan):
+            await session.execute(stmt)
+        await bump_generation(session, reason="merge_companies")
+        await session.commit()
+        print(f"Merged {len(plan)} companies.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge near-duplicate companies (pg_trgm similarity on name_key).")
+    parser.add_argument("--threshold", type=float, default=settings.COMPANY_MATCH_THRESHOLD)
+    parser.add_argument("--apply", action="store_true", help="Re-point jobs and delete duplicates (default: dry run)")
+    asyncio.run(main(parser.parse_args()))
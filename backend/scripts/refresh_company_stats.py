@@ -0,0 +1,20 @@
+import asyncio
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.db.session import AsyncSessionLocal
+from src.db.aggregates import refresh_company_stats_stmt
+from src.db.generation import bump_generation
+
+async def main():
+    print("Recomputing company_stats for all companies...")
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(refresh_company_stats_stmt())
+        await bump_generation(session, reason="refresh_company_stats")
+        await session.commit()
+    print(f"Done! Refreshed {result.rowcount} companies.")
+
+if __name__ == "__main__":
+    asyncio.run(main())
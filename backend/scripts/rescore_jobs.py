@@ -0,0 +1,34 @@
+import argparse
+import asyncio
+import sys
+import os
+
+sys.path.append(os.path.join(os.path.dirname(__file__), ".."))
+
+from src.semantic.rescore import rescore_jobs, DEFAULT_CHUNK_SIZE
+
+async def main(args):
+    print("Re-scoring jobs from stored embeddings...")
+    report = await rescore_jobs(
+        chunk_size=args.chunk_size,
+        dry_run=args.dry_run,
+        update_scores=args.update_scores,
+    )
+
+    print(f"\nScanned {report.scanned} jobs in {report.seconds:.2f}s")
+    if report.transitions:
+        print("Tier transitions:")
+        for (old, new), count in report.transitions.most_common():
+            print(f"  {old or '-':24s} -> {new:24s} {count}")
+    else:
+        print("No tier changes.")
+
+    verb = "Would update" if args.dry_run else "Updated"
+    print(f"{verb} {report.updated} rows ({report.companies_refreshed} company aggregates).")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Recompute relevance scores and tiers from stored job embeddings.")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--dry-run", action="store_true", help="Report transitions without writing")
+    parser.add_argument("--update-scores", action="store_true", help="Also write rows whose score moved but tier did not")
+    asyncio.run(main(parser.parse_args()))
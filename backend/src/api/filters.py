@@ -0,0 +1,82 @@
+from datetime import datetime, timezone
+
+from fastapi import Query
+
+from src.db.models import CompanyStats, Company, Job
+
+def _naive_utc(value: datetime | None) -> datetime | None:
+    # Timestamp columns are naive UTC
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+class JobFilters:
+    """
+    Server-side job filters shared by the job list endpoints.
+    Used as a FastAPI dependency: `filters: JobFilters = Depends()`.
+    """
+
+    def __init__(
+        self,
+        role_tier: str | None = Query(None),
+        source: str | None = Query(None),
+        remote_flag: str | None = Query(None),
+        seniority: str | None = Query(None),
+        opp_athena_view: str | None = Query(None),
+        posted_after: datetime | None = Query(None, description="Only jobs posted at or after this time"),
+        posted_before: datetime | None = Query(None, description="Only jobs posted before this time"),
+        open_only: bool = Query(False, description="Only jobs still listed by their source"),
+    ):
+        self.role_tier = role_tier
+        self.source = source
+        self.remote_flag = remote_flag
+        self.seniority = seniority
+        self.opp_athena_view = opp_athena_view
+        self.posted_after = _naive_utc(posted_after)
+        self.posted_before = _naive_utc(posted_before)
+        self.open_only = open_only
+
+    def apply(self, stmt):
+        if self.role_tier:
+            stmt = stmt.where(Job.role_tier == self.role_tier)
+        if self.source:
+            stmt = stmt.where(Job.source == self.source)
+        if self.remote_flag:
+            stmt = stmt.where(Job.remote_flag == self.remote_flag)
+        if self.seniority:
+            stmt = stmt.where(Job.seniority == self.seniority)
+        if self.opp_athena_view:
+            stmt = stmt.where(Job.opp_athena_view == self.opp_athena_view)
+        if self.posted_after:
+            stmt = stmt.where(Job.posted_at >= self.posted_after)
+        if self.posted_before:
+            stmt = stmt.where(Job.posted_at < self.posted_before)
+        if self.open_only:
+            stmt = stmt.where(Job.closed_at.is_(None))
+        return stmt
+
+class CompanyFilters:
+    """
+    Company filters shared by the companies listing and export.
+    Statements must select from companies joined (or outer-joined) to company_stats.
+    """
+
+    def __init__(
+        self,
+        min_roles: int = Query(1, description="Minimum number of AI Search roles"),
+        category: str | None = Query(None),
+        region: str | None = Query(None),
+    ):
+        self.min_roles = min_roles
+        self.category = category
+        self.region = region
+
+    def apply(self, stmt):
+        if self.min_roles > 0:
+            # Outer-joined companies without stats drop out here too (NULL >= n)
+            stmt = stmt.where(CompanyStats.ai_search_roles >= self.min_roles)
+        if self.category:
+            stmt = stmt.where(Company.category == self.category)
+        if self.region:
+            stmt = stmt.where(Company.region == self.region)
+        return stmt
@@ -0,0 +1,102 @@
+import hashlib
+from urllib.parse import parse_qsl
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.cache import TTLCache
+from src.core.config import settings
+from src.db.generation import GenerationTracker, generation_tracker
+
+_RESPONSE_CACHE = TTLCache(
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS, maxsize=settings.RESPONSE_CACHE_MAXSIZE
+)
+
+def etag_for(generation: int, key) -> str:
+    digest = hashlib.blake2b(repr(key).encode(), digest_size=8).hexdigest()
+    return f'W/"{generation}-{digest}"'
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+class ResponseCacheMiddleware:
+    """
+    In-process cache for GET responses under path_prefix.
+
+    Data only changes when a writer bumps the data generation, so a response is
+    cached under (generation, path, normalized query, gzip) and its ETag is
+    derived from the same key. Clients revalidating with If-None-Match get a 304
+    without touching the database until the generation moves. Only complete,
+    200 responses with a Content-Length are cached; streaming responses pass
+    through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, path_prefix: str = "/api/", tracker: GenerationTracker | None = None):
+        self.app = app
+        self.path_prefix = path_prefix
+        self.tracker = tracker or generation_tracker
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] != "GET" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        generation = await self.tracker.current()
+        if generation is None:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        query = tuple(sorted(parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)))
+        gzip_ok = "gzip" in headers.get("accept-encoding", "")
+        key = (generation, scope["path"], query, gzip_ok)
+        etag = etag_for(generation, key)
+
+        if etag_matches(headers.get("if-none-match"), etag):
+            await send({
+                "type": "http.response.start",
+                "status": 304,
+                "headers": [(b"etag", etag.encode()), (b"cache-control", b"no-cache")],
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        cached = _RESPONSE_CACHE.get(key)
+        if cached is not None:
+            status, raw_headers, body = cached
+            await send({"type": "http.response.start", "status": status, "headers": raw_headers})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        start: Message | None = None
+        chunks: list[bytes] = []
+
+        async def send_wrapper(message: Message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                response_headers = Headers(raw=message["headers"])
+                if (
+                    message["status"] != 200
+                    or "content-length" not in response_headers
+                    or "no-store" in response_headers.get("cache-control", "")
+                ):
+                    await send(message)
+                    return
+                start = {
+                    **message,
+                    "headers": [*message["headers"], (b"etag", etag.encode()), (b"cache-control", b"no-cache")],
+                }
+            elif message["type"] == "http.response.body" and start is not None:
+                chunks.append(message.get("body", b""))
+                if not message.get("more_body", False):
+                    body = b"".join(chunks)
+                    _RESPONSE_CACHE.set(key, (start["status"], start["headers"], body))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": body})
+            else:
+                await send(message)
+
+        await self.app(scope, receive, send_wrapper)
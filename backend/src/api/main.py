@@ -1,13 +1,36 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .routers import companies, jobs, stats
+from fastapi.middleware.gzip import GZipMiddleware
+from .routers import companies, export, jobs, stats
+from .pagination import NEXT_CURSOR_HEADER
+from .http_cache import ResponseCacheMiddleware
+from .stream import job_broadcaster
 from src.core.config import settings
+from src.db.generation import GENERATION_CHANNEL, on_generation_notify
+from src.db.listener import JOBS_CHANNEL, pg_listener
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Each worker LISTENs so writers' commits invalidate every worker's caches
+    if settings.ENABLE_PG_LISTENER:
+        pg_listener.subscribe(GENERATION_CHANNEL, on_generation_notify)
+        pg_listener.subscribe(JOBS_CHANNEL, job_broadcaster.on_notify)
+        pg_listener.start()
+    yield
+    await pg_listener.stop()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"/openapi.json"
+    openapi_url=f"/openapi.json",
+    lifespan=lifespan,
 )
 
+# Innermost first: responses are gzipped, then cached per generation
+app.add_middleware(GZipMiddleware, minimum_size=settings.GZIP_MIN_SIZE)
+app.add_middleware(ResponseCacheMiddleware)
+
 # Set all CORS enabled origins
 app.add_middleware(
     CORSMiddleware,
@@ -15,12 +38,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 # Updated prefixes for v0
 app.include_router(companies.router, prefix="/api/companies", tags=["companies"])
 app.include_router(jobs.router,     prefix="/api/jobs",       tags=["jobs"])
 app.include_router(stats.router,   prefix="/api/stats",      tags=["stats"])
+app.include_router(export.router,  prefix="/api/export",     tags=["export"])
 
 @app.get("/health")
 def health_check():
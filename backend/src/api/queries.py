@@ -0,0 +1,32 @@
+from sqlalchemy import select
+
+from src.db.models import Job, Company
+
+# Exactly the columns JobOut needs (plus Company.name); list endpoints never load
+# description bodies or Job.embedding.
+JOB_OUT_COLUMNS = (
+    Job.id,
+    Job.title,
+    Company.name.label("company_name"),
+    Job.location,
+    Job.posted_at,
+    Job.url,
+    Job.relevance_score,
+    Job.source,
+    Job.is_ai_search,
+    Job.role_tier,
+    Job.remote_flag,
+    Job.employment_type,
+    Job.seniority,
+    Job.ai_forward,
+    Job.opp_athena_view,
+    Job.opp_role_type,
+    Job.opp_confidence,
+)
+
+def job_list_select(*extra_columns):
+    """
+    Single-query projection for JobOut lists (no ORM entities, no selectinload).
+    extra_columns are appended for keyset cursors and are ignored by JobOut.
+    """
+    return select(*JOB_OUT_COLUMNS, *extra_columns).join(Company, Job.company_id == Company.id)
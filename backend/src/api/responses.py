@@ -0,0 +1,25 @@
+from typing import Iterable, Mapping
+
+import orjson
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+# Our own: FastAPI's ORJSONResponse is deprecated and warns on every response
+class ORJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+def row_dicts(rows: Iterable[Mapping], schema: type[BaseModel]) -> list[dict]:
+    """Plain dicts with exactly the keys (and key order) of `schema`."""
+    fields = tuple(schema.model_fields)
+    return [{f: row[f] for f in fields} for row in rows]
+
+def rows_response(rows: Iterable[Mapping], schema: type[BaseModel]) -> ORJSONResponse:
+    """
+    Fast path for read endpoints: serializes plain row mappings straight to JSON
+    bytes, skipping ORM hydration and per-row Pydantic validation. Rows must
+    already carry every schema field.
+    """
+    return ORJSONResponse(row_dicts(rows, schema))
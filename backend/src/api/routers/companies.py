@@ -1,74 +1,110 @@
+from typing import Literal
+
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, tuple_, and_, or_
 from src.db.session import get_session
-from src.db.models import Company, Job
+from src.db.models import Company, CompanyStats, Job
 from src.semantic.schema import CompanyOut, JobOut
+from src.api.filters import CompanyFilters, JobFilters
+from src.api.pagination import encode_cursor, decode_cursor, cursor_int, cursor_datetime, set_next_cursor
+from src.api.queries import job_list_select
+from src.api.responses import rows_response
 
 router = APIRouter()
 
+def after_company_cursor(sort: str, cursor: str):
+    """Keyset condition matching the ORDER BY of the selected sort."""
+    value, company_id = decode_cursor(cursor, 2)
+    company_id = cursor_int(company_id)
+    if sort == "recent":
+        latest = cursor_datetime(value)
+        if latest is None:
+            return and_(CompanyStats.latest_job_at.is_(None), CompanyStats.company_id < company_id)
+        return or_(
+            tuple_(CompanyStats.latest_job_at, CompanyStats.company_id) < tuple_(latest, company_id),
+            CompanyStats.latest_job_at.is_(None),
+        )
+    return tuple_(CompanyStats.ai_search_roles, CompanyStats.company_id) < tuple_(cursor_int(value), company_id)
+
 @router.get("/", response_model=list[CompanyOut])
 async def list_companies(
-    min_roles: int = Query(1, description="Minimum number of AI Search roles"),
-    category: str | None = Query(None),
-    region: str | None = Query(None),
+    filters: CompanyFilters = Depends(),
+    sort: Literal["roles", "recent"] = Query("roles", description="Order by AI-search role count or latest job"),
+    limit: int = Query(1000, ge=1, le=5000),
+    cursor: str | None = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
     session: AsyncSession = Depends(get_session),
 ):
-    # Group companies by AI-search jobs and aggregate titles
+    # Read the precomputed per-company aggregates (no scan over jobs)
     stmt = (
         select(
-            Company,
-            func.count(Job.id).label("job_count"),
-            func.array_agg(Job.title).label("titles"),
+            Company.id,
+            Company.name,
+            Company.website,
+            Company.industry,
+            Company.careers_url,
+            Company.category,
+            Company.region,
+            Company.classification,
+            Company.last_seen,
+            CompanyStats.ai_search_roles,
+            CompanyStats.sample_titles,
+            CompanyStats.latest_job_at,
         )
-        .join(Job, Job.company_id == Company.id)
-        .where(Job.is_ai_search.is_(True))
-        .group_by(Company.id)
+        .join(CompanyStats, CompanyStats.company_id == Company.id)
+        .limit(limit + 1)
     )
+    stmt = filters.apply(stmt)
 
-    if category:
-        stmt = stmt.where(Company.category == category)
-    if region:
-        stmt = stmt.where(Company.region == region)
-
-    stmt = stmt.having(func.count(Job.id) >= min_roles)
+    if sort == "recent":
+        stmt = stmt.order_by(CompanyStats.latest_job_at.desc().nullslast(), CompanyStats.company_id.desc())
+    else:
+        stmt = stmt.order_by(CompanyStats.ai_search_roles.desc(), CompanyStats.company_id.desc())
+    if cursor:
+        stmt = stmt.where(after_company_cursor(sort, cursor))
 
     result = await session.execute(stmt)
-    rows = result.all()
+    rows = result.mappings().all()
 
-    outputs: list[Company] = []
-    for company, job_count, titles in rows:
-        # Attach derived fields for Pydantic
-        company.ai_search_roles = job_count
-        if titles:
-            # Deduplicate while preserving order and keep top 3
-            unique_titles = list(dict.fromkeys(titles))
-            company.sample_titles = ", ".join(unique_titles[:3])
-        else:
-            company.sample_titles = None
-        outputs.append(company)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last["latest_job_at"] if sort == "recent" else last["ai_search_roles"], last["id"])
 
-    return outputs
+    resp = rows_response(rows, CompanyOut)
+    set_next_cursor(resp, next_cursor)
+    return resp
 
 @router.get("/{id}/jobs", response_model=list[JobOut])
 async def list_company_jobs(
     id: int,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+    filters: JobFilters = Depends(),
     session: AsyncSession = Depends(get_session),
 ):
     stmt = (
-        select(Job, Company.name)
-        .join(Company, Job.company_id == Company.id)
+        job_list_select(Job.scraped_at)
         .where(Job.company_id == id)
         .where(Job.is_ai_search.is_(True))
-        .order_by(Job.scraped_at.desc())
+        .order_by(Job.scraped_at.desc(), Job.id.desc())
+        .limit(limit + 1)
     )
+    stmt = filters.apply(stmt)
+    if cursor:
+        scraped_at, job_id = decode_cursor(cursor, 2)
+        scraped_at, job_id = cursor_datetime(scraped_at), cursor_int(job_id)
+        stmt = stmt.where(tuple_(Job.scraped_at, Job.id) < tuple_(scraped_at, job_id))
+
     result = await session.execute(stmt)
-    rows = result.all()
+    rows = result.mappings().all()
 
-    outputs: list[JobOut] = []
-    for job, company_name in rows:
-        job.company_name = company_name
-        jo = JobOut.model_validate(job, from_attributes=True)
-        outputs.append(jo)
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1]["scraped_at"], rows[-1]["id"])
 
-    return outputs
+    resp = rows_response(rows, JobOut)
+    set_next_cursor(resp, next_cursor)
+    return resp
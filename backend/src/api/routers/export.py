@@ -0,0 +1,39 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from src.api.filters import CompanyFilters, JobFilters
+from src.db.export import MEDIA_TYPES, export_companies_stmt, export_jobs_stmt, export_stream, pa
+
+router = APIRouter()
+
+ExportFormat = Literal["ndjson", "csv", "parquet"]
+
+def _export_response(stmt, fmt: str, name: str) -> StreamingResponse:
+    if fmt == "parquet" and pa is None:
+        raise HTTPException(status_code=501, detail="Parquet export is not available (pyarrow not installed)")
+    # The stream opens its own connection: request-scoped sessions are closed
+    # before a streaming body is sent
+    return StreamingResponse(
+        export_stream(stmt, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="{name}.{fmt}"',
+            "Cache-Control": "no-store",
+        },
+    )
+
+@router.get("/jobs")
+async def export_jobs(
+    format: ExportFormat = Query("ndjson"),
+    filters: JobFilters = Depends(),
+):
+    return _export_response(filters.apply(export_jobs_stmt()), format, "jobs")
+
+@router.get("/companies")
+async def export_companies(
+    format: ExportFormat = Query("ndjson"),
+    filters: CompanyFilters = Depends(),
+):
+    return _export_response(filters.apply(export_companies_stmt()), format, "companies")
@@ -1,38 +1,100 @@
-from fastapi import APIRouter, Depends, HTTPException
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, or_, and_, tuple_
 from src.db.session import get_session
-from src.db.models import Job, Company
+from src.db.models import Job, Company, JobDescription
 from src.semantic.schema import JobOut, JobDetailOut
+from src.api.filters import JobFilters
+from src.api.pagination import encode_cursor, decode_cursor, cursor_int, cursor_datetime, set_next_cursor
+from src.api.queries import job_list_select
+from src.api.search import text_query, text_match, text_rank, after_rank_cursor, hybrid_search
+from src.api.responses import rows_response
+from src.api.stream import job_broadcaster
 
 router = APIRouter()
 
-from sqlalchemy.orm import selectinload
+def after_posted_cursor(cursor: str):
+    """Keyset condition for ORDER BY posted_at DESC NULLS LAST, id DESC."""
+    posted_at, job_id = decode_cursor(cursor, 2)
+    posted_at, job_id = cursor_datetime(posted_at), cursor_int(job_id)
+    if posted_at is None:
+        return and_(Job.posted_at.is_(None), Job.id < job_id)
+    return or_(tuple_(Job.posted_at, Job.id) < tuple_(posted_at, job_id), Job.posted_at.is_(None))
 
 @router.get("/", response_model=list[JobOut])
 async def list_jobs(
-    limit: int = 100,
+    q: str | None = Query(None, description="Full-text search over title, company and description"),
+    mode: Literal["text", "hybrid"] = Query("text", description="hybrid fuses full-text and vector matches (single page)"),
+    relevance_weight: float = Query(0.0, ge=0.0, le=1.0, description="Hybrid only: blend in relevance_score"),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+    filters: JobFilters = Depends(),
     session: AsyncSession = Depends(get_session),
 ):
-    stmt = (
-        select(Job)
-        .options(selectinload(Job.company))
-        .join(Job.company)
-        .where(Job.is_ai_search == True)
-        .order_by(Job.posted_at.desc().nullslast())
-        .limit(limit)
-    )
+    if q and mode == "hybrid":
+        if cursor:
+            raise HTTPException(status_code=400, detail="Hybrid search returns a single page")
+        ids = await hybrid_search(q, filters, limit, relevance_weight)
+        if not ids:
+            return rows_response([], JobOut)
+        result = await session.execute(job_list_select().where(Job.id.in_(ids)))
+        by_id = {row["id"]: row for row in result.mappings().all()}
+        return rows_response([by_id[i] for i in ids if i in by_id], JobOut)
+
+    if q:
+        # Ranked search: best matches first, paged on (rank, id)
+        query = text_query(q)
+        rank = text_rank(query)
+        stmt = (
+            job_list_select(rank.label("rank"))
+            .where(Job.is_ai_search == True, text_match(query))
+            .order_by(rank.desc(), Job.id.desc())
+        )
+        if cursor:
+            stmt = stmt.where(after_rank_cursor(rank, cursor))
+        cursor_key = "rank"
+    else:
+        stmt = (
+            job_list_select()
+            .where(Job.is_ai_search == True)
+            .order_by(Job.posted_at.desc().nullslast(), Job.id.desc())
+        )
+        if cursor:
+            stmt = stmt.where(after_posted_cursor(cursor))
+        cursor_key = "posted_at"
+    stmt = filters.apply(stmt).limit(limit + 1)
+
     result = await session.execute(stmt)
-    jobs = result.scalars().all()
+    rows = result.mappings().all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][cursor_key], rows[-1]["id"])
 
-    outputs: list[JobOut] = []
-    for job in jobs:
-        # Pydantic needs company_name to be present
-        job.company_name = job.company.name
-        jo = JobOut.model_validate(job, from_attributes=True)
-        outputs.append(jo)
+    # Rows already match JobOut; serialize straight to JSON bytes
+    resp = rows_response(rows, JobOut)
+    set_next_cursor(resp, next_cursor)
+    return resp
 
-    return outputs
+@router.get("/stream")
+async def stream_jobs(
+    request: Request,
+    last_event_id: str | None = Header(None),
+):
+    """
+    Server-sent events: one `job` event (a JobOut payload) per newly ingested or
+    re-tiered job. Reconnect with Last-Event-ID to replay what was missed (ids
+    are per API worker; one from another worker or process just resumes live).
+    """
+    return StreamingResponse(
+        job_broadcaster.events(request.is_disconnected, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"},
+    )
 
 @router.get("/{id}", response_model=JobDetailOut)
 async def get_job(
@@ -40,8 +102,9 @@ async def get_job(
     session: AsyncSession = Depends(get_session),
 ):
     stmt = (
-        select(Job, Company)
+        select(Job, Company, JobDescription.body)
         .join(Job.company)
+        .outerjoin(JobDescription, JobDescription.content_hash == Job.description_hash)
         .where(Job.id == id)
     )
     result = await session.execute(stmt)
@@ -49,20 +112,26 @@ async def get_job(
     if not row:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    job, company = row
+    job, company, description = row
 
-    # Inject view fields used by Pydantic
-    job.company_name = company.name
     return JobDetailOut(
         id=job.id,
         title=job.title,
-        company_name=job.company_name,
+        company_name=company.name,
         location=job.location,
         posted_at=job.posted_at,
         url=job.url,
         relevance_score=job.relevance_score,
-        description=job.description,
+        description=description,
         dedupe_key=job.dedupe_key,
         company_classification=company.classification,
         company_category=company.category,
+        remote_flag=job.remote_flag,
+        employment_type=job.employment_type,
+        seniority=job.seniority,
+        ai_forward=job.ai_forward,
+        opp_athena_view=job.opp_athena_view,
+        opp_role_type=job.opp_role_type,
+        opp_buyer_or_seller=job.opp_buyer_or_seller,
+        opp_confidence=job.opp_confidence,
     )
@@ -1,49 +1,51 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, true
 
 from src.db.session import get_session
 from src.db.models import Company, Job
 from src.semantic.schema import StatsOut
+from src.core.cache import TTLCache
+from src.core.config import settings
 
 router = APIRouter()
 
+_STATS_CACHE = TTLCache(ttl_seconds=settings.STATS_CACHE_TTL_SECONDS, maxsize=1)
+
+def stats_stmt():
+    """All dashboard counters in one round trip (FILTER aggregates over each table)."""
+    company_counts = select(
+        func.count(Company.id).label("total_companies"),
+        func.count(Company.id).filter(Company.classification == "Competitor").label("total_competitors"),
+        func.count(Company.id).filter(Company.classification == "Client").label("total_clients"),
+    ).subquery()
+    job_counts = select(
+        func.count(Job.id).filter(Job.is_ai_search.is_(True)).label("total_jobs"),
+        # Last ingestion (scraped_at max)
+        func.max(Job.scraped_at).label("last_ingestion_at"),
+    ).subquery()
+    # Both sides are single rows; join on true to avoid a cartesian-product warning
+    return select(company_counts, job_counts).join_from(company_counts, job_counts, true())
+
 
 @router.get("/", response_model=StatsOut)
 async def get_stats(
     session: AsyncSession = Depends(get_session),
 ):
-    # Total companies
-    result = await session.execute(select(func.count(Company.id)))
-    total_companies = result.scalar_one() or 0
-
-    # Total AI-search jobs
-    result = await session.execute(
-        select(func.count(Job.id)).where(Job.is_ai_search == True)  # noqa: E712
-    )
-    total_jobs = result.scalar_one() or 0
+    cached = _STATS_CACHE.get("stats")
+    if cached is not None:
+        return cached
 
-    # Competitors
-    result = await session.execute(
-        select(func.count(Company.id)).where(Company.classification == "Competitor")
-    )
-    total_competitors = result.scalar_one() or 0
-
-    # Clients
-    result = await session.execute(
-        select(func.count(Company.id)).where(Company.classification == "Client")
-    )
-    total_clients = result.scalar_one() or 0
+    result = await session.execute(stats_stmt())
+    row = result.one()
 
-    # Last ingestion (scraped_at max)
-    result = await session.execute(select(func.max(Job.scraped_at)))
-    last_ingestion_at = result.scalar_one()
     # FastAPI will serialize datetime → ISO 8601; keep None if no jobs yet.
-
-    return StatsOut(
-        total_companies=int(total_companies),
-        total_jobs=int(total_jobs),
-        total_competitors=int(total_competitors),
-        total_clients=int(total_clients),
-        last_ingestion_at=last_ingestion_at,
+    stats = StatsOut(
+        total_companies=int(row.total_companies or 0),
+        total_jobs=int(row.total_jobs or 0),
+        total_competitors=int(row.total_competitors or 0),
+        total_clients=int(row.total_clients or 0),
+        last_ingestion_at=row.last_ingestion_at,
     )
+    _STATS_CACHE.set("stats", stats)
+    return stats
@@ -0,0 +1,104 @@
+import asyncio
+from functools import lru_cache
+from typing import Sequence
+
+from sqlalchemy import select, func, text, tuple_
+
+from src.db.models import Job
+from src.db.session import AsyncSessionLocal
+from src.api.filters import JobFilters
+from src.api.pagination import decode_cursor, cursor_float, cursor_int
+from src.core.config import settings
+
+# Must match the configuration used by jobs_search_vector_update()
+SEARCH_CONFIG = "english"
+
+def text_query(q: str):
+    """websearch_to_tsquery: quoted phrases, OR and -exclusions like a search box."""
+    return func.websearch_to_tsquery(SEARCH_CONFIG, q)
+
+def text_match(query):
+    # Served by the GIN index on jobs.search_vector
+    return Job.search_vector.op("@@")(query)
+
+def text_rank(query):
+    return func.ts_rank_cd(Job.search_vector, query)
+
+def after_rank_cursor(rank, cursor: str):
+    """Keyset condition for ORDER BY rank DESC, id DESC."""
+    value, job_id = decode_cursor(cursor, 2)
+    return tuple_(rank, Job.id) < tuple_(cursor_float(value), cursor_int(job_id))
+
+def rrf_fuse(*rankings: Sequence[int], k: int | None = None) -> dict[int, float]:
+    """
+    Reciprocal-rank fusion: each list contributes 1 / (k + position) per id.
+    Rank-based, so text ranks and vector distances need no score calibration.
+    """
+    k = k or settings.SEARCH_RRF_K
+    scores: dict[int, float] = {}
+    for ranking in rankings:
+        for position, job_id in enumerate(ranking, start=1):
+            scores[job_id] = scores.get(job_id, 0.0) + 1.0 / (k + position)
+    return scores
+
+def rerank(
+    scores: dict[int, float], relevance: dict[int, float | None], relevance_weight: float = 0.0
+) -> list[int]:
+    """
+    Orders fused ids best-first. With relevance_weight > 0 each score is scaled
+    towards the job's relevance_score (0 leaves the fusion order untouched).
+    """
+    def final(job_id: int) -> float:
+        score = scores[job_id]
+        if relevance_weight:
+            score *= (1.0 - relevance_weight) + relevance_weight * (relevance.get(job_id) or 0.0)
+        return score
+
+    return sorted(scores, key=lambda job_id: (-final(job_id), -job_id))
+
+@lru_cache(maxsize=256)
+def query_embedding(q: str) -> tuple[float, ...]:
+    # Imported lazily: only hybrid search needs the model in the API process
+    from src.semantic.embedder import embedder
+    return tuple(embedder.encode([q])[0].tolist())
+
+async def text_candidates(q: str, filters: JobFilters, n: int):
+    query = text_query(q)
+    stmt = filters.apply(
+        select(Job.id, Job.relevance_score)
+        .where(Job.is_ai_search == True, text_match(query))
+        .order_by(text_rank(query).desc(), Job.id.desc())
+        .limit(n)
+    )
+    async with AsyncSessionLocal() as session:
+        return (await session.execute(stmt)).all()
+
+async def vector_candidates(q: str, filters: JobFilters, n: int):
+    vector = await asyncio.to_thread(query_embedding, q)
+    # Served by the partial HNSW index on jobs.embedding (WHERE is_ai_search)
+    stmt = filters.apply(
+        select(Job.id, Job.relevance_score)
+        .where(Job.is_ai_search == True, Job.embedding.is_not(None))
+        .order_by(Job.embedding.cosine_distance(list(vector)))
+        .limit(n)
+    )
+    async with AsyncSessionLocal() as session:
+        # HNSW returns at most ef_search rows
+        await session.execute(text(f"SET LOCAL hnsw.ef_search = {max(int(n), 40)}"))
+        return (await session.execute(stmt)).all()
+
+async def hybrid_search(
+    q: str, filters: JobFilters, limit: int, relevance_weight: float = 0.0, candidates: int | None = None
+) -> list[int]:
+    """
+    Runs the full-text and ANN candidate queries concurrently (each on its own
+    connection) and returns the top `limit` job ids after RRF fusion.
+    """
+    n = max(candidates or settings.SEARCH_HYBRID_CANDIDATES, limit)
+    lexical, semantic = await asyncio.gather(
+        text_candidates(q, filters, n),
+        vector_candidates(q, filters, n),
+    )
+    relevance = {row.id: row.relevance_score for row in (*lexical, *semantic)}
+    scores = rrf_fuse([row.id for row in lexical], [row.id for row in semantic])
+    return rerank(scores, relevance, relevance_weight)[:limit]
@@ -0,0 +1,141 @@
+import asyncio
+import uuid
+from collections import deque
+from typing import AsyncIterator
+
+import orjson
+
+from src.api.queries import job_list_select
+from src.api.responses import row_dicts
+from src.db.models import Job
+from src.db.session import AsyncSessionLocal
+from src.semantic.schema import JobOut
+from src.core.config import settings
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+def format_event(event_id: str, data: bytes, event: str = "job") -> bytes:
+    return b"id: %s\nevent: %s\ndata: %s\n\n" % (event_id.encode(), event.encode(), data)
+
+KEEPALIVE = b": keepalive\n\n"
+
+class JobBroadcaster:
+    """
+    Per-worker fan-out of changed jobs to SSE subscribers.
+
+    Job ids arrive from the worker's single LISTEN connection (see
+    src/db/listener.py) and are fetched in small batches with the JobOut
+    projection, so one query serves every subscriber. Each subscriber has a
+    bounded queue; a subscriber that falls behind is disconnected and can
+    resume from the replay buffer with Last-Event-ID. Event ids are
+    "<epoch>-<seq>", the epoch being random per broadcaster: an id from another
+    worker or from before a restart replays nothing and the client resumes with
+    live events only.
+    """
+
+    def __init__(
+        self,
+        replay_size: int | None = None,
+        queue_size: int | None = None,
+        batch_seconds: float | None = None,
+        epoch: str | None = None,
+    ):
+        self.queue_size = queue_size or settings.STREAM_QUEUE_SIZE
+        self.batch_seconds = settings.STREAM_BATCH_SECONDS if batch_seconds is None else batch_seconds
+        self._replay: deque[tuple[int, bytes]] = deque(maxlen=replay_size or settings.STREAM_REPLAY_SIZE)
+        self._subscribers: set[asyncio.Queue] = set()
+        self._pending: set[int] = set()
+        self._flush_task: asyncio.Task | None = None
+        self._seq = 0
+        self.epoch = epoch or uuid.uuid4().hex[:12]
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def on_notify(self, payload: str | None):
+        """LISTEN handler for JOBS_CHANNEL (payload is a job id)."""
+        if not payload or not payload.isdigit():
+            return
+        self._pending.add(int(payload))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush())
+
+    async def _flush(self):
+        await asyncio.sleep(self.batch_seconds)
+        ids, self._pending = self._pending, set()
+        if not ids:
+            return
+        try:
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(
+                    job_list_select().where(Job.id.in_(ids)).order_by(Job.id)
+                )
+                rows = result.mappings().all()
+        except Exception as e:
+            logger.error("Failed to load streamed jobs", extra={"error": str(e), "count": len(ids)})
+            return
+        for item in row_dicts(rows, JobOut):
+            self.publish(orjson.dumps(item))
+
+    def publish(self, data: bytes) -> int:
+        self._seq += 1
+        event = (self._seq, data)
+        self._replay.append(event)
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Slow consumer: drop its backlog and close it; it can resume via Last-Event-ID
+                self._subscribers.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+        return self._seq
+
+    def event_id(self, seq: int) -> str:
+        return f"{self.epoch}-{seq}"
+
+    def parse_event_id(self, event_id: str | None) -> int | None:
+        """Sequence number of one of this broadcaster's event ids, else None."""
+        epoch, _, seq = (event_id or "").rpartition("-")
+        if epoch != self.epoch or not seq.isdigit() or int(seq) > self._seq:
+            return None
+        return int(seq)
+
+    def subscribe(self, last_event_id: str | None = None) -> tuple[asyncio.Queue, list[tuple[int, bytes]]]:
+        """Registers a subscriber; returns its queue and the events it missed."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        backlog = []
+        last_seq = self.parse_event_id(last_event_id)
+        if last_seq is not None:
+            backlog = [event for event in self._replay if event[0] > last_seq]
+        return queue, backlog
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        self._subscribers.discard(queue)
+
+    async def events(
+        self, is_disconnected, last_event_id: str | None = None, keepalive_seconds: float | None = None
+    ) -> AsyncIterator[bytes]:
+        keepalive_seconds = keepalive_seconds or settings.STREAM_KEEPALIVE_SECONDS
+        queue, backlog = self.subscribe(last_event_id)
+        try:
+            for seq, data in backlog:
+                yield format_event(self.event_id(seq), data)
+            while not await is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=keepalive_seconds)
+                except asyncio.TimeoutError:
+                    yield KEEPALIVE
+                    continue
+                if event is None:
+                    break
+                seq, data = event
+                yield format_event(self.event_id(seq), data)
+        finally:
+            self.unsubscribe(queue)
+
+job_broadcaster = JobBroadcaster()
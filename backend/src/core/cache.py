@@ -0,0 +1,43 @@
+import time
+from collections import OrderedDict
+from typing import Any
+
+# Every TTLCache registers itself here so writers can drop all cached reads at once
+_CACHES: list["TTLCache"] = []
+
+class TTLCache:
+    """
+    Small in-process cache with per-entry expiry and an LRU size bound.
+    Not shared between processes; entries age out after ttl_seconds.
+    """
+
+    def __init__(self, ttl_seconds: float, maxsize: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self._data: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+        _CACHES.append(self)
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            self._data.pop(key, None)
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self):
+        self._data.clear()
+
+def invalidate_all():
+    """Drops every in-process cache (call after data changes)."""
+    for cache in _CACHES:
+        cache.invalidate()
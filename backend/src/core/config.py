@@ -1,5 +1,10 @@
+from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
+import os
+
+# backend/ (this file is backend/src/core/config.py)
+BACKEND_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 class Settings(BaseSettings):
     PROJECT_NAME: str = "AI Search Monitor"
@@ -14,7 +19,33 @@ class Settings(BaseSettings):
     INGEST_MAX_DETAIL_CONCURRENCY_SEO: int = 5
     INGEST_MAX_DETAIL_CONCURRENCY_LINKEDIN: int = 3
     INGEST_MAX_UPSERT_CONCURRENCY: int = 8
+    # Score list-phase titles before fetching detail pages; drop those below
+    # classifier.threshold - margin (title-only scores run lower than title+description)
+    INGEST_TITLE_PRESCREEN: bool = True
+    INGEST_TITLE_PRESCREEN_MARGIN: float = 0.10
+    # Normalized company name -> id/classification cache for the upsert path.
+    # Per run by default; process-scoped keeps it warm across runs in a
+    # long-lived worker but won't see companies edited by other processes.
+    INGEST_COMPANY_CACHE_SIZE: int = 20000
+    INGEST_COMPANY_CACHE_PROCESS_SCOPED: bool = False
+    # pg_trgm similarity above which a new company name resolves to an existing company
+    COMPANY_MATCH_THRESHOLD: float = 0.8
+    # Near-duplicate postings (MinHash/LSH over title + description, same company)
+    ENABLE_NEAR_DUPLICATE_CHECK: bool = True
+    DEDUPE_MINHASH_PERMUTATIONS: int = 128
+    DEDUPE_MINHASH_BANDS: int = 16
+    DEDUPE_MINHASH_THRESHOLD: float = 0.8
     OPENAI_OPP_MAX_CONCURRENCY: int = 3
+    # SEOJobs discovery: "listing" (first front-page listing pages) or "sitemap"
+    # (every job URL in the XML sitemaps; pages only re-fetched when <lastmod> moves)
+    SEOJOBS_DISCOVERY: str = "listing"
+    SEOJOBS_SITEMAP_URL: str = "https://seojobs.com/sitemap_index.xml"
+    # Regex a sitemap URL must match to count as a job page ("" keeps all)
+    SEOJOBS_SITEMAP_INCLUDE: str = r"/jobs?/"
+    # Public ATS job boards, "provider:token" or "provider:token=Company Name"
+    # (providers: greenhouse, lever), e.g. ["greenhouse:acme", "lever:globex=Globex"]
+    ATS_BOARDS: list[str] = []
+    ATS_MAX_CONCURRENCY: int = 4
 
     LINKEDIN_QUERIES: list[str] = [
         "AI SEO",
@@ -26,7 +57,42 @@ class Settings(BaseSettings):
         "Answer Engine Optimization Lead",
     ]
     OPENAI_OPP_MAX_RETRIES: int = 4
+
+    # API Caching
+    STATS_CACHE_TTL_SECONDS: int = 30
+    # How often API workers re-read the data generation counter
+    GENERATION_POLL_SECONDS: float = 2.0
+    RESPONSE_CACHE_TTL_SECONDS: int = 600
+    RESPONSE_CACHE_MAXSIZE: int = 512
+    GZIP_MIN_SIZE: int = 1024
+    # Cross-worker invalidation over Postgres LISTEN/NOTIFY
+    ENABLE_PG_LISTENER: bool = True
+    PG_LISTENER_RECONNECT_SECONDS: float = 5.0
+
+    # Live job feed (/api/jobs/stream)
+    STREAM_REPLAY_SIZE: int = 500
+    STREAM_QUEUE_SIZE: int = 100
+    STREAM_BATCH_SECONDS: float = 0.25
+    STREAM_KEEPALIVE_SECONDS: float = 15.0
+
+    # Hybrid search (full-text + vector candidates fused with RRF)
+    SEARCH_HYBRID_CANDIDATES: int = 100
+    SEARCH_RRF_K: int = 60
+
+    # Bulk export (rows per server-side cursor fetch)
+    EXPORT_CHUNK_SIZE: int = 5000
+
+    # Company Clustering
+    CLUSTER_N_CLUSTERS: int = 3
+    # Relative paths resolve against the backend root, so the API, the pipeline
+    # and scripts share one model file whatever their working directory
+    CLUSTER_MODEL_PATH: str = "data/company_clusters.joblib"
     
+    @field_validator("CLUSTER_MODEL_PATH")
+    @classmethod
+    def _resolve_backend_path(cls, value: str) -> str:
+        return value if os.path.isabs(value) else os.path.join(BACKEND_ROOT, value)
+
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=True, extra="ignore")
 
 @lru_cache
@@ -0,0 +1,83 @@
+from typing import Iterable
+
+from sqlalchemy import select, func, literal_column, String
+from sqlalchemy.dialects.postgresql import insert as pg_insert, aggregate_order_by
+
+from src.db.models import Company, CompanyStats, Job
+
+SAMPLE_TITLES_PER_COMPANY = 3
+
+def refresh_company_stats_stmt(company_ids: Iterable[int] | None = None):
+    """
+    INSERT ... ON CONFLICT statement recomputing company_stats rows from jobs.
+
+    With company_ids only those companies are recomputed (the incremental path
+    used by upsert/rescore); without it every company is refreshed.
+    """
+    ai_jobs = Job.is_ai_search.is_(True)
+    ids = list(company_ids) if company_ids is not None else None
+
+    counts = (
+        select(
+            Job.company_id,
+            func.count(Job.id).label("ai_search_roles"),
+            func.max(Job.posted_at).label("latest_job_at"),
+        )
+        .where(ai_jobs)
+        .group_by(Job.company_id)
+    )
+    titles = (
+        select(Job.company_id, Job.title, func.max(Job.posted_at).label("latest"))
+        .where(ai_jobs)
+        .group_by(Job.company_id, Job.title)
+    )
+    if ids is not None:
+        counts = counts.where(Job.company_id.in_(ids))
+        titles = titles.where(Job.company_id.in_(ids))
+    counts = counts.subquery()
+    titles = titles.subquery()
+
+    ranked = select(
+        titles.c.company_id,
+        titles.c.title,
+        func.row_number().over(
+            partition_by=titles.c.company_id,
+            order_by=(titles.c.latest.desc().nullslast(), titles.c.title),
+        ).label("rn"),
+    ).subquery()
+    samples = (
+        select(
+            ranked.c.company_id,
+            func.string_agg(
+                ranked.c.title, aggregate_order_by(literal_column("', '"), ranked.c.rn), type_=String
+            ).label("sample_titles"),
+        )
+        .where(ranked.c.rn <= SAMPLE_TITLES_PER_COMPANY)
+        .group_by(ranked.c.company_id)
+        .subquery()
+    )
+
+    source = (
+        select(
+            Company.id,
+            func.coalesce(counts.c.ai_search_roles, 0),
+            samples.c.sample_titles,
+            counts.c.latest_job_at,
+        )
+        .outerjoin(counts, counts.c.company_id == Company.id)
+        .outerjoin(samples, samples.c.company_id == Company.id)
+    )
+    if ids is not None:
+        source = source.where(Company.id.in_(ids))
+
+    stmt = pg_insert(CompanyStats).from_select(
+        ["company_id", "ai_search_roles", "sample_titles", "latest_job_at"], source
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[CompanyStats.company_id],
+        set_={
+            "ai_search_roles": stmt.excluded.ai_search_roles,
+            "sample_titles": stmt.excluded.sample_titles,
+            "latest_job_at": stmt.excluded.latest_job_at,
+        },
+    )
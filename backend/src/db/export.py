@@ -0,0 +1,222 @@
+import csv
+import io
+from datetime import datetime
+from typing import AsyncIterator, Sequence
+
+import orjson
+from sqlalchemy import select, Integer, BigInteger, Float, Boolean, DateTime
+
+from src.db.session import engine
+from src.db.models import Company, CompanyStats, Job
+from src.core.config import settings
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: pip install .[export]
+    pa = None
+    pq = None
+
+FORMATS = ("ndjson", "csv", "parquet")
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+EXPORT_JOB_COLUMNS = (
+    Job.id,
+    Job.company_id,
+    Company.name.label("company_name"),
+    Job.title,
+    Job.location,
+    Job.url,
+    Job.source,
+    Job.external_id,
+    Job.posted_at,
+    Job.scraped_at,
+    Job.last_seen_at,
+    Job.closed_at,
+    Job.relevance_score,
+    Job.is_ai_search,
+    Job.role_tier,
+    Job.remote_flag,
+    Job.employment_type,
+    Job.seniority,
+    Job.ai_forward,
+    Job.opp_athena_view,
+    Job.opp_role_type,
+    Job.opp_buyer_or_seller,
+    Job.opp_confidence,
+)
+
+EXPORT_COMPANY_COLUMNS = (
+    Company.id,
+    Company.name,
+    Company.website,
+    Company.industry,
+    Company.careers_url,
+    Company.category,
+    Company.region,
+    Company.classification,
+    Company.cluster_id,
+    Company.last_seen,
+    CompanyStats.ai_search_roles,
+    CompanyStats.sample_titles,
+    CompanyStats.latest_job_at,
+)
+
+def export_jobs_stmt():
+    # Ordered by id so exports are stable and cheap to stream
+    return (
+        select(*EXPORT_JOB_COLUMNS)
+        .join(Company, Job.company_id == Company.id)
+        .where(Job.is_ai_search.is_(True))
+        .order_by(Job.id)
+    )
+
+def export_companies_stmt():
+    return (
+        select(*EXPORT_COMPANY_COLUMNS)
+        .outerjoin(CompanyStats, CompanyStats.company_id == Company.id)
+        .order_by(Company.id)
+    )
+
+def _columns(stmt) -> list[tuple[str, object]]:
+    return [(c.name, c.type) for c in stmt.selected_columns]
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+class NDJSONEncoder:
+    def __init__(self, columns):
+        self.names = [name for name, _ in columns]
+
+    def begin(self) -> bytes:
+        return b""
+
+    def encode(self, rows) -> bytes:
+        return b"".join(orjson.dumps(dict(zip(self.names, row))) + b"\n" for row in rows)
+
+    def end(self) -> bytes:
+        return b""
+
+class CSVEncoder:
+    def __init__(self, columns):
+        self.names = [name for name, _ in columns]
+
+    def _write(self, rows) -> bytes:
+        buf = io.StringIO()
+        csv.writer(buf).writerows(rows)
+        return buf.getvalue().encode()
+
+    def begin(self) -> bytes:
+        return self._write([self.names])
+
+    def encode(self, rows) -> bytes:
+        return self._write([_csv_value(v) for v in row] for row in rows)
+
+    def end(self) -> bytes:
+        return b""
+
+class _ChunkSink:
+    """Write-only file object Arrow can write into; drain() hands back new bytes."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def _arrow_type(sa_type):
+    if isinstance(sa_type, (Integer, BigInteger)):
+        return pa.int64()
+    if isinstance(sa_type, Float):
+        return pa.float64()
+    if isinstance(sa_type, Boolean):
+        return pa.bool_()
+    if isinstance(sa_type, DateTime):
+        return pa.timestamp("us")
+    return pa.string()
+
+class ParquetEncoder:
+    """One Parquet row group per chunk, written as Arrow record batches."""
+
+    def __init__(self, columns):
+        if pa is None:
+            raise RuntimeError("Parquet export needs pyarrow (pip install .[export])")
+        self.names = [name for name, _ in columns]
+        self.schema = pa.schema([(name, _arrow_type(sa_type)) for name, sa_type in columns])
+        self.sink = _ChunkSink()
+        self.writer = pq.ParquetWriter(pa.PythonFile(self.sink, mode="w"), self.schema)
+
+    def begin(self) -> bytes:
+        return self.sink.drain()
+
+    def encode(self, rows) -> bytes:
+        arrays = [list(col) for col in zip(*rows)] if rows else [[] for _ in self.names]
+        batch = pa.RecordBatch.from_arrays(
+            [pa.array(values, type=field.type) for values, field in zip(arrays, self.schema)],
+            schema=self.schema,
+        )
+        self.writer.write_batch(batch)
+        return self.sink.drain()
+
+    def end(self) -> bytes:
+        self.writer.close()
+        return self.sink.drain()
+
+ENCODERS = {"ndjson": NDJSONEncoder, "csv": CSVEncoder, "parquet": ParquetEncoder}
+
+def encoder_for(fmt: str, stmt):
+    if fmt not in ENCODERS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    return ENCODERS[fmt](_columns(stmt))
+
+async def stream_rows(stmt, chunk_size: int) -> AsyncIterator[Sequence]:
+    """Yields lists of rows from a server-side cursor on a dedicated connection."""
+    async with engine.connect() as conn:
+        result = await conn.stream(stmt.execution_options(yield_per=chunk_size))
+        async for rows in result.partitions(chunk_size):
+            yield rows
+
+async def export_stream(stmt, fmt: str, chunk_size: int | None = None) -> AsyncIterator[bytes]:
+    """
+    Encodes the rows of stmt chunk by chunk. Only one chunk of rows (and its
+    encoded bytes) is held in memory at a time, whatever the table size.
+    """
+    encoder = encoder_for(fmt, stmt)
+    head = encoder.begin()
+    if head:
+        yield head
+    async for rows in stream_rows(stmt, chunk_size or settings.EXPORT_CHUNK_SIZE):
+        data = encoder.encode(rows)
+        if data:
+            yield data
+    tail = encoder.end()
+    if tail:
+        yield tail
@@ -0,0 +1,89 @@
+import time
+from datetime import datetime
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.models import DataGeneration
+from src.db.session import AsyncSessionLocal
+from src.db.listener import notify_stmt
+from src.core.config import settings
+from src.core.cache import invalidate_all
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# NOTIFY channel carrying the new generation; API workers LISTEN on it
+GENERATION_CHANNEL = "data_generation"
+
+def bump_generation_stmt(reason: str | None = None):
+    return (
+        update(DataGeneration)
+        .where(DataGeneration.id == 1)
+        .values(generation=DataGeneration.generation + 1, reason=reason, updated_at=datetime.utcnow())
+        .returning(DataGeneration.generation)
+    )
+
+async def bump_generation(session: AsyncSession, reason: str | None = None) -> int | None:
+    """
+    Bumps the data generation inside the caller's transaction and queues a
+    NOTIFY on GENERATION_CHANNEL. Postgres delivers the notification only when
+    the caller commits, so API workers never invalidate ahead of the data.
+    """
+    result = await session.execute(bump_generation_stmt(reason))
+    generation = result.scalar_one_or_none()
+    if generation is not None:
+        await session.execute(notify_stmt(GENERATION_CHANNEL, str(generation)))
+    return generation
+
+class GenerationTracker:
+    """
+    Per-process view of the data generation counter.
+
+    The counter is re-read at most every poll_seconds, so API requests don't
+    each pay a round trip. current() returns None when the counter can't be
+    read, in which case callers should skip caching.
+    """
+
+    def __init__(self, poll_seconds: float):
+        self.poll_seconds = poll_seconds
+        self._value: int | None = None
+        self._expires_at = 0.0
+
+    async def current(self) -> int | None:
+        now = time.monotonic()
+        if now < self._expires_at:
+            return self._value
+        try:
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(
+                    select(DataGeneration.generation).where(DataGeneration.id == 1)
+                )
+                self._value = result.scalar_one_or_none()
+        except Exception as e:
+            logger.warning("Could not read data generation", extra={"error": str(e)})
+            self._value = None
+        self._expires_at = now + self.poll_seconds
+        return self._value
+
+    def set(self, value: int):
+        self._value = value
+        self._expires_at = time.monotonic() + self.poll_seconds
+
+    def reset(self):
+        self._value = None
+        self._expires_at = 0.0
+
+generation_tracker = GenerationTracker(settings.GENERATION_POLL_SECONDS)
+
+def on_generation_notify(payload: str | None):
+    """
+    LISTEN handler: drops this worker's in-process caches and adopts the new
+    generation. payload is None after a (re)connect, when notifications may have
+    been missed, so the generation is re-read on the next request instead.
+    """
+    invalidate_all()
+    if payload and payload.isdigit():
+        generation_tracker.set(int(payload))
+    else:
+        generation_tracker.reset()
@@ -0,0 +1,99 @@
+import asyncio
+from typing import Callable
+
+import asyncpg
+from sqlalchemy import select, func, bindparam, String
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from src.core.config import settings
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+Handler = Callable[[str | None], None]
+
+# Job ids inserted or re-tiered by upsert, rescore or reclassify (feeds /api/jobs/stream)
+JOBS_CHANNEL = "jobs_changed"
+
+def notify_stmt(channel: str, payload: str):
+    """SELECT pg_notify(...); delivered to listeners when the transaction commits."""
+    return select(func.pg_notify(channel, payload))
+
+def notify_many_stmt(channel: str, payloads: list[str]):
+    """One pg_notify per payload in a single statement (SELECT ... FROM unnest)."""
+    payload = func.unnest(bindparam("payloads", payloads, type_=ARRAY(String))).table_valued("value").render_derived(name="p")
+    return select(func.pg_notify(channel, payload.c.value)).select_from(payload)
+
+def listener_dsn(url: str) -> str:
+    """asyncpg wants a plain postgresql:// DSN, not the SQLAlchemy driver URL."""
+    return url.replace("postgresql+asyncpg://", "postgresql://", 1)
+
+class PgListener:
+    """
+    One dedicated LISTEN connection per process, fanning notifications out to
+    in-process handlers by channel.
+
+    The connection is re-established after failures. Notifications sent while
+    disconnected are lost, so every handler is called with None after each
+    (re)connect and should treat that as "resync".
+    """
+
+    def __init__(self, dsn: str | None = None, reconnect_seconds: float | None = None):
+        self.dsn = dsn or listener_dsn(settings.DATABASE_URL)
+        self.reconnect_seconds = reconnect_seconds or settings.PG_LISTENER_RECONNECT_SECONDS
+        self._handlers: dict[str, list[Handler]] = {}
+        self._task: asyncio.Task | None = None
+
+    def subscribe(self, channel: str, handler: Handler):
+        handlers = self._handlers.setdefault(channel, [])
+        if handler not in handlers:
+            handlers.append(handler)
+
+    def _dispatch(self, channel: str, payload: str | None):
+        for handler in self._handlers.get(channel, []):
+            try:
+                handler(payload)
+            except Exception as e:
+                logger.error("LISTEN handler failed", extra={"channel": channel, "error": str(e)})
+
+    def _on_notification(self, connection, pid, channel, payload):
+        self._dispatch(channel, payload)
+
+    async def _run(self):
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(self.dsn)
+                closed = asyncio.Event()
+                conn.add_termination_listener(lambda c: closed.set())
+                for channel in self._handlers:
+                    await conn.add_listener(channel, self._on_notification)
+                logger.info("LISTEN connection ready", extra={"channels": list(self._handlers)})
+
+                for channel in self._handlers:
+                    self._dispatch(channel, None)
+                await closed.wait()
+                logger.warning("LISTEN connection closed; reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("LISTEN connection failed", extra={"error": str(e)})
+            finally:
+                if conn is not None and not conn.is_closed():
+                    await conn.close()
+            await asyncio.sleep(self.reconnect_seconds)
+
+    def start(self):
+        if self._task is None and self._handlers:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+pg_listener = PgListener()
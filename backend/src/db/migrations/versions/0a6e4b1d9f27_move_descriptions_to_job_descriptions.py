@@ -0,0 +1,153 @@
+"""move job descriptions to job_descriptions
+
+Revision ID: 0a6e4b1d9f27
+Revises: f5c2a9d83b16
+Create Date: 2026-10-19 16:05:33.140562
+
+"""
+import hashlib
+import re
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import ARRAY
+from selectolax.lexbor import LexborHTMLParser
+
+import pgvector  # Ensure pgvector is available in migrations
+
+# revision identifiers, used by Alembic.
+revision = '0a6e4b1d9f27'
+down_revision = 'f5c2a9d83b16'
+branch_labels = None
+depends_on = None
+
+# search_vector now reads the description body through description_hash
+SEARCH_VECTOR_FUNCTION = """
+    CREATE OR REPLACE FUNCTION jobs_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(
+                (SELECT name FROM companies WHERE id = NEW.company_id), '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(
+                (SELECT body FROM job_descriptions WHERE content_hash = NEW.description_hash), '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+"""
+
+LEGACY_SEARCH_VECTOR_FUNCTION = """
+    CREATE OR REPLACE FUNCTION jobs_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(
+                (SELECT name FROM companies WHERE id = NEW.company_id), '')), 'B') ||
+            setweight(to_tsvector('english', jobs_clean_description(NEW.description)), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+"""
+
+BACKFILL_CHUNK_SIZE = 5000
+
+# The stamped OPP_META:/META: prefixes (same pattern as jobs_clean_description)
+_LEGACY_PREFIX = re.compile(r"^\s*(OPP_META: [^|]*\|\|\s*)?(META: \S+( \| \S+)* \|\|\s*)?")
+
+# Frozen copy of src.ingestion.descriptions.clean_description at this revision,
+# so backfilled hashes match what ingestion computes for the same text
+_BLOCK_BREAKS = re.compile(r"(?i)(<br\s*/?>|</(?:p|div|li|ul|ol|h[1-6]|tr|table|section|article|blockquote)>)")
+_SPACES = re.compile(r"[ \t\r\f\v\xa0]+")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+
+def _clean_description(text):
+    if not text:
+        return None
+    text = _LEGACY_PREFIX.sub("", text, count=1)
+    if "<" in text and ">" in text:
+        tree = LexborHTMLParser(_BLOCK_BREAKS.sub(r"\n\1", text))
+        for node in tree.css("script, style"):
+            node.decompose()
+        root = tree.body or tree.root
+        text = root.text(separator="") if root else ""
+    lines = [_SPACES.sub(" ", line).strip() for line in text.splitlines()]
+    text = _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+    return text or None
+
+def _backfill_descriptions(bind):
+    """Keyset chunks of jobs: clean + hash in Python, then one INSERT and one UPDATE per chunk."""
+    select_chunk = sa.text(
+        "SELECT id, description FROM jobs WHERE id > :after ORDER BY id LIMIT :limit"
+    )
+    insert_bodies = sa.text(
+        "INSERT INTO job_descriptions (content_hash, body) VALUES (:content_hash, :body) ON CONFLICT DO NOTHING"
+    )
+    set_hashes = sa.text("""
+        UPDATE jobs j SET description_hash = v.content_hash
+        FROM unnest(:ids, :hashes) AS v(id, content_hash)
+        WHERE v.id = j.id
+    """).bindparams(
+        sa.bindparam("ids", type_=ARRAY(sa.Integer)),
+        sa.bindparam("hashes", type_=ARRAY(sa.String)),
+    )
+    after = 0
+    while True:
+        rows = bind.execute(select_chunk, {"after": after, "limit": BACKFILL_CHUNK_SIZE}).all()
+        if not rows:
+            break
+        after = rows[-1].id
+        bodies, ids, hashes = {}, [], []
+        for row in rows:
+            body = _clean_description(row.description)
+            if body is None:
+                continue
+            content_hash = hashlib.sha256(body.encode()).hexdigest()
+            bodies[content_hash] = body
+            ids.append(row.id)
+            hashes.append(content_hash)
+        if ids:
+            bind.execute(insert_bodies, [{"content_hash": h, "body": b} for h, b in bodies.items()])
+            bind.execute(set_hashes, {"ids": ids, "hashes": hashes})
+
+
+def upgrade() -> None:
+    op.create_table('job_descriptions',
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('body', sa.Text(), nullable=False),
+    sa.PrimaryKeyConstraint('content_hash')
+    )
+    op.add_column('jobs', sa.Column('description_hash', sa.String(length=64), nullable=True))
+    op.create_foreign_key('jobs_description_hash_fkey', 'jobs', 'job_descriptions', ['description_hash'], ['content_hash'])
+
+    op.execute("DROP TRIGGER jobs_search_vector_trigger ON jobs")
+    op.execute(SEARCH_VECTOR_FUNCTION)
+    op.execute("""
+        CREATE TRIGGER jobs_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF title, description_hash, company_id ON jobs
+        FOR EACH ROW EXECUTE FUNCTION jobs_search_vector_update()
+    """)
+
+    # Existing descriptions without their META:/OPP_META: prefixes and HTML tags,
+    # cleaned exactly like ingestion does and deduplicated by content hash
+    _backfill_descriptions(op.get_bind())
+    op.drop_column('jobs', 'description')
+
+
+def downgrade() -> None:
+    op.add_column('jobs', sa.Column('description', sa.Text(), nullable=True))
+    op.execute("""
+        UPDATE jobs j SET description = d.body
+        FROM job_descriptions d WHERE d.content_hash = j.description_hash
+    """)
+
+    op.execute("DROP TRIGGER jobs_search_vector_trigger ON jobs")
+    op.execute(LEGACY_SEARCH_VECTOR_FUNCTION)
+    op.execute("""
+        CREATE TRIGGER jobs_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF title, description, company_id ON jobs
+        FOR EACH ROW EXECUTE FUNCTION jobs_search_vector_update()
+    """)
+
+    op.drop_constraint('jobs_description_hash_fkey', 'jobs', type_='foreignkey')
+    op.drop_column('jobs', 'description_hash')
+    op.drop_table('job_descriptions')
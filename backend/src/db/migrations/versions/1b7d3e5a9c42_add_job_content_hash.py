@@ -0,0 +1,27 @@
+"""add jobs.content_hash fingerprint
+
+Revision ID: 1b7d3e5a9c42
+Revises: 0a6e4b1d9f27
+Create Date: 2026-10-19 17:02:11.514230
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+import pgvector  # Ensure pgvector is available in migrations
+
+# revision identifiers, used by Alembic.
+revision = '1b7d3e5a9c42'
+down_revision = '0a6e4b1d9f27'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Left NULL for existing rows: their first re-sighting takes the full
+    # update path once and stores the fingerprint
+    op.add_column('jobs', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('jobs', 'content_hash')
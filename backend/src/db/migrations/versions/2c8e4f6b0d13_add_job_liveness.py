@@ -0,0 +1,41 @@
+"""add job liveness (last_seen_at, closed_at) and ingest_seen_keys staging table
+
+Revision ID: 2c8e4f6b0d13
+Revises: 1b7d3e5a9c42
+Create Date: 2026-10-19 17:48:36.902417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+import pgvector  # Ensure pgvector is available in migrations
+
+# revision identifiers, used by Alembic.
+revision = '2c8e4f6b0d13'
+down_revision = '1b7d3e5a9c42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('last_seen_at', sa.DateTime(), nullable=True))
+    op.add_column('jobs', sa.Column('closed_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE jobs SET last_seen_at = scraped_at")
+    op.create_index(
+        'ix_jobs_open_source', 'jobs', ['source'], unique=False,
+        postgresql_where=sa.text('closed_at IS NULL'),
+    )
+    op.create_table('ingest_seen_keys',
+    sa.Column('run_id', sa.String(length=32), nullable=False),
+    sa.Column('source', sa.String(), nullable=False),
+    sa.Column('dedupe_key', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('run_id', 'source', 'dedupe_key'),
+    prefixes=['UNLOGGED']
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('ingest_seen_keys')
+    op.drop_index('ix_jobs_open_source', table_name='jobs', postgresql_where=sa.text('closed_at IS NULL'))
+    op.drop_column('jobs', 'closed_at')
+    op.drop_column('jobs', 'last_seen_at')
@@ -0,0 +1,147 @@
+"""add companies.name_key with unique + trigram indexes; merge duplicate companies
+
+Revision ID: 3d9a5b7c1e24
+Revises: 2c8e4f6b0d13
+Create Date: 2026-10-19 18:31:07.640918
+
+"""
+import re
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import ARRAY
+
+import pgvector  # Ensure pgvector is available in migrations
+
+# revision identifiers, used by Alembic.
+revision = '3d9a5b7c1e24'
+down_revision = '2c8e4f6b0d13'
+branch_labels = None
+depends_on = None
+
+# Frozen copy of src.ingestion.entities.normalize_company_key at this revision;
+# migrations must not change behaviour when application code does
+LEGAL_SUFFIXES = {
+    "inc", "incorporated", "llc", "llp", "lp", "ltd", "limited",
+    "corp", "corporation", "plc", "gmbh", "ag", "sa", "sas", "bv", "nv", "pty", "pte", "srl",
+}
+_DROP = re.compile(r"[.'’]")
+_NON_WORD = re.compile(r"[^\w\s]|_")
+
+def _company_key(name):
+    s = unicodedata.normalize("NFKD", name or "")
+    s = "".join(c for c in s if not unicodedata.combining(c)).lower()
+    s = s.replace("&", " and ")
+    s = _DROP.sub("", s)
+    tokens = _NON_WORD.sub(" ", s).split()
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    if len(tokens) > 1 and tokens[0] == "the":
+        tokens.pop(0)
+    return " ".join(tokens)
+
+MERGE_SQL = [
+    # Re-point jobs at the canonical company
+    """
+    UPDATE jobs j SET company_id = m.canonical_id
+    FROM unnest(:duplicate_ids, :canonical_ids) AS m(duplicate_id, canonical_id)
+    WHERE j.company_id = m.duplicate_id
+    """,
+    # Fill the canonical row's gaps from its duplicates
+    """
+    UPDATE companies c SET
+        classification = coalesce(c.classification, d.classification),
+        industry = coalesce(c.industry, d.industry),
+        category = coalesce(c.category, d.category),
+        last_seen = greatest(c.last_seen, d.last_seen)
+    FROM unnest(:duplicate_ids, :canonical_ids) AS m(duplicate_id, canonical_id), companies d
+    WHERE c.id = m.canonical_id AND d.id = m.duplicate_id
+    """,
+    # company_stats rows cascade
+    "DELETE FROM companies WHERE id = ANY(:duplicate_ids)",
+    # Recompute the canonical companies' aggregates
+    """
+    INSERT INTO company_stats (company_id, ai_search_roles, sample_titles, latest_job_at)
+    SELECT c.id, coalesce(a.ai_search_roles, 0), s.sample_titles, a.latest_job_at
+    FROM companies c
+    LEFT JOIN (
+        SELECT company_id, count(id) AS ai_search_roles, max(posted_at) AS latest_job_at
+        FROM jobs WHERE is_ai_search AND company_id = ANY(:canonical_ids)
+        GROUP BY company_id
+    ) a ON a.company_id = c.id
+    LEFT JOIN (
+        SELECT company_id, string_agg(title, ', ' ORDER BY rn) AS sample_titles
+        FROM (
+            SELECT company_id, title, row_number() OVER (
+                PARTITION BY company_id ORDER BY max(posted_at) DESC NULLS LAST, title
+            ) AS rn
+            FROM jobs WHERE is_ai_search AND company_id = ANY(:canonical_ids)
+            GROUP BY company_id, title
+        ) t
+        WHERE rn <= 3
+        GROUP BY company_id
+    ) s ON s.company_id = c.id
+    WHERE c.id = ANY(:canonical_ids)
+    ON CONFLICT (company_id) DO UPDATE SET
+        ai_search_roles = excluded.ai_search_roles,
+        sample_titles = excluded.sample_titles,
+        latest_job_at = excluded.latest_job_at
+    """,
+]
+
+def _ids_param(name):
+    return sa.bindparam(name, type_=ARRAY(sa.Integer))
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.add_column('companies', sa.Column('name_key', sa.String(), nullable=True))
+
+    conn = op.get_bind()
+    rows = conn.execute(sa.text("SELECT id, name FROM companies")).all()
+    keys = {row.id: _company_key(row.name) for row in rows}
+
+    # Companies sharing a key are the same company: fold each group into the
+    # one with most jobs (then the oldest) before the unique index goes on
+    by_key: dict[str, list[int]] = {}
+    for company_id, key in keys.items():
+        by_key.setdefault(key, []).append(company_id)
+    groups = [ids for ids in by_key.values() if len(ids) > 1]
+    if groups:
+        counts = dict(conn.execute(sa.text("SELECT company_id, count(*) FROM jobs GROUP BY company_id")).all())
+        plan = {}
+        for ids in groups:
+            canonical = min(ids, key=lambda i: (-counts.get(i, 0), i))
+            plan.update({i: canonical for i in ids if i != canonical})
+        params = {"duplicate_ids": sorted(plan), "canonical_ids": [plan[i] for i in sorted(plan)]}
+        for sql in MERGE_SQL:
+            stmt = sa.text(sql).bindparams(_ids_param("duplicate_ids"), _ids_param("canonical_ids"))
+            conn.execute(stmt, params)
+        for duplicate_id in plan:
+            keys.pop(duplicate_id)
+
+    if keys:
+        ids = sorted(keys)
+        conn.execute(
+            sa.text("""
+                UPDATE companies c SET name_key = k.name_key
+                FROM unnest(:ids, :keys) AS k(id, name_key)
+                WHERE c.id = k.id
+            """).bindparams(_ids_param("ids"), sa.bindparam("keys", type_=ARRAY(sa.String))),
+            {"ids": ids, "keys": [keys[i] for i in ids]},
+        )
+
+    op.alter_column('companies', 'name_key', nullable=False)
+    op.create_index('ix_companies_name_key', 'companies', ['name_key'], unique=True)
+    op.create_index(
+        'ix_companies_name_key_trgm', 'companies', ['name_key'], unique=False,
+        postgresql_using='gin', postgresql_ops={'name_key': 'gin_trgm_ops'},
+    )
+
+
+def downgrade() -> None:
+    # Merged duplicates are not restored
+    op.drop_index('ix_companies_name_key_trgm', table_name='companies')
+    op.drop_index('ix_companies_name_key', table_name='companies')
+    op.drop_column('companies', 'name_key')
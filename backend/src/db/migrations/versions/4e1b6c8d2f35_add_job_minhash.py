@@ -0,0 +1,35 @@
+"""add jobs.minhash and job_minhash_bands for near-duplicate detection
+
+Revision ID: 4e1b6c8d2f35
+Revises: 3d9a5b7c1e24
+Create Date: 2026-10-19 19:12:44.281305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+import pgvector  # Ensure pgvector is available in migrations
+
+# revision identifiers, used by Alembic.
+revision = '4e1b6c8d2f35'
+down_revision = '3d9a5b7c1e24'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('minhash', sa.LargeBinary(), nullable=True))
+    op.create_table('job_minhash_bands',
+    sa.Column('band', sa.SmallInteger(), nullable=False),
+    sa.Column('bucket', sa.BigInteger(), nullable=False),
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['job_id'], ['jobs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('band', 'bucket', 'job_id')
+    )
+    op.create_index(op.f('ix_job_minhash_bands_job_id'), 'job_minhash_bands', ['job_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_job_minhash_bands_job_id'), table_name='job_minhash_bands')
+    op.drop_table('job_minhash_bands')
+    op.drop_column('jobs', 'minhash')
@@ -0,0 +1,34 @@
+"""add source_crawl_state for sitemap/lastmod discovery
+
+Revision ID: 5f2c7d9e3a46
+Revises: 4e1b6c8d2f35
+Create Date: 2026-10-19 19:55:20.118734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+import pgvector  # Ensure pgvector is available in migrations
+
+# revision identifiers, used by Alembic.
+revision = '5f2c7d9e3a46'
+down_revision = '4e1b6c8d2f35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('source_crawl_state',
+    sa.Column('source', sa.String(), nullable=False),
+    sa.Column('url', sa.String(), nullable=False),
+    sa.Column('lastmod', sa.DateTime(), nullable=True),
+    sa.Column('title', sa.String(), nullable=True),
+    sa.Column('company', sa.String(), nullable=True),
+    sa.Column('location', sa.String(), nullable=True),
+    sa.Column('crawled_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('source', 'url')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('source_crawl_state')
@@ -0,0 +1,38 @@
+"""add job keyset pagination indexes
+
+Revision ID: 8f2b6c41d9e3
+Revises: 3c1d7e92a4b0
+Create Date: 2026-10-19 10:03:17.558210
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+import pgvector  # Ensure pgvector is available in migrations
+
+# revision identifiers, used by Alembic.
+revision = '8f2b6c41d9e3'
+down_revision = '3c1d7e92a4b0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Composite indexes matching the keyset ORDER BY of the job list endpoints
+    op.create_index(
+        'ix_jobs_ai_posted_at_id', 'jobs',
+        [sa.text('posted_at DESC NULLS LAST'), sa.text('id DESC')],
+        unique=False,
+        postgresql_where=sa.text('is_ai_search'),
+    )
+    op.create_index(
+        'ix_jobs_ai_company_scraped_at_id', 'jobs',
+        ['company_id', sa.text('scraped_at DESC'), sa.text('id DESC')],
+        unique=False,
+        postgresql_where=sa.text('is_ai_search'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jobs_ai_company_scraped_at_id', table_name='jobs')
+    op.drop_index('ix_jobs_ai_posted_at_id', table_name='jobs')
@@ -0,0 +1,60 @@
+"""add company_stats aggregates table
+
+Revision ID: b7e4a0c5f218
+Revises: 8f2b6c41d9e3
+Create Date: 2026-10-19 11:26:05.913447
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+import pgvector  # Ensure pgvector is available in migrations
+
+# revision identifiers, used by Alembic.
+revision = 'b7e4a0c5f218'
+down_revision = '8f2b6c41d9e3'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('company_stats',
+    sa.Column('company_id', sa.Integer(), nullable=False),
+    sa.Column('ai_search_roles', sa.Integer(), nullable=False),
+    sa.Column('sample_titles', sa.String(), nullable=True),
+    sa.Column('latest_job_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('company_id')
+    )
+    op.create_index('ix_company_stats_roles', 'company_stats', [sa.text('ai_search_roles DESC'), sa.text('company_id DESC')], unique=False)
+    op.create_index('ix_company_stats_latest', 'company_stats', [sa.text('latest_job_at DESC NULLS LAST'), sa.text('company_id DESC')], unique=False)
+
+    # Backfill from existing jobs (same shape as src/db/aggregates.py)
+    op.execute("""
+        INSERT INTO company_stats (company_id, ai_search_roles, sample_titles, latest_job_at)
+        SELECT c.id, COALESCE(cnt.ai_search_roles, 0), s.sample_titles, cnt.latest_job_at
+        FROM companies c
+        LEFT JOIN (
+            SELECT company_id, count(id) AS ai_search_roles, max(posted_at) AS latest_job_at
+            FROM jobs WHERE is_ai_search GROUP BY company_id
+        ) cnt ON cnt.company_id = c.id
+        LEFT JOIN (
+            SELECT company_id, string_agg(title, ', ' ORDER BY rn) AS sample_titles
+            FROM (
+                SELECT company_id, title,
+                       row_number() OVER (PARTITION BY company_id ORDER BY latest DESC NULLS LAST, title) AS rn
+                FROM (
+                    SELECT company_id, title, max(posted_at) AS latest
+                    FROM jobs WHERE is_ai_search GROUP BY company_id, title
+                ) t
+            ) r
+            WHERE rn <= 3
+            GROUP BY company_id
+        ) s ON s.company_id = c.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_company_stats_latest', table_name='company_stats')
+    op.drop_index('ix_company_stats_roles', table_name='company_stats')
+    op.drop_table('company_stats')
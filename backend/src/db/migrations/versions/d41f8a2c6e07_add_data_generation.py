@@ -0,0 +1,33 @@
+"""add data_generation counter
+
+Revision ID: d41f8a2c6e07
+Revises: b7e4a0c5f218
+Create Date: 2026-10-19 13:02:41.218304
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+import pgvector  # Ensure pgvector is available in migrations
+
+# revision identifiers, used by Alembic.
+revision = 'd41f8a2c6e07'
+down_revision = 'b7e4a0c5f218'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('data_generation',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('generation', sa.BigInteger(), nullable=False),
+    sa.Column('reason', sa.String(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # Single row, bumped by writers
+    op.execute("INSERT INTO data_generation (id, generation, reason, updated_at) VALUES (1, 0, 'init', now())")
+
+
+def downgrade() -> None:
+    op.drop_table('data_generation')
@@ -0,0 +1,67 @@
+"""add jobs.search_vector full-text index
+
+Revision ID: e92b3d7f1c58
+Revises: d41f8a2c6e07
+Create Date: 2026-10-19 14:37:12.604918
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+import pgvector  # Ensure pgvector is available in migrations
+
+# revision identifiers, used by Alembic.
+revision = 'e92b3d7f1c58'
+down_revision = 'd41f8a2c6e07'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('jobs', sa.Column('search_vector', postgresql.TSVECTOR(), nullable=True))
+
+    # Description text without the stamped OPP_META:/META: prefixes and HTML tags
+    op.execute(r"""
+        CREATE FUNCTION jobs_clean_description(description text) RETURNS text AS $$
+            SELECT regexp_replace(
+                regexp_replace(
+                    coalesce(description, ''),
+                    '^\s*(OPP_META: [^|]*\|\|\s*)?(META: \S+( \| \S+)* \|\|\s*)?', ''
+                ),
+                '<[^>]*>', ' ', 'g'
+            )
+        $$ LANGUAGE sql IMMUTABLE
+    """)
+
+    # Maintained by a trigger rather than a generated column: generated columns
+    # can't read companies.name
+    op.execute("""
+        CREATE FUNCTION jobs_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector :=
+                setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+                setweight(to_tsvector('english', coalesce(
+                    (SELECT name FROM companies WHERE id = NEW.company_id), '')), 'B') ||
+                setweight(to_tsvector('english', jobs_clean_description(NEW.description)), 'C');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER jobs_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF title, description, company_id ON jobs
+        FOR EACH ROW EXECUTE FUNCTION jobs_search_vector_update()
+    """)
+
+    # Backfill through the trigger
+    op.execute("UPDATE jobs SET title = title")
+    op.create_index('ix_jobs_search_vector', 'jobs', ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jobs_search_vector', table_name='jobs', postgresql_using='gin')
+    op.execute("DROP TRIGGER jobs_search_vector_trigger ON jobs")
+    op.execute("DROP FUNCTION jobs_search_vector_update()")
+    op.execute("DROP FUNCTION jobs_clean_description(text)")
+    op.drop_column('jobs', 'search_vector')
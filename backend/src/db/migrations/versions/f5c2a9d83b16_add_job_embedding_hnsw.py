@@ -0,0 +1,31 @@
+"""add HNSW index on jobs.embedding
+
+Revision ID: f5c2a9d83b16
+Revises: e92b3d7f1c58
+Create Date: 2026-10-19 15:21:48.377102
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+import pgvector  # Ensure pgvector is available in migrations
+
+# revision identifiers, used by Alembic.
+revision = 'f5c2a9d83b16'
+down_revision = 'e92b3d7f1c58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_jobs_embedding_hnsw', 'jobs', ['embedding'], unique=False,
+        postgresql_using='hnsw',
+        postgresql_with={'m': 16, 'ef_construction': 64},
+        postgresql_ops={'embedding': 'vector_cosine_ops'},
+        postgresql_where=sa.text('is_ai_search'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_jobs_embedding_hnsw', table_name='jobs')
@@ -1,6 +1,7 @@
 from sqlalchemy import (
-    String, Integer, Boolean, DateTime, ForeignKey, Float, Text
+    String, Integer, BigInteger, SmallInteger, Boolean, DateTime, ForeignKey, Float, Text, LargeBinary, Index, text
 )
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import declarative_base, relationship, Mapped, mapped_column
 from pgvector.sqlalchemy import Vector
 from datetime import datetime
@@ -9,15 +10,28 @@ Base = declarative_base()
 
 class Company(Base):
     __tablename__ = "companies"
+    __table_args__ = (
+        # Near-duplicate lookups (similarity / %) during entity resolution
+        Index(
+            "ix_companies_name_key_trgm", "name_key",
+            postgresql_using="gin", postgresql_ops={"name_key": "gin_trgm_ops"},
+        ),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     name: Mapped[str] = mapped_column(String, index=True, unique=True)
+    # normalize_company_key(name): one row per real-world company (src/ingestion/entities.py)
+    name_key: Mapped[str] = mapped_column(String, index=True, unique=True)
     website: Mapped[str | None] = mapped_column(String, nullable=True)
     careers_url: Mapped[str | None] = mapped_column(String, nullable=True)
     category: Mapped[str | None] = mapped_column(String, nullable=True)  # "SaaS", "Agency", etc.
     region: Mapped[str | None] = mapped_column(String, nullable=True)
     classification: Mapped[str | None] = mapped_column(String, nullable=True, index=True) # "Client", "Competitor"
     industry: Mapped[str | None] = mapped_column(String, nullable=True, index=True) # e.g. "B2B SaaS"
+
+    # Clustering (mean of job embeddings, MiniBatchKMeans assignment)
+    embedding = mapped_column(Vector(384), nullable=True)
+    cluster_id: Mapped[int | None] = mapped_column(Integer, nullable=True, index=True)
     
     last_seen: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -27,6 +41,31 @@ class Company(Base):
 
 class Job(Base):
     __tablename__ = "jobs"
+    __table_args__ = (
+        # Keyset pagination for /api/jobs and /api/companies/{id}/jobs
+        Index(
+            "ix_jobs_ai_posted_at_id",
+            text("posted_at DESC NULLS LAST"), text("id DESC"),
+            postgresql_where=text("is_ai_search"),
+        ),
+        Index(
+            "ix_jobs_ai_company_scraped_at_id",
+            "company_id", text("scraped_at DESC"), text("id DESC"),
+            postgresql_where=text("is_ai_search"),
+        ),
+        # Full-text search for /api/jobs?q=
+        Index("ix_jobs_search_vector", "search_vector", postgresql_using="gin"),
+        # ANN candidates for hybrid search
+        Index(
+            "ix_jobs_embedding_hnsw", "embedding",
+            postgresql_using="hnsw",
+            postgresql_with={"m": 16, "ef_construction": 64},
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+            postgresql_where=text("is_ai_search"),
+        ),
+        # End-of-run sweep (open jobs of one source) and ?open_only=
+        Index("ix_jobs_open_source", "source", postgresql_where=text("closed_at IS NULL")),
+    )
     
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     company_id: Mapped[int] = mapped_column(ForeignKey("companies.id"), index=True)
@@ -42,7 +81,23 @@ class Job(Base):
     url: Mapped[str | None] = mapped_column(String, nullable=True)
     posted_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     scraped_at: Mapped[datetime] = mapped_column(DateTime, index=True, default=datetime.utcnow)
-    description: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Liveness, maintained set-based at the end of each source run (src/ingestion/run.py):
+    # last run that listed the job, and when a complete run of its source stopped listing it
+    last_seen_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True, default=datetime.utcnow)
+    closed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    # Cleaned description text lives in job_descriptions, shared by content hash
+    description_hash: Mapped[str | None] = mapped_column(
+        String(64), ForeignKey("job_descriptions.content_hash"), nullable=True
+    )
+    # sha256 of the source fields behind this row (see upsert.content_fingerprint);
+    # an unchanged fingerprint lets a re-seen job skip its UPDATE entirely
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # MinHash signature of title + description (uint32 little-endian, see
+    # src/ingestion/minhash.py); its LSH bands live in job_minhash_bands
+    minhash: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True, deferred=True)
+    # title (A) + company name (B) + description body (C); maintained by the
+    # jobs_search_vector_trigger trigger, never written from Python
+    search_vector: Mapped[str | None] = mapped_column(TSVECTOR, nullable=True, deferred=True)
 
     # Semantic / AI Layers
     relevance_score: Mapped[float | None] = mapped_column(Float, nullable=True)
@@ -65,3 +120,84 @@ class Job(Base):
     embedding = mapped_column(Vector(384), nullable=True)  # v0: optional
 
     company = relationship("Company", back_populates="jobs")
+
+class JobDescription(Base):
+    """
+    Cleaned (HTML-free) job description bodies, stored once per distinct text
+    and keyed by its sha256. Jobs point at a body via description_hash, so
+    re-seeing a job never rewrites description bytes.
+    """
+    __tablename__ = "job_descriptions"
+
+    content_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    body: Mapped[str] = mapped_column(Text)
+
+class JobMinhashBand(Base):
+    """
+    LSH buckets of each job's MinHash signature: jobs sharing a (band, bucket)
+    are near-duplicate candidates, confirmed against jobs.minhash.
+    """
+    __tablename__ = "job_minhash_bands"
+
+    band: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    bucket: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    job_id: Mapped[int] = mapped_column(ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True, index=True)
+
+class SourceCrawlState(Base):
+    """
+    Last crawl of each posting URL of an incremental source (sitemap <lastmod>,
+    ATS updated_at): the timestamp it was fetched at and the identity fields it
+    yielded, so later runs skip unchanged postings yet still report them as listed.
+    """
+    __tablename__ = "source_crawl_state"
+
+    source: Mapped[str] = mapped_column(String, primary_key=True)
+    url: Mapped[str] = mapped_column(String, primary_key=True)
+    lastmod: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    title: Mapped[str | None] = mapped_column(String, nullable=True)
+    company: Mapped[str | None] = mapped_column(String, nullable=True)
+    location: Mapped[str | None] = mapped_column(String, nullable=True)
+    crawled_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+class IngestSeenKey(Base):
+    """
+    Dedupe keys listed by a source during one ingestion run. Staged in bulk at
+    the end of the source and deleted again once the jobs table has been marked
+    and swept, so the table is UNLOGGED and normally empty.
+    """
+    __tablename__ = "ingest_seen_keys"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    run_id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    source: Mapped[str] = mapped_column(String, primary_key=True)
+    dedupe_key: Mapped[str] = mapped_column(String, primary_key=True)
+
+class CompanyStats(Base):
+    """
+    Per-company aggregates over AI-search jobs, maintained incrementally by the
+    upsert path (see src/db/aggregates.py) so the companies listing never has to
+    scan jobs.
+    """
+    __tablename__ = "company_stats"
+    __table_args__ = (
+        Index("ix_company_stats_roles", text("ai_search_roles DESC"), text("company_id DESC")),
+        Index("ix_company_stats_latest", text("latest_job_at DESC NULLS LAST"), text("company_id DESC")),
+    )
+
+    company_id: Mapped[int] = mapped_column(ForeignKey("companies.id", ondelete="CASCADE"), primary_key=True)
+    ai_search_roles: Mapped[int] = mapped_column(Integer, default=0)
+    sample_titles: Mapped[str | None] = mapped_column(String, nullable=True) # top 3 unique titles, most recent first
+    latest_job_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+class DataGeneration(Base):
+    """
+    Single-row counter bumped whenever writers change what the API serves
+    (ingestion runs, maintenance scripts). HTTP response caches and ETags are
+    keyed on it (see src/db/generation.py).
+    """
+    __tablename__ = "data_generation"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, default=1)
+    generation: Mapped[int] = mapped_column(BigInteger, default=0)
+    reason: Mapped[str | None] = mapped_column(String, nullable=True)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,98 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy import select, bindparam, any_, String
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.models import Company
+from src.core.config import settings
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+@dataclass(slots=True)
+class CachedCompany:
+    """The company columns the upsert path reads, detached from any session."""
+    id: int
+    name: str
+    name_key: str
+    classification: str | None
+    industry: str | None
+    category: str | None
+
+    @classmethod
+    def of(cls, company) -> "CachedCompany":
+        return cls(company.id, company.name, company.name_key, company.classification, company.industry, company.category)
+
+def companies_by_key_stmt(keys: list[str]):
+    # One array parameter instead of an IN list that grows with the run
+    return select(
+        Company.id, Company.name, Company.name_key, Company.classification, Company.industry, Company.category
+    ).where(Company.name_key == any_(bindparam("keys", keys, type_=ARRAY(String))))
+
+class CompanyCache:
+    """
+    LRU map of company key (normalize_company_key) -> CachedCompany, so upserts
+    skip the per-job company lookup. Fuzzy matches are cached under the
+    incoming key too, so each name variant is resolved at most once. Scoped to
+    an ingestion run by default (see IngestRun.companies). An upsert writes its
+    company back only after its transaction commits and discards the key when
+    it fails: a rolled-back company is never served, and a stale one (say,
+    merged away) is dropped by the first job that fails on it.
+    """
+
+    def __init__(self, maxsize: int = settings.INGEST_COMPANY_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[str, CachedCompany] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> CachedCompany | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, entry: CachedCompany, key: str | None = None):
+        key = entry.name_key if key is None else key
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def discard(self, key: str):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    async def prime(self, session: AsyncSession, keys) -> int:
+        """
+        Loads every not-yet-cached company among `keys` with a single exact-key
+        query. Keys with no company are left to the upsert, which resolves them
+        fuzzily or creates the company.
+        """
+        missing = sorted({k for k in keys if k and k not in self._entries})
+        if not missing:
+            return 0
+        result = await session.execute(companies_by_key_stmt(missing))
+        loaded = 0
+        for row in result.all():
+            self.put(CachedCompany(row.id, row.name, row.name_key, row.classification, row.industry, row.category))
+            loaded += 1
+        logger.info("[ingest] primed company cache", extra={"keys": len(missing), "loaded": loaded})
+        return loaded
+
+# Process-wide instance, used instead of a per-run cache when
+# INGEST_COMPANY_CACHE_PROCESS_SCOPED is set
+company_cache = CompanyCache()
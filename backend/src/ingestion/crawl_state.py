@@ -0,0 +1,94 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from dateutil import parser as date_parser
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from src.db.models import SourceCrawlState
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# 7 bind parameters per row; stay under asyncpg's 32767 limit
+_ROWS_PER_INSERT = 4000
+
+def parse_lastmod(value: str | None) -> datetime | None:
+    """A W3C/ISO 8601 timestamp (often with an offset) as naive UTC."""
+    if not value:
+        return None
+    try:
+        dt = date_parser.isoparse(value.strip())
+    except (ValueError, OverflowError):
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+@dataclass
+class CrawlEntry:
+    url: str
+    lastmod: datetime | None
+    title: str | None = None
+    company: str | None = None
+    location: str | None = None
+
+def is_changed(prev: CrawlEntry | None, lastmod: datetime | None) -> bool:
+    """True unless the stored crawl is at least as new as lastmod (unknown counts as changed)."""
+    return prev is None or lastmod is None or prev.lastmod is None or lastmod > prev.lastmod
+
+def save_state_stmt(source: str, entries: list[CrawlEntry], now: datetime):
+    stmt = insert(SourceCrawlState).values([
+        {
+            "source": source, "url": e.url, "lastmod": e.lastmod,
+            "title": e.title, "company": e.company, "location": e.location, "crawled_at": now,
+        }
+        for e in entries
+    ])
+    return stmt.on_conflict_do_update(
+        index_elements=[SourceCrawlState.source, SourceCrawlState.url],
+        set_={c: stmt.excluded[c] for c in ("lastmod", "title", "company", "location", "crawled_at")},
+    )
+
+async def save_committed(store, source: str, crawled: dict[str, CrawlEntry], jobs) -> None:
+    """Saves the crawl entries (by url) of the committed jobs; see Source.commit."""
+    entries = [crawled.pop(job.url) for job in jobs if job.url in crawled]
+    if not entries:
+        return
+    try:
+        await store.save(source, entries)
+    except Exception as e:
+        logger.error("Failed to save crawl state", extra={"source": source, "error": str(e)})
+
+class CrawlStateStore:
+    """
+    Per-source crawl state in Postgres, keyed by (source, url): one SELECT to
+    load, batched upserts to save. Used by sources that can tell from a
+    listing-level timestamp whether a posting changed since it was last fetched.
+    """
+
+    def __init__(self, session_factory=None):
+        if session_factory is None:
+            from src.db.session import AsyncSessionLocal
+            session_factory = AsyncSessionLocal
+        self.session_factory = session_factory
+
+    async def load(self, source: str) -> dict[str, CrawlEntry]:
+        async with self.session_factory() as session:
+            result = await session.execute(
+                select(
+                    SourceCrawlState.url, SourceCrawlState.lastmod, SourceCrawlState.title,
+                    SourceCrawlState.company, SourceCrawlState.location,
+                ).where(SourceCrawlState.source == source)
+            )
+            return {row.url: CrawlEntry(row.url, row.lastmod, row.title, row.company, row.location) for row in result.all()}
+
+    async def save(self, source: str, entries: list[CrawlEntry]):
+        if not entries:
+            return
+        now = datetime.utcnow()
+        async with self.session_factory() as session:
+            for i in range(0, len(entries), _ROWS_PER_INSERT):
+                await session.execute(save_state_stmt(source, entries[i:i + _ROWS_PER_INSERT], now))
+            await session.commit()
+        logger.info("Saved crawl state", extra={"source": source, "count": len(entries)})
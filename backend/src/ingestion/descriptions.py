@@ -0,0 +1,51 @@
+import hashlib
+import re
+
+from selectolax.lexbor import LexborHTMLParser
+from sqlalchemy import delete, exists, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from src.db.models import Job, JobDescription
+
+# Line breaks go before <br> and closing block tags; inline tags join with their text
+_BLOCK_BREAKS = re.compile(r"(?i)(<br\s*/?>|</(?:p|div|li|ul|ol|h[1-6]|tr|table|section|article|blockquote)>)")
+_SPACES = re.compile(r"[ \t\r\f\v\xa0]+")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+
+def clean_description(text: str | None) -> str | None:
+    """
+    Plain-text description: HTML stripped (block boundaries become newlines),
+    whitespace normalized. Returns None for empty input.
+    """
+    if not text:
+        return None
+    if "<" in text and ">" in text:
+        tree = LexborHTMLParser(_BLOCK_BREAKS.sub(r"\n\1", text))
+        for node in tree.css("script, style"):
+            node.decompose()
+        root = tree.body or tree.root
+        text = root.text(separator="") if root else ""
+    lines = [_SPACES.sub(" ", line).strip() for line in text.splitlines()]
+    text = _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+    return text or None
+
+def description_hash(body: str) -> str:
+    return hashlib.sha256(body.encode()).hexdigest()
+
+def insert_description_stmt(content_hash: str, body: str):
+    """Stores a body once; identical descriptions across jobs share the row."""
+    return (
+        pg_insert(JobDescription)
+        .values(content_hash=content_hash, body=body)
+        .on_conflict_do_nothing(index_elements=[JobDescription.content_hash])
+    )
+
+def delete_orphan_descriptions_stmt():
+    """
+    Drops bodies no job points at any more (left behind when a job's text
+    changes). Run when no upserts are in flight: one that re-uses a body in the
+    same window would fail its foreign key check.
+    """
+    return delete(JobDescription).where(
+        ~exists(select(Job.id).where(Job.description_hash == JobDescription.content_hash))
+    ).execution_options(synchronize_session=False)
@@ -0,0 +1,155 @@
+import re
+import unicodedata
+from typing import Iterable
+
+from sqlalchemy import select, update, delete, func, or_, and_, values, column, Integer, text
+from sqlalchemy.orm import aliased
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.models import Company, Job
+from src.db.aggregates import refresh_company_stats_stmt
+from src.core.config import settings
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Trailing legal forms that never distinguish two companies. Generic words
+# such as "company"/"co" are not among them: "Fast Company" is not "Fast".
+LEGAL_SUFFIXES = {
+    "inc", "incorporated", "llc", "llp", "lp", "ltd", "limited",
+    "corp", "corporation", "plc", "gmbh", "ag", "sa", "sas", "bv", "nv", "pty", "pte", "srl",
+}
+# Keys shorter than this only ever match exactly ("ai" is not "a1")
+FUZZY_MIN_KEY_LENGTH = 4
+
+_DROP = re.compile(r"[.'’]")
+_NON_WORD = re.compile(r"[^\w\s]|_")
+
+def normalize_company_key(name: str | None) -> str:
+    """
+    Resolution key for a company name: accent-folded, lower-cased, punctuation
+    and trailing legal suffixes removed. "Acme Corp", "ACME Corporation " and
+    "Acme, Inc." all map to "acme".
+    """
+    s = unicodedata.normalize("NFKD", name or "")
+    s = "".join(c for c in s if not unicodedata.combining(c)).lower()
+    s = s.replace("&", " and ")
+    s = _DROP.sub("", s)          # "A.C.M.E." -> "acme", "Macy's" -> "macys"
+    tokens = _NON_WORD.sub(" ", s).split()
+    while len(tokens) > 1 and tokens[-1] in LEGAL_SUFFIXES:
+        tokens.pop()
+    if len(tokens) > 1 and tokens[0] == "the":
+        tokens.pop(0)
+    return " ".join(tokens)
+
+def resolve_company_stmt(key: str, threshold: float | None = None):
+    """
+    The company for `key`: the exact name_key match if there is one, otherwise
+    the most similar name_key at or above `threshold` (pg_trgm, served by the
+    ix_companies_name_key_trgm GIN index).
+    """
+    threshold = settings.COMPANY_MATCH_THRESHOLD if threshold is None else threshold
+    exact = Company.name_key == key
+    if len(key) < FUZZY_MIN_KEY_LENGTH:
+        return select(Company).where(exact).limit(1)
+    similarity = func.similarity(Company.name_key, key)
+    return (
+        select(Company)
+        .where(or_(exact, and_(Company.name_key.op("%")(key), similarity >= threshold)))
+        .order_by(exact.desc(), similarity.desc(), Company.id)
+        .limit(1)
+    )
+
+async def resolve_company(session: AsyncSession, key: str) -> Company | None:
+    result = await session.execute(resolve_company_stmt(key))
+    company = result.scalars().first()
+    if company is not None and company.name_key != key:
+        logger.info("[entities] fuzzy company match", extra={"key": key, "company_id": company.id, "name_key": company.name_key})
+    return company
+
+def similar_pairs_stmt(threshold: float):
+    """(id_a, id_b, similarity) for every pair of companies whose keys are near-duplicates."""
+    a, b = aliased(Company), aliased(Company)
+    similarity = func.similarity(a.name_key, b.name_key)
+    return (
+        select(a.id.label("id_a"), b.id.label("id_b"), similarity.label("similarity"))
+        .join(b, and_(a.id < b.id, a.name_key.op("%")(b.name_key)))
+        .where(similarity >= threshold)
+        .order_by(similarity.desc())
+    )
+
+def set_similarity_threshold_stmt(threshold: float):
+    # Lets the % operator (and its index scan) prune at our threshold, not pg_trgm's 0.3
+    return text("SELECT set_config('pg_trgm.similarity_threshold', :t, true)").bindparams(t=str(threshold))
+
+def merge_plan(pairs: Iterable[tuple[int, int]], job_counts: dict[int, int]) -> dict[int, int]:
+    """
+    Groups companies linked by `pairs` (transitively) and maps every member to
+    its group's canonical company: the one with most jobs, then the oldest id.
+    Returns {duplicate_id: canonical_id}.
+    """
+    parent: dict[int, int] = {}
+
+    def find(x: int) -> int:
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for a, b in pairs:
+        ra, rb = find(a), find(b)
+        if ra != rb:
+            parent[max(ra, rb)] = min(ra, rb)
+
+    groups: dict[int, list[int]] = {}
+    for x in list(parent):
+        groups.setdefault(find(x), []).append(x)
+
+    plan = {}
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        canonical = min(members, key=lambda i: (-job_counts.get(i, 0), i))
+        plan.update({m: canonical for m in members if m != canonical})
+    return plan
+
+def merge_companies_stmts(plan: dict[int, int]) -> list:
+    """
+    Set-based merge of {duplicate_id: canonical_id}: re-point all jobs, fill the
+    canonical row's empty classification/industry/category from its duplicates,
+    delete the duplicates (company_stats cascades) and recompute the canonical
+    companies' stats. A fixed number of statements for any plan size.
+    """
+    if not plan:
+        return []
+    mapping = values(
+        column("duplicate_id", Integer), column("canonical_id", Integer), name="merge"
+    ).data(sorted(plan.items()))
+    dup = aliased(Company)
+    return [
+        update(Job)
+        .where(Job.company_id == mapping.c.duplicate_id)
+        .values(company_id=mapping.c.canonical_id)
+        .execution_options(synchronize_session=False),
+        update(Company)
+        .where(Company.id == mapping.c.canonical_id, dup.id == mapping.c.duplicate_id)
+        .values(
+            classification=func.coalesce(Company.classification, dup.classification),
+            industry=func.coalesce(Company.industry, dup.industry),
+            category=func.coalesce(Company.category, dup.category),
+            last_seen=func.greatest(Company.last_seen, dup.last_seen),
+        )
+        .execution_options(synchronize_session=False),
+        delete(Company)
+        .where(Company.id.in_(select(mapping.c.duplicate_id)))
+        .execution_options(synchronize_session=False),
+        refresh_company_stats_stmt(sorted(set(plan.values()))),
+    ]
+
+def job_counts_stmt(company_ids: Iterable[int]):
+    return (
+        select(Job.company_id, func.count(Job.id))
+        .where(Job.company_id.in_(list(company_ids)))
+        .group_by(Job.company_id)
+    )
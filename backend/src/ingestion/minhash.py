@@ -0,0 +1,261 @@
+import hashlib
+import re
+import zlib
+from dataclasses import dataclass, field
+
+import numpy as np
+from sqlalchemy import select, update, delete, union_all, tuple_, values, column, bindparam, any_, Integer, LargeBinary, String
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.models import Company, Job, JobMinhashBand
+from src.ingestion.descriptions import clean_description
+from src.ingestion.entities import normalize_company_key
+from src.core.config import settings
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Universal hashing modulo a Mersenne prime: a, x < 2^31 keeps a*x + b inside uint64
+_PRIME = (1 << 31) - 1
+_WORD = re.compile(r"\w+")
+
+class MinHasher:
+    """
+    MinHash signatures over word shingles, banded for LSH.
+
+    With `bands` bands of `num_perm / bands` rows, two texts with Jaccard
+    similarity s share at least one band bucket with probability
+    1 - (1 - s^rows)^bands (~0.7 is the knee for 128 permutations in 16 bands),
+    so candidates are cheap to find and then confirmed on the full signature.
+    """
+
+    def __init__(self, num_perm: int = 128, bands: int = 16, shingle_size: int = 3, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, _PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, size=num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str | None) -> set[str]:
+        tokens = _WORD.findall((text or "").lower())
+        k = self.shingle_size
+        if len(tokens) <= k:
+            return {" ".join(tokens)} if tokens else set()
+        return {" ".join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)}
+
+    def signature(self, text: str | None) -> np.ndarray | None:
+        """uint32[num_perm], or None when the text has no words."""
+        shingles = self.shingles(text)
+        if not shingles:
+            return None
+        # crc32, not hash(): signatures are persisted and must be stable across processes
+        x = np.fromiter((zlib.crc32(s.encode()) % _PRIME for s in shingles), dtype=np.uint64, count=len(shingles))
+        hashed = (np.outer(x, self._a) + self._b) % _PRIME
+        return hashed.min(axis=0).astype(np.uint32)
+
+    def band_keys(self, signature: np.ndarray) -> list[tuple[int, int]]:
+        """(band, bucket) per band; bucket is a signed 64-bit hash of the band's rows."""
+        keys = []
+        for band, rows in enumerate(signature.reshape(self.bands, self.rows)):
+            digest = hashlib.blake2b(rows.tobytes(), digest_size=8).digest()
+            keys.append((band, int.from_bytes(digest, "big", signed=True)))
+        return keys
+
+    @staticmethod
+    def similarity(a: np.ndarray, b: np.ndarray) -> float:
+        """Estimated Jaccard similarity of the two shingle sets."""
+        return float(np.mean(a == b))
+
+def minhash_text(title: str, body: str | None) -> str:
+    return f"{title}\n{body or ''}"
+
+@dataclass
+class NearDuplicate:
+    dedupe_key: str
+    similarity: float
+    # Set when the match is already stored (not just seen earlier in this run)
+    job_id: int | None = None
+    company_id: int | None = None
+
+@dataclass
+class MinHashIndex:
+    """In-memory LSH index of the jobs accepted so far in one run."""
+    hasher: MinHasher
+    buckets: dict[tuple[int, int], list[str]] = field(default_factory=dict)
+    entries: dict[str, tuple[str, np.ndarray]] = field(default_factory=dict)
+
+    def add(self, dedupe_key: str, company_key: str, signature: np.ndarray):
+        self.entries[dedupe_key] = (company_key, signature)
+        for band_key in self.hasher.band_keys(signature):
+            self.buckets.setdefault(band_key, []).append(dedupe_key)
+
+    def query(self, dedupe_key: str, company_key: str, signature: np.ndarray, threshold: float) -> NearDuplicate | None:
+        best = None
+        candidates = {k for band_key in self.hasher.band_keys(signature) for k in self.buckets.get(band_key, ())}
+        for key in candidates - {dedupe_key}:
+            other_company, other = self.entries[key]
+            if other_company != company_key:
+                continue
+            sim = self.hasher.similarity(signature, other)
+            if sim >= threshold and (best is None or sim > best.similarity):
+                best = NearDuplicate(key, sim)
+        return best
+
+def signature_bytes(signature: np.ndarray) -> bytes:
+    return signature.astype("<u4").tobytes()
+
+def signature_from_bytes(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype="<u4").astype(np.uint32)
+
+def band_candidates_stmt(band_keys: list[tuple[int, int]], dedupe_key: str, include_self: bool = False):
+    """
+    Stored jobs sharing at least one band bucket with the signature (other than
+    the job itself). With include_self the job's own row is returned too when it
+    is stored, so one round trip also tells whether the job is new.
+    """
+    columns = (Job.id, Job.company_id, Job.dedupe_key, Job.minhash, Company.name_key)
+    stmt = (
+        select(*columns)
+        .join(JobMinhashBand, JobMinhashBand.job_id == Job.id)
+        .join(Company, Company.id == Job.company_id)
+        .where(tuple_(JobMinhashBand.band, JobMinhashBand.bucket).in_(band_keys))
+        .where(Job.dedupe_key != dedupe_key)
+        .distinct()
+    )
+    if include_self:
+        own = select(*columns).outerjoin(Company, Company.id == Job.company_id).where(Job.dedupe_key == dedupe_key)
+        stmt = union_all(stmt, own)
+    return stmt
+
+def stored_keys_stmt(dedupe_keys: list[str]):
+    # One array parameter for a whole listing
+    return select(Job.dedupe_key).where(Job.dedupe_key == any_(bindparam("keys", dedupe_keys, type_=ARRAY(String))))
+
+def delete_bands_stmt(job_id: int):
+    return delete(JobMinhashBand).where(JobMinhashBand.job_id == job_id)
+
+def insert_bands_stmt(rows: list[dict]):
+    """rows: {"band", "bucket", "job_id"} dicts; one multi-row INSERT."""
+    return insert(JobMinhashBand).values(rows).on_conflict_do_nothing()
+
+def band_rows(job_id: int, band_keys: list[tuple[int, int]]) -> list[dict]:
+    return [{"band": band, "bucket": bucket, "job_id": job_id} for band, bucket in band_keys]
+
+def bulk_signature_stmt(rows: list[tuple[int, bytes]]):
+    """One UPDATE ... FROM VALUES setting jobs.minhash for (id, signature bytes) rows."""
+    v = values(column("id", Integer), column("minhash", LargeBinary), name="signatures").data(rows)
+    return (
+        update(Job)
+        .where(Job.id == v.c.id)
+        .values(minhash=v.c.minhash)
+        .execution_options(synchronize_session=False)
+    )
+
+def best_near_duplicate(
+    hasher: MinHasher,
+    rows,
+    company_key: str,
+    signature: np.ndarray,
+    threshold: float,
+) -> NearDuplicate | None:
+    """Best band candidate of the same company whose signature similarity reaches `threshold`."""
+    best = None
+    for row in rows:
+        if row.name_key != company_key or row.minhash is None:
+            continue
+        sim = hasher.similarity(signature, signature_from_bytes(row.minhash))
+        if sim >= threshold and (best is None or sim > best.similarity):
+            best = NearDuplicate(row.dedupe_key, sim, job_id=row.id, company_id=row.company_id)
+    return best
+
+minhasher = MinHasher(
+    num_perm=settings.DEDUPE_MINHASH_PERMUTATIONS,
+    bands=settings.DEDUPE_MINHASH_BANDS,
+)
+
+class NearDuplicateDetector:
+    """
+    Flags postings that are near-duplicates of one already kept, before they
+    are embedded or classified. A posting matches when a job of the same
+    company (by name_key) has estimated title + description Jaccard similarity
+    of at least `threshold`: first among the jobs accepted earlier in this run,
+    then among stored jobs via their LSH bands. Location is deliberately not
+    compared ("Remote (US)" vs "United States"). Postings whose dedupe_key is
+    already stored are never flagged: only new jobs are folded into old ones.
+
+    Which listed keys are stored is resolved per listing (prime()); keys the
+    listing didn't cover learn it from the band query itself, so a check costs
+    at most one round trip and none for a stored job.
+    """
+
+    def __init__(self, session_factory, hasher: MinHasher | None = None, threshold: float | None = None):
+        self.session_factory = session_factory
+        self.hasher = hasher or minhasher
+        self.threshold = settings.DEDUPE_MINHASH_THRESHOLD if threshold is None else threshold
+        self.index = MinHashIndex(self.hasher)
+        self._pending: dict[str, tuple[str, np.ndarray]] = {}
+        # Dedupe keys known to be stored / known not to be (as of prime())
+        self.stored: set[str] = set()
+        self.unstored: set[str] = set()
+
+    async def prime(self, session: AsyncSession, dedupe_keys) -> int:
+        """Looks up which of a listing's keys are stored, in one query. Returns how many are."""
+        keys = sorted({k for k in dedupe_keys if k} - self.stored - self.unstored)
+        if not keys:
+            return 0
+        result = await session.execute(stored_keys_stmt(keys))
+        stored = set(result.scalars().all())
+        self.stored |= stored
+        self.unstored.update(k for k in keys if k not in stored)
+        return len(stored)
+
+    async def check(self, job, dedupe_key: str) -> NearDuplicate | None:
+        """Computes job.minhash and returns the job it duplicates, if any."""
+        signature = self.hasher.signature(minhash_text(job.title, clean_description(job.description)))
+        if signature is None:
+            return None
+        job.minhash = signature.tolist()
+        company_key = normalize_company_key(job.company)
+        self._pending[dedupe_key] = (company_key, signature)
+        # A job we already store is always let through, so it keeps getting
+        # updated. Otherwise two stored near-duplicates (legacy rows, merged
+        # companies) would each match the other forever.
+        if dedupe_key in self.stored:
+            return None
+
+        # Only a key known to be new may be folded without asking the DB
+        known_new = dedupe_key in self.unstored
+        dup = self.index.query(dedupe_key, company_key, signature, self.threshold)
+        if dup is None or not known_new:
+            try:
+                async with self.session_factory() as session:
+                    stmt = band_candidates_stmt(self.hasher.band_keys(signature), dedupe_key, include_self=not known_new)
+                    rows = (await session.execute(stmt)).all()
+            except Exception as e:
+                logger.warning("[dedupe] near-duplicate lookup failed", extra={"error": str(e)})
+                rows = []
+            if any(row.dedupe_key == dedupe_key for row in rows):
+                self.stored.add(dedupe_key)
+                return None
+            if dup is None:
+                dup = best_near_duplicate(self.hasher, rows, company_key, signature, self.threshold)
+        if dup is not None:
+            self._pending.pop(dedupe_key, None)
+        return dup
+
+    def accept(self, dedupe_key: str):
+        """Adds a checked job that is going to be upserted to the in-run index."""
+        pending = self._pending.pop(dedupe_key, None)
+        if pending is not None:
+            self.index.add(dedupe_key, *pending)
+        # Stored once upserted: a later source listing it must not fold it
+        self.unstored.discard(dedupe_key)
+        self.stored.add(dedupe_key)
+
+    def reject(self, dedupe_key: str):
+        self._pending.pop(dedupe_key, None)
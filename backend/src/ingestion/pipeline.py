@@ -1,85 +1,216 @@
 import asyncio
+from datetime import datetime
 from src.db.session import AsyncSessionLocal
 from src.ingestion.sources.seojobs import SEOJobsSource
 from src.ingestion.sources.linkedin import LinkedInSource
-from src.ingestion.upsert import upsert_raw_job
+from src.ingestion.sources.ats import ats_sources
+from src.ingestion.upsert import dedupe_key_for, listing_dedupe_key
+from src.ingestion.prescreen import prescreen_listings
+from src.ingestion.entities import normalize_company_key
+from src.ingestion.run import IngestRun
+from src.ingestion.company_cache import CompanyCache, company_cache
+from src.ingestion.workers import UpsertWorkers
+from src.ingestion.minhash import NearDuplicateDetector
+from src.ingestion.descriptions import delete_orphan_descriptions_stmt
 from src.semantic.classifier import classifier
+from src.semantic.clustering import update_company_clusters
+from src.db.generation import bump_generation
 from src.core.config import settings
+from src.core.cache import invalidate_all
 from src.core.logging import get_logger
 
 logger = get_logger(__name__)
 
-async def process_job_safe(job, upsert_sem, stats):
+async def run_ingestion():
     """
-    Worker to upsert a job with its own DB session, bounded by semaphore.
+    v0.1 Hardened Ingestion:
+    - Parallel fetch from SEOJobs (listing or sitemap discovery), ATS boards + LinkedIn
+    - Bounded concurrency for upserts, partitioned by company
+    - Shared stats
     """
-    async with upsert_sem:
+    run_started_at = datetime.utcnow()
+    run = IngestRun(
+        started_at=run_started_at,
+        companies=company_cache if settings.INGEST_COMPANY_CACHE_PROCESS_SCOPED else CompanyCache(),
+    )
+
+    async def publish(reason: str):
+        # Response caches/ETags key on the generation; local caches are cleared directly
         try:
-            # Re-check relevance mainly for stats (or if source didn't filter heavily)
-            # We already filter below, but good to be consistent
             async with AsyncSessionLocal() as session:
-                await upsert_raw_job(session, job)
-            stats['upserted'] += 1
+                await bump_generation(session, reason=reason)
+                await session.commit()
         except Exception as e:
-            print(f"Error upserting job {job.url}: {e}")
-            stats['errors'] += 1
+            logger.error("Failed to bump data generation", extra={"error": str(e)})
+        # Cached API reads (stats etc.) are stale now
+        invalidate_all()
+
+    async def prime_companies(listings: list[dict]):
+        # One query for every company on the listing, before the first upsert
+        try:
+            async with AsyncSessionLocal() as session:
+                await run.companies.prime(session, [normalize_company_key(l.get("company")) for l in listings])
+        except Exception as e:
+            logger.error("Failed to prime company cache", extra={"error": str(e)})
+
+    async def prime_detector(listings: list[dict]):
+        # One query for which listed jobs are already stored (never folded),
+        # instead of one per fetched job
+        if detector is None or not listings:
+            return
+        try:
+            async with AsyncSessionLocal() as session:
+                await detector.prime(session, [listing_dedupe_key(l) for l in listings])
+        except Exception as e:
+            logger.error("Failed to prime near-duplicate check", extra={"error": str(e)})
+
+    def listing_hook(source, stats):
+        async def on_listing(listings: list[dict]) -> list[dict]:
+            # Listed = alive, including entries that won't be fetched below
+            for listing in listings:
+                if listing.get("title"):
+                    run.see(source.name, listing_dedupe_key(listing))
+            # Pages unchanged since the last crawl: nothing new to fetch
+            pending = [l for l in listings if l.get("changed", True)]
+            stats['not_modified'] += len(listings) - len(pending)
+            # Title-only relevance before any detail page is fetched
+            if settings.INGEST_TITLE_PRESCREEN:
+                try:
+                    pending, dropped = prescreen_listings(pending)
+                except Exception as e:
+                    logger.error("Title pre-screen failed", extra={"source": source.name, "error": str(e)})
+                    dropped = []
+                stats['prescreened'] += len(dropped)
+            await prime_companies([l for l in pending if l.get("company")])
+            await prime_detector([l for l in pending if l.get("title")])
+            return pending
+        return on_listing
+
+    # One in-run index across sources, so cross-source reposts are caught too
+    detector = NearDuplicateDetector(AsyncSessionLocal) if settings.ENABLE_NEAR_DUPLICATE_CHECK else None
 
-async def run_ingestion():
-    """
-    v0.1 Hardened Ingestion:
-    - Parallel fetch from SEOJobs + LinkedIn
-    - Bounded concurrency for upserts
-    - Shared stats
-    """
     sources = [
         SEOJobsSource(),
+        # Greenhouse/Lever board JSON: one request per company, no HTML
+        *ats_sources(settings.ATS_BOARDS),
     ]
 
     if settings.ENABLE_LINKEDIN:
         sources.append(LinkedInSource())
     
-    # Shared concurrency gate for DB writes
-    upsert_sem = asyncio.Semaphore(settings.INGEST_MAX_UPSERT_CONCURRENCY)
-    
     for source in sources:
         logger.info("Starting source", extra={"source": source.name})
         
         stats = {
+            'not_modified': 0,
+            'prescreened': 0,
             'seen': 0,
             'relevant': 0,
             'skipped': 0,
             'upserted': 0,
+            'unchanged': 0,
+            'duplicates': 0,
             'errors': 0
         }
         
-        tasks = []
+        source.on_listing = listing_hook(source, stats)
+        workers = UpsertWorkers(settings.INGEST_MAX_UPSERT_CONCURRENCY, stats, run)
+        # Yielded jobs dropped as irrelevant; with workers.persisted, what the source may commit
+        dropped = []
+        fetch_ok = False
         
         try:
             async for job in source.fetch():
                 stats['seen'] += 1
+                dedupe_key = dedupe_key_for(job)
+                # Listed = alive, whether or not it passes the relevance filter
+                run.see(source.name, dedupe_key)
+
+                # Same posting under another location/title variant or on another
+                # source: fold it into the job we keep instead of embedding it again
+                if detector is not None:
+                    dup = await detector.check(job, dedupe_key)
+                    if dup is not None:
+                        stats['duplicates'] += 1
+                        run.see(source.name, dup.dedupe_key)
+                        if dup.job_id is not None:
+                            run.touch(dup.job_id, dup.company_id)
+                        # Not committed: an unchanged page would only mark its own
+                        # key seen, never dup's, so it is refetched and folded again
+                        continue
                 
                 # Pre-filter for relevance to save DB/LLM cycles
-                # Cache the score so upsert logic doesn't re-embed
-                score = classifier.score(job.title, job.description)
-                job.meta_score = score
+                # Cache the embedding and score so upsert logic doesn't re-embed
+                v = classifier.embed(job.title, job.description)
+                job.embedding = v.tolist()
+                job.meta_score = classifier.score_vector(v)
 
-                if classifier.is_relevant(job.title, job.description):
+                if job.meta_score >= classifier.threshold:
                     stats['relevant'] += 1
-                    # Schedule upsert
-                    t = asyncio.create_task(process_job_safe(job, upsert_sem, stats))
-                    tasks.append(t)
+                    # Schedule upsert on the company's worker
+                    if detector is not None:
+                        detector.accept(dedupe_key)
+                    workers.submit(job)
                 else:
                     stats['skipped'] += 1
-                    
-            # Wait for all upserts for this source to finish
-            if tasks:
-                logger.info(f"Waiting for {len(tasks)} upsert tasks...", extra={"source": source.name})
-                await asyncio.gather(*tasks)
-            
-            logger.info(f"Finished {source.name}", extra={"stats": stats})
+                    dropped.append(job)
+                    if detector is not None:
+                        detector.reject(dedupe_key)
+
+            fetch_ok = True
             
         except Exception as e:
             logger.error(f"Critical error running source {source.name}", extra={"error": str(e)})
 
+        # Wait for all upserts for this source to finish (also after a failed fetch)
+        logger.info(f"Waiting for {workers.pending()} queued upserts...", extra={"source": source.name})
+        await workers.join()
+        logger.info(f"Finished {source.name}", extra={"stats": stats})
+
+        # Incremental sources record crawl state only for jobs that are now
+        # in the DB (or were dropped as irrelevant), never for failed upserts
+        try:
+            await source.commit(dropped + workers.persisted)
+        except Exception as e:
+            logger.error(f"Commit failed for {source.name}", extra={"error": str(e)})
+
+        # Buffered job/company touches: one UPDATE each for the whole source
+        try:
+            async with AsyncSessionLocal() as session:
+                await run.flush(session)
+        except Exception as e:
+            logger.error("Failed to flush run touches", extra={"error": str(e)})
+
+        # Mark listed jobs seen; close unlisted ones only after a complete fetch
+        try:
+            async with AsyncSessionLocal() as session:
+                await run.finish_source(session, source.name, sweep=fetch_ok and source.complete_listing)
+        except Exception as e:
+            logger.error(f"Liveness update failed for {source.name}", extra={"error": str(e)})
+
+        # Upserts committed per job; publish each source as soon as it is done
+        # rather than serving pre-run responses for the whole run
+        await publish(f"ingestion:{source.name}")
+
+    # Description bodies whose jobs moved on to new text (all upserts are done)
+    try:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(delete_orphan_descriptions_stmt())
+            await session.commit()
+        logger.info("Deleted orphaned descriptions", extra={"count": result.rowcount})
+    except Exception as e:
+        logger.error("Orphaned description cleanup failed", extra={"error": str(e)})
+
+    # Incrementally re-cluster companies whose jobs changed in this run
+    # (unchanged jobs keep their embeddings, so their companies can't move)
+    if run.changed_company_ids:
+        try:
+            async with AsyncSessionLocal() as session:
+                await update_company_clusters(session, company_ids=sorted(run.changed_company_ids))
+        except Exception as e:
+            logger.error("Company clustering failed", extra={"error": str(e)})
+        # Cluster assignments changed after the last source was published
+        await publish("ingestion:clusters")
+
 if __name__ == "__main__":
     asyncio.run(run_ingestion())
@@ -0,0 +1,36 @@
+from src.semantic.classifier import AISearchClassifier, classifier as default_classifier
+from src.core.config import settings
+
+def prescreen_listings(
+    listings: list[dict],
+    clf: AISearchClassifier | None = None,
+    margin: float | None = None,
+) -> tuple[list[dict], list[dict]]:
+    """
+    Scores list-phase entries on their title alone (one embedding batch) before
+    any detail page is fetched. Returns (kept, dropped):
+
+    - dropped: title score below clf.threshold - margin. The margin is there
+      because the full check after the detail fetch also sees the description,
+      so only titles that are clearly out of scope are dropped here.
+    - kept: everything else, highest score first, so detail fetches (which run
+      roughly in list order) land the most relevant jobs first if a run is cut
+      short. Each kept entry carries its "title_score".
+
+    Entries without a title yet (new sitemap URLs) can't be judged and are
+    kept, after the scored ones.
+    """
+    clf = clf or default_classifier
+    margin = settings.INGEST_TITLE_PRESCREEN_MARGIN if margin is None else margin
+    titled = [l for l in listings if l.get("title")]
+    untitled = [l for l in listings if not l.get("title")]
+    if not titled:
+        return untitled, []
+
+    scores = clf.score_titles([l["title"] for l in titled])
+    cutoff = clf.threshold - margin
+    kept, dropped = [], []
+    for listing, score in zip(titled, scores):
+        (kept if score >= cutoff else dropped).append({**listing, "title_score": float(score)})
+    kept.sort(key=lambda l: l["title_score"], reverse=True)
+    return kept + untitled, dropped
@@ -0,0 +1,158 @@
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import update, select, delete, literal, func, bindparam, any_, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.models import Company, Job, IngestSeenKey
+from src.ingestion.company_cache import CompanyCache
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+def touch_jobs_stmt(now: datetime):
+    # One array parameter, however many ids (no per-id bind parameters)
+    ids = bindparam("ids", type_=ARRAY(Integer))
+    return (
+        update(Job)
+        .where(Job.id == any_(ids))
+        .values(scraped_at=now)
+        .execution_options(synchronize_session=False)
+    )
+
+def touch_companies_stmt(now: datetime):
+    ids = bindparam("ids", type_=ARRAY(Integer))
+    return (
+        update(Company)
+        .where(Company.id == any_(ids))
+        .values(last_seen=now)
+        .execution_options(synchronize_session=False)
+    )
+
+def stage_seen_stmt(run_id: str, source: str, keys: list[str]):
+    # unnest() of one array parameter: a single INSERT for any number of keys
+    keyset = select(
+        literal(run_id, String).label("run_id"),
+        literal(source, String).label("source"),
+        func.unnest(bindparam("keys", keys, type_=ARRAY(String))).label("dedupe_key"),
+    )
+    return (
+        insert(IngestSeenKey)
+        .from_select(["run_id", "source", "dedupe_key"], keyset)
+        .on_conflict_do_nothing()
+    )
+
+def mark_seen_stmt(run_id: str, source: str, now: datetime):
+    # UPDATE jobs ... FROM ingest_seen_keys; re-listed closed jobs reopen
+    return (
+        update(Job)
+        .where(
+            Job.dedupe_key == IngestSeenKey.dedupe_key,
+            IngestSeenKey.run_id == run_id,
+            IngestSeenKey.source == source,
+        )
+        .values(last_seen_at=now, closed_at=None)
+        .execution_options(synchronize_session=False)
+    )
+
+def sweep_unseen_stmt(source: str, run_started_at: datetime, now: datetime):
+    # Open jobs of this source that no source marked (or inserted) during this run
+    return (
+        update(Job)
+        .where(
+            Job.source == source,
+            Job.closed_at.is_(None),
+            func.coalesce(Job.last_seen_at, Job.scraped_at) < run_started_at,
+        )
+        .values(closed_at=now)
+        .execution_options(synchronize_session=False)
+    )
+
+def clear_seen_stmt(run_id: str, source: str):
+    return delete(IngestSeenKey).where(IngestSeenKey.run_id == run_id, IngestSeenKey.source == source)
+
+@dataclass
+class IngestRun:
+    """
+    State shared by every upsert of one ingestion run.
+
+    Jobs whose content fingerprint did not change are not updated one by one;
+    upsert_raw_job records them here and flush() bumps their scraped_at with
+    one set-based statement. Company last_seen touches are buffered the same
+    way, so concurrent workers never queue on a busy company's row lock: each
+    company gets one write per flush instead of one per job.
+
+    The pipeline also records every dedupe key a source lists (see()), and
+    finish_source() turns them into last_seen_at / closed_at with a fixed
+    number of statements, independent of how many jobs the source listed.
+    """
+    started_at: datetime = field(default_factory=datetime.utcnow)
+    run_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    unchanged_job_ids: set[int] = field(default_factory=set)
+    company_ids: set[int] = field(default_factory=set)
+    # Companies with inserted/updated jobs this run (their embeddings moved)
+    changed_company_ids: set[int] = field(default_factory=set)
+    seen: dict[str, set[str]] = field(default_factory=dict)
+    # Normalized name -> company, primed from source listings (see pipeline)
+    companies: CompanyCache = field(default_factory=CompanyCache)
+
+    def touch(self, job_id: int, company_id: int):
+        self.unchanged_job_ids.add(job_id)
+        self.company_ids.add(company_id)
+
+    def touch_company(self, company_id: int, changed: bool = False):
+        self.company_ids.add(company_id)
+        if changed:
+            self.changed_company_ids.add(company_id)
+
+    def see(self, source: str, dedupe_key: str):
+        self.seen.setdefault(source, set()).add(dedupe_key)
+
+    async def flush(self, session: AsyncSession) -> int:
+        """
+        Applies the buffered touches: one UPDATE for unchanged jobs and one for
+        companies. Ids are sorted so concurrent flushes lock rows in the same
+        order. Returns the number of jobs touched.
+        """
+        if not self.unchanged_job_ids and not self.company_ids:
+            return 0
+        job_ids = sorted(self.unchanged_job_ids)
+        company_ids = sorted(self.company_ids)
+        now = datetime.utcnow()
+        if job_ids:
+            await session.execute(touch_jobs_stmt(now), {"ids": job_ids})
+        if company_ids:
+            await session.execute(touch_companies_stmt(now), {"ids": company_ids})
+        await session.commit()
+        self.unchanged_job_ids.clear()
+        self.company_ids.clear()
+        logger.info("[ingest] flushed touches", extra={"jobs": len(job_ids), "companies": len(company_ids)})
+        return len(job_ids)
+
+    async def finish_source(self, session: AsyncSession, source: str, sweep: bool) -> dict:
+        """
+        Stages the keys `source` listed, marks those jobs seen and, when `sweep`
+        is set, closes the source's open jobs that were not listed. Callers
+        pass sweep=False unless the source's fetch ran to completion: a partial
+        listing would close live jobs.
+        """
+        keys = sorted(self.seen.pop(source, ()))
+        now = datetime.utcnow()
+        stats = {"seen": len(keys), "marked": 0, "closed": 0}
+
+        if keys:
+            await session.execute(stage_seen_stmt(self.run_id, source, keys))
+            result = await session.execute(mark_seen_stmt(self.run_id, source, now))
+            stats["marked"] = result.rowcount
+        # An empty listing is far more likely a broken fetch than a board with no jobs
+        if sweep and keys:
+            result = await session.execute(sweep_unseen_stmt(source, self.started_at, now))
+            stats["closed"] = result.rowcount
+        if keys:
+            await session.execute(clear_seen_stmt(self.run_id, source))
+        await session.commit()
+
+        logger.info("[ingest] liveness", extra={"source": source, **stats})
+        return stats
@@ -0,0 +1,195 @@
+import httpx
+from src.ingestion.enrich import enrich_raw_job
+from .base import Source, RawJob
+from src.ingestion.crawl_state import CrawlEntry, CrawlStateStore, is_changed, parse_lastmod, save_committed
+from src.core.config import settings
+from src.core.logging import get_logger
+from datetime import datetime, timezone
+import asyncio
+import html
+
+logger = get_logger(__name__)
+
+def parse_board_spec(spec: str) -> tuple[str, str, str | None]:
+    """
+    "greenhouse:acme" / "lever:globex=Globex Corp" -> (provider, token, company).
+    The company name is only needed where the board JSON doesn't carry one.
+    """
+    provider, _, rest = spec.partition(":")
+    token, _, company = rest.partition("=")
+    provider, token = provider.strip().lower(), token.strip()
+    if not provider or not token:
+        raise ValueError(f"Invalid ATS board spec: {spec!r}")
+    return provider, token, company.strip() or None
+
+def _epoch_ms(value) -> datetime | None:
+    if not isinstance(value, (int, float)):
+        return None
+    return datetime.fromtimestamp(value / 1000, tz=timezone.utc).replace(tzinfo=None)
+
+class ATSBoardSource(Source):
+    """
+    Public ATS job-board JSON: one request per company board returns every
+    open posting with its full description, so there is no list/detail split
+    and no HTML to parse.
+
+    Postings whose updated timestamp is no newer than at the last run are
+    still listed (and so kept open by the liveness sweep) but not yielded;
+    the timestamps live in source_crawl_state like the sitemap crawl's.
+    """
+    name: str
+    provider: str
+
+    def __init__(self, boards: list[tuple[str, str | None]], transport: httpx.AsyncBaseTransport | None = None, state=None):
+        # [(board token, company name or None)]
+        self.boards = boards
+        # Injectable for replaying recorded responses in tests
+        self.transport = transport
+        self.state = state
+        self.complete_listing = True
+        # url -> crawl entry of yielded jobs, saved once the pipeline commits them
+        self.crawled: dict[str, CrawlEntry] = {}
+
+    def board_url(self, token: str) -> str:
+        raise NotImplementedError
+
+    def parse_board(self, token: str, company: str | None, data) -> list[tuple[RawJob, datetime | None]]:
+        """Board JSON -> [(RawJob, updated_at)]."""
+        raise NotImplementedError
+
+    async def _fetch_board(self, client: httpx.AsyncClient, sem: asyncio.Semaphore, token: str, company: str | None):
+        async with sem:
+            try:
+                resp = await client.get(self.board_url(token))
+                resp.raise_for_status()
+                postings = self.parse_board(token, company, resp.json())
+            except (httpx.HTTPError, ValueError) as e:
+                logger.error("Error fetching board", extra={"source": self.name, "board": token, "error": str(e)})
+                # A missing board means its jobs weren't listed, not that they closed
+                self.complete_listing = False
+                return []
+            logger.info("Fetched board", extra={"source": self.name, "board": token, "count": len(postings)})
+            return postings
+
+    async def fetch(self):
+        if self.state is None:
+            self.state = CrawlStateStore()
+        known = await self.state.load(self.name)
+
+        sem = asyncio.Semaphore(settings.ATS_MAX_CONCURRENCY)
+        async with httpx.AsyncClient(timeout=30, follow_redirects=True, transport=self.transport) as client:
+            boards = await asyncio.gather(*(self._fetch_board(client, sem, token, company) for token, company in self.boards))
+
+        postings = {}
+        for raw_job, updated_at in (p for board in boards for p in board):
+            postings.setdefault(raw_job.url, (raw_job, updated_at))
+
+        listings = [
+            {
+                "title": raw_job.title,
+                "company": raw_job.company,
+                "location": raw_job.location,
+                "url": url,
+                "lastmod": updated_at,
+                "changed": is_changed(known.get(url), updated_at),
+            }
+            for url, (raw_job, updated_at) in postings.items()
+        ]
+        listings = await self.listed(listings)
+
+        for listing in listings:
+            if not listing.get("changed", True):
+                continue
+            raw_job, updated_at = postings[listing["url"]]
+            self.crawled[raw_job.url] = CrawlEntry(raw_job.url, updated_at, raw_job.title, raw_job.company, raw_job.location)
+            yield enrich_raw_job(raw_job)
+
+    async def commit(self, jobs: list[RawJob]):
+        # A posting whose upsert failed, or that was folded into a near-duplicate,
+        # keeps its old updated_at and comes back next run
+        await save_committed(self.state, self.name, self.crawled, jobs)
+
+class GreenhouseSource(ATSBoardSource):
+    """boards-api.greenhouse.io job boards (content=true inlines descriptions)."""
+    name = "greenhouse"
+    provider = "greenhouse"
+
+    def board_url(self, token: str) -> str:
+        return f"https://boards-api.greenhouse.io/v1/boards/{token}/jobs?content=true"
+
+    def parse_board(self, token, company, data):
+        postings = []
+        for item in data.get("jobs", []):
+            url = item.get("absolute_url")
+            if not url or not item.get("title"):
+                continue
+            raw_job = RawJob(
+                external_id=f"{token}:{item.get('id')}",
+                title=item["title"].strip(),
+                company=item.get("company_name") or company or token,
+                location=(item.get("location") or {}).get("name"),
+                url=url,
+                source=self.name,
+                posted_at=item.get("first_published") or item.get("updated_at"),
+                # content=true returns the HTML entity-escaped
+                description=html.unescape(item.get("content") or ""),
+            )
+            postings.append((raw_job, parse_lastmod(item.get("updated_at"))))
+        return postings
+
+class LeverSource(ATSBoardSource):
+    """
+    api.lever.co postings. The public API has no company name (configure one
+    per board) and only sometimes an updatedAt; without it every posting
+    counts as changed and the upsert fingerprint catches the no-ops.
+    """
+    name = "lever"
+    provider = "lever"
+
+    def board_url(self, token: str) -> str:
+        return f"https://api.lever.co/v0/postings/{token}?mode=json"
+
+    def parse_board(self, token, company, data):
+        postings = []
+        for item in data if isinstance(data, list) else []:
+            url = item.get("hostedUrl")
+            if not url or not item.get("text"):
+                continue
+            categories = item.get("categories") or {}
+            location = categories.get("location")
+            if not location and item.get("workplaceType") == "remote":
+                location = "Remote"
+            sections = [item.get("description") or item.get("descriptionPlain") or ""]
+            for section in item.get("lists") or []:
+                sections.append(f"<h3>{section.get('text', '')}</h3><ul>{section.get('content', '')}</ul>")
+            sections.append(item.get("additional") or item.get("additionalPlain") or "")
+            created_at = _epoch_ms(item.get("createdAt"))
+            raw_job = RawJob(
+                external_id=f"{token}:{item.get('id')}",
+                title=item["text"].strip(),
+                company=company or token,
+                location=location,
+                url=url,
+                source=self.name,
+                posted_at=created_at.isoformat() if created_at else None,
+                description="\n".join(s for s in sections if s),
+            )
+            postings.append((raw_job, _epoch_ms(item.get("updatedAt"))))
+        return postings
+
+ATS_SOURCES = {cls.provider: cls for cls in (GreenhouseSource, LeverSource)}
+
+def ats_sources(specs: list[str]) -> list[ATSBoardSource]:
+    """One source per provider in ATS_BOARDS, each covering all of its boards."""
+    boards: dict[str, list[tuple[str, str | None]]] = {}
+    for spec in specs:
+        try:
+            provider, token, company = parse_board_spec(spec)
+        except ValueError as e:
+            logger.error("Skipping ATS board", extra={"spec": spec, "error": str(e)})
+            continue
+        if provider not in ATS_SOURCES:
+            logger.error("Skipping ATS board with unknown provider", extra={"spec": spec})
+            continue
+        boards.setdefault(provider, []).append((token, company))
+    return [ATS_SOURCES[provider](entries) for provider, entries in boards.items()]
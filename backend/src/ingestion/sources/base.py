@@ -1,4 +1,4 @@
-from typing import Iterable, AsyncGenerator
+from typing import Iterable, AsyncGenerator, Awaitable, Callable
 from pydantic import BaseModel
 from datetime import datetime
 
@@ -15,6 +15,8 @@ class RawJob(BaseModel):
     # Optional metadata
     raw_data: dict | None = None
     meta_score: float | None = None
+    embedding: list[float] | None = None
+    minhash: list[int] | None = None
 
     # Enriched Metadata
     remote_flag: str | None = None
@@ -22,8 +24,42 @@ class RawJob(BaseModel):
     seniority: str | None = None
     ai_forward: bool | None = None
 
+# Called with a source's list-phase entries ({"title", "company", "location",
+# "url"} dicts) before any detail page is fetched. May return a filtered or
+# reordered list; None keeps the listing as is. Sitemap-style sources may list
+# URLs they know nothing about yet (title None) and mark entries whose page
+# hasn't changed since the last crawl with "changed": False; those are still
+# listed but won't be fetched.
+ListingHook = Callable[[list[dict]], Awaitable[list[dict] | None]]
+
 class Source:
     name: str
+    # True when a completed fetch() lists every open job the source has, so
+    # jobs it stops listing can be closed by the end-of-run sweep. Opt-in:
+    # sources set it only when they know their listing was complete (capped
+    # or sampled listings, and fetches with failed list pages, must not).
+    complete_listing: bool = False
+    # Set by the pipeline; see ListingHook
+    on_listing: ListingHook | None = None
+
+    async def listed(self, listings: list[dict]) -> list[dict]:
+        """
+        Sources call this once their list phase is done and fetch details for
+        the entries it returns.
+        """
+        if self.on_listing is None:
+            return listings
+        result = await self.on_listing(listings)
+        return listings if result is None else result
+
+    async def commit(self, jobs: list[RawJob]):
+        """
+        Called by the pipeline after a fetch with the yielded jobs that were
+        persisted or dropped as irrelevant; failed upserts and near-duplicates
+        are left out. Incremental sources record their crawl state here, so a
+        left-out job is fetched again on the next run (a folded posting has to
+        be, to keep the job it was folded into listed).
+        """
 
     async def fetch(self) -> AsyncGenerator[RawJob, None]:
         """
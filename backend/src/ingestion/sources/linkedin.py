@@ -21,6 +21,8 @@ class LinkedInSource(Source):
     Experimental source (not used in v0).
     """
     name = "linkedin"
+    # Search results are a sample, never the full set of open postings
+    complete_listing = False
 
     async def fetch(self):
         try:
@@ -100,6 +102,8 @@ class LinkedInSource(Source):
                         # Close the list page as we don't need it for Phase 2
                         await page.close()
 
+                    jobs_to_scrape = await self.listed(jobs_to_scrape)
+
                     # Phase 2: Concurrent Detail Fetch using Context
                     sem = asyncio.Semaphore(settings.INGEST_MAX_DETAIL_CONCURRENCY_LINKEDIN)
                     logger.info("Starting detail fetch", extra={"source": self.name, "count": len(jobs_to_scrape), "concurrency": settings.INGEST_MAX_DETAIL_CONCURRENCY_LINKEDIN})
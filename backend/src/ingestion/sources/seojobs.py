@@ -1,16 +1,23 @@
 import httpx
 from src.ingestion.enrich import enrich_raw_job
-from selectolax.parser import HTMLParser
+from selectolax.lexbor import LexborHTMLParser
 from .base import Source, RawJob
+from src.ingestion.crawl_state import CrawlEntry, CrawlStateStore, is_changed, parse_lastmod, save_committed
 from src.core.config import settings
 from src.core.logging import get_logger
+import xml.etree.ElementTree as ET
 import random
 import asyncio
 import json
+import re
+import zlib
 from urllib.parse import urljoin
 
 logger = get_logger(__name__)
 
+# Sitemap indexes nest; nothing real goes deeper than a couple of levels
+MAX_SITEMAP_DEPTH = 3
+
 def random_headers():
     user_agents = [
         "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36",
@@ -22,17 +29,183 @@ def random_headers():
         "Referer": "https://www.google.com/",
     }
 
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+def _text(value) -> str | None:
+    if isinstance(value, dict):
+        value = value.get("name")
+    if isinstance(value, str) and value.strip():
+        return value.strip()
+    return None
+
+def _posting_location(item: dict) -> str | None:
+    if item.get("jobLocationType") == "TELECOMMUTE":
+        return "Remote"
+    places = item.get("jobLocation")
+    if isinstance(places, dict):
+        places = [places]
+    for place in places or []:
+        address = place.get("address") if isinstance(place, dict) else None
+        if isinstance(address, str):
+            return address.strip() or None
+        if isinstance(address, dict):
+            parts = [_text(address.get(k)) for k in ("addressLocality", "addressRegion", "addressCountry")]
+            parts = [p for p in parts if p]
+            if parts:
+                return ", ".join(parts)
+    return None
+
+def parse_job_posting(html: LexborHTMLParser) -> dict | None:
+    """
+    First schema.org JobPosting in the page's JSON-LD, as
+    {"title", "company", "location", "posted_at", "description"} (any may be None).
+    """
+    for s in html.css('script[type="application/ld+json"]'):
+        try:
+            data = json.loads(s.text())
+        except ValueError:
+            continue
+        graph = data.get("@graph", []) if isinstance(data, dict) else (data if isinstance(data, list) else [])
+        if not graph and isinstance(data, dict):
+            graph = [data]
+        for item in graph:
+            if isinstance(item, dict) and item.get("@type") == "JobPosting":
+                return {
+                    "title": _text(item.get("title")),
+                    "company": _text(item.get("hiringOrganization")),
+                    "location": _posting_location(item),
+                    "posted_at": _text(item.get("datePosted")),
+                    "description": item.get("description") or "",
+                }
+    return None
+
+async def iter_sitemap(client: httpx.AsyncClient, url: str, failed: list[str] | None = None, depth: int = 0):
+    """
+    Yields (loc, lastmod) for every <url> in a sitemap, following sitemap
+    indexes. Documents are streamed through an incremental XML parser (and
+    gunzipped on the fly for .xml.gz), so a 50k-URL sitemap never sits in
+    memory whole.
+
+    Errors on the top-level document raise; a broken child sitemap is logged,
+    appended to `failed` and skipped.
+    """
+    children = []
+    parser = ET.XMLPullParser(events=("end",))
+    gunzip = None
+    first = True
+    async with client.stream("GET", url, headers=random_headers()) as resp:
+        resp.raise_for_status()
+        async for chunk in resp.aiter_bytes():
+            if first:
+                first = False
+                if chunk[:2] == b"\x1f\x8b":
+                    gunzip = zlib.decompressobj(16 + zlib.MAX_WBITS)
+            parser.feed(gunzip.decompress(chunk) if gunzip else chunk)
+            for _, elem in parser.read_events():
+                tag = _local(elem.tag)
+                if tag not in ("url", "sitemap"):
+                    continue
+                fields = {_local(child.tag): (child.text or "").strip() for child in elem}
+                elem.clear()
+                if not fields.get("loc"):
+                    continue
+                if tag == "url":
+                    yield fields["loc"], fields.get("lastmod")
+                else:
+                    children.append(fields["loc"])
+    if gunzip:
+        parser.feed(gunzip.flush())
+    parser.close()
+
+    if children and depth >= MAX_SITEMAP_DEPTH:
+        logger.warning("Sitemap nesting too deep, ignoring children", extra={"sitemap": url, "count": len(children)})
+        return
+    for child in children:
+        try:
+            async for entry in iter_sitemap(client, child, failed, depth + 1):
+                yield entry
+        except (httpx.HTTPError, ET.ParseError, zlib.error) as e:
+            logger.warning("Failed to read sitemap", extra={"sitemap": child, "error": str(e)})
+            if failed is not None:
+                failed.append(child)
+
 class SEOJobsSource(Source):
+    """
+    seojobs.com, discovered one of two ways (SEOJOBS_DISCOVERY):
+
+    - "listing": the first few pages of the front-page listing, then every
+      job page on them. Capped, so never a complete listing.
+    - "sitemap": every job URL in the XML sitemaps. Pages whose <lastmod> is
+      no newer than when we last crawled them are not fetched again; their
+      identity comes from the stored crawl state (src/ingestion/crawl_state.py).
+    """
     name = "seojobs"
 
+    def __init__(self, discovery: str | None = None, transport: httpx.AsyncBaseTransport | None = None,
+                 state=None, delay: tuple[float, float] = (0.5, 1.5)):
+        self.discovery = discovery or settings.SEOJOBS_DISCOVERY
+        if self.discovery not in ("listing", "sitemap"):
+            raise ValueError(f"Unknown SEOJobs discovery mode: {self.discovery}")
+        # Injectable for replaying recorded responses in tests
+        self.transport = transport
+        self.state = state
+        self.delay = delay
+        # url -> crawl entry of yielded jobs, saved once the pipeline commits them
+        self.crawled: dict[str, CrawlEntry] = {}
+        # Every job the site has is in its sitemaps; unset again if one can't be
+        # read. The listing mode only ever sees the first few pages.
+        self.complete_listing = self.discovery == "sitemap"
+
+    def _client(self, timeout: float) -> httpx.AsyncClient:
+        return httpx.AsyncClient(timeout=timeout, follow_redirects=True, transport=self.transport)
+
     async def fetch(self):
-        # Phase 1: List Parsing
+        # Phase 1: Discovery
+        if self.discovery == "sitemap":
+            jobs_meta = await self._list_sitemap()
+        else:
+            jobs_meta = await self._list_pages()
+
+        jobs_meta = await self.listed(jobs_meta)
+        # Sitemap entries whose page hasn't changed since the last crawl
+        jobs_meta = [m for m in jobs_meta if m.get("changed", True)]
+
+        # Phase 2: Concurrent Detail Fetch
+        sem = asyncio.Semaphore(settings.INGEST_MAX_DETAIL_CONCURRENCY_SEO)
+        logger.info(f"Starting detail fetch", extra={"source": self.name, "count": len(jobs_meta), "concurrency": settings.INGEST_MAX_DETAIL_CONCURRENCY_SEO})
+
+        async with self._client(15) as detail_client:
+            async def worker(meta):
+                async with sem:
+                    return meta, await self._fetch_detail(detail_client, meta)
+
+            # Use as_completed to yield results as they come in
+            tasks = [worker(m) for m in jobs_meta]
+            for future in asyncio.as_completed(tasks):
+                try:
+                    meta, result = await future
+                except Exception as e:
+                    logger.error("Worker exception", extra={"source": self.name, "error": str(e)})
+                    continue
+                if result:
+                    if self.discovery == "sitemap":
+                        self.crawled[result.url] = CrawlEntry(
+                            meta["url"], meta.get("lastmod"), result.title, result.company, result.location
+                        )
+                    yield result
+
+    async def commit(self, jobs: list[RawJob]):
+        # Only pages whose job made it through; anything else is retried next run
+        await save_committed(self.state, self.name, self.crawled, jobs)
+
+    async def _list_pages(self) -> list[dict]:
         jobs_meta = []
         seen_links = set()
         max_pages = 5
         page_num = 1
 
-        async with httpx.AsyncClient(timeout=20, follow_redirects=True) as client:
+        async with self._client(20) as client:
             while page_num <= max_pages:
                 url = "https://seojobs.com/" if page_num == 1 else f"https://seojobs.com/page/{page_num}/"
                 try:
@@ -42,7 +215,7 @@ class SEOJobsSource(Source):
                     logger.error("Error fetching list", extra={"source": self.name, "page": page_num, "error": str(e)})
                     break
 
-                html = HTMLParser(resp.text)
+                html = LexborHTMLParser(resp.text)
                 nodes = html.css("div.job-item")
                 logger.info("Found job items", extra={"source": self.name, "page": page_num, "count": len(nodes)})
 
@@ -81,88 +254,114 @@ class SEOJobsSource(Source):
 
                 page_num += 1
 
-        # Phase 2: Concurrent Detail Fetch
-        sem = asyncio.Semaphore(settings.INGEST_MAX_DETAIL_CONCURRENCY_SEO)
-        logger.info(f"Starting detail fetch", extra={"source": self.name, "count": len(jobs_meta), "concurrency": settings.INGEST_MAX_DETAIL_CONCURRENCY_SEO})
+        return jobs_meta
 
-        async with httpx.AsyncClient(timeout=15, follow_redirects=True) as detail_client:
-            async def worker(meta):
-                async with sem:
-                    description = ""
-                    retries = 3
-                    
-                    # Fetch detailed description from the job page
-                    for attempt in range(retries):
-                        try:
-                            # Sleep briefly to be polite even inside semaphore
-                            await asyncio.sleep(random.uniform(0.5, 1.5))
-                            
-                            detail_resp = await detail_client.get(meta['url'], headers=random_headers())
-                            if detail_resp.status_code == 200:
-                                detail_html = HTMLParser(detail_resp.text)
-                                # JSON-LD Check
-                                scripts = detail_html.css('script[type="application/ld+json"]')
-                                found_json_desc = False
-                                for s in scripts:
-                                    try:
-                                        data = json.loads(s.text())
-                                        graph = data.get("@graph", []) if isinstance(data, dict) else (data if isinstance(data, list) else [])
-                                        if not graph and isinstance(data, dict):
-                                                graph = [data]
-                                        for item in graph:
-                                            if item.get("@type") == "JobPosting":
-                                                description = item.get("description", "")
-                                                found_json_desc = True
-                                                break
-                                        if found_json_desc:
-                                            break
-                                    except:
-                                        continue
-                                
-                                # DOM Fallback
-                                if not description:
-                                    content_node = detail_html.css_first(".entry-content, .job-description, .single-job")
-                                    if content_node:
-                                        description = content_node.text(strip=True)
-                                
-                                # Success
-                                break
-                            elif detail_resp.status_code >= 500:
-                                # Retryable
-                                if attempt < retries - 1:
-                                    await asyncio.sleep(1 * (attempt + 1))
-                                    continue
-                            else:
-                                # 4xx, etc.
-                                break
-                        except Exception as err:
-                            if attempt < retries - 1:
-                                await asyncio.sleep(1 * (attempt + 1))
-                                continue
-                            logger.warning(f"Failed to fetch details", extra={"source": self.name, "url": meta['url'], "error": str(err)})
-
-                    raw_job = RawJob(
-                        external_id=meta['url'],
-                        title=meta['title'],
-                        company=meta['company'],
-                        location=meta['location'],
-                        url=meta['url'],
-                        source=self.name,
-                        posted_at=None,
-                        description=description 
-                    )
-                    
-                    # Enrich (populates metadata fields)
-                    raw_job = enrich_raw_job(raw_job)
-                    return raw_job
+    async def _list_sitemap(self) -> list[dict]:
+        """
+        One entry per job URL in the sitemaps. "changed" is False when the
+        stored crawl has a <lastmod> at least as new as the sitemap's; known
+        pages also carry the title/company/location they were crawled with.
+        """
+        if self.state is None:
+            self.state = CrawlStateStore()
+        known = await self.state.load(self.name)
+        include = re.compile(settings.SEOJOBS_SITEMAP_INCLUDE) if settings.SEOJOBS_SITEMAP_INCLUDE else None
 
-            # Use as_completed to yield results as they come in
-            tasks = [worker(m) for m in jobs_meta]
-            for future in asyncio.as_completed(tasks):
-                try:
-                    result = await future
-                    if result:
-                        yield result
-                except Exception as e:
-                    logger.error("Worker exception", extra={"source": self.name, "error": str(e)})
+        jobs_meta = []
+        seen_links = set()
+        failed = []
+        async with self._client(30) as client:
+            async for loc, lastmod_raw in iter_sitemap(client, settings.SEOJOBS_SITEMAP_URL, failed):
+                if loc in seen_links or (include and not include.search(loc)):
+                    continue
+                seen_links.add(loc)
+                lastmod = parse_lastmod(lastmod_raw)
+                prev = known.get(loc)
+                changed = is_changed(prev, lastmod)
+                jobs_meta.append({
+                    "title": prev.title if prev else None,
+                    "company": prev.company if prev else None,
+                    "location": prev.location if prev else None,
+                    "url": loc,
+                    "lastmod": lastmod,
+                    "changed": changed,
+                })
+
+        if failed:
+            self.complete_listing = False
+        logger.info("Read sitemaps", extra={
+            "source": self.name, "count": len(jobs_meta),
+            "changed": sum(1 for m in jobs_meta if m["changed"]), "failed_sitemaps": len(failed),
+        })
+        return jobs_meta
+
+    async def _fetch_detail(self, client: httpx.AsyncClient, meta: dict) -> RawJob | None:
+        """
+        Fetches and parses one job page. Sitemap entries take title, company
+        and location from the page's JobPosting and are dropped (None) when
+        the page can't be read; listing entries keep their list-phase fields.
+        """
+        html = None
+        retries = 3
+        
+        # Fetch detailed description from the job page
+        for attempt in range(retries):
+            try:
+                # Sleep briefly to be polite even inside semaphore
+                await asyncio.sleep(random.uniform(*self.delay))
+                
+                detail_resp = await client.get(meta['url'], headers=random_headers())
+                if detail_resp.status_code == 200:
+                    html = LexborHTMLParser(detail_resp.text)
+                    # Success
+                    break
+                elif detail_resp.status_code >= 500:
+                    # Retryable
+                    if attempt < retries - 1:
+                        await asyncio.sleep(1 * (attempt + 1))
+                        continue
+                else:
+                    # 4xx, etc.
+                    break
+            except Exception as err:
+                if attempt < retries - 1:
+                    await asyncio.sleep(1 * (attempt + 1))
+                    continue
+                logger.warning(f"Failed to fetch details", extra={"source": self.name, "url": meta['url'], "error": str(err)})
+
+        posting = (parse_job_posting(html) if html is not None else None) or {}
+
+        # JSON-LD first, DOM fallback
+        description = posting.get("description") or ""
+        if not description and html is not None:
+            content_node = html.css_first(".entry-content, .job-description, .single-job")
+            if content_node:
+                description = content_node.text(strip=True)
+
+        if self.discovery == "sitemap":
+            if html is None:
+                return None
+            title_node = html.css_first("h1")
+            title = posting.get("title") or (title_node.text().strip() if title_node else None) or meta.get("title")
+            company = posting.get("company") or meta.get("company")
+            location = posting.get("location") or meta.get("location")
+            if not title or not company:
+                logger.warning("No job posting on page", extra={"source": self.name, "url": meta['url']})
+                return None
+            posted_at = posting.get("posted_at")
+        else:
+            title, company, location, posted_at = meta['title'], meta['company'], meta['location'], None
 
+        raw_job = RawJob(
+            external_id=meta['url'],
+            title=title,
+            company=company,
+            location=location,
+            url=meta['url'],
+            source=self.name,
+            posted_at=posted_at,
+            description=description 
+        )
+        
+        # Enrich (populates metadata fields)
+        return enrich_raw_job(raw_job)
@@ -1,22 +1,57 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, or_
 from datetime import datetime
 from dateutil import parser
 import hashlib
+import json
+import numpy as np
 
 
 from src.db.models import Job, Company
+from src.db.aggregates import refresh_company_stats_stmt
+from src.db.listener import JOBS_CHANNEL, notify_stmt
+from src.ingestion.descriptions import clean_description, description_hash, insert_description_stmt
 from src.ingestion.sources.base import RawJob
-
-def generate_dedupe_key(company: str, title: str, location: str | None) -> str:
-    raw = f"{company.lower()}|{title.lower()}|{(location or '').lower()}"
-    return hashlib.sha256(raw.encode()).hexdigest()
+from src.ingestion.run import IngestRun
+from src.ingestion.company_cache import CachedCompany
+from src.ingestion.entities import normalize_company_key, resolve_company
+from src.ingestion.minhash import minhasher, signature_bytes, delete_bands_stmt, insert_bands_stmt, band_rows
 
 from src.semantic.classifier import classifier
 from src.semantic.classifier_company import company_classifier
 from src.semantic.opportunity_classifier import classify_opportunity_async
 from src.ingestion.competitor_intel import pull_competitor_clients
 
+def generate_dedupe_key(company: str, title: str, location: str | None) -> str:
+    raw = f"{company.lower()}|{title.lower()}|{(location or '').lower()}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+# Bump to force every job through the full update path on the next run
+# (e.g. after changing how opportunity metadata is derived)
+FINGERPRINT_VERSION = 1
+
+def content_fingerprint(raw_job: RawJob, company_name: str, body_hash: str | None) -> str:
+    """
+    Hash of every source-derived field that ends up on the job row. Equal
+    fingerprints mean re-upserting would write nothing new.
+    """
+    material = [
+        FINGERPRINT_VERSION,
+        raw_job.source,
+        raw_job.external_id,
+        company_name,
+        raw_job.title,
+        raw_job.location,
+        raw_job.url,
+        raw_job.posted_at,
+        body_hash,
+        raw_job.remote_flag,
+        raw_job.employment_type,
+        raw_job.seniority,
+        raw_job.ai_forward,
+    ]
+    return hashlib.sha256(json.dumps(material, default=str).encode()).hexdigest()
+
 def normalize_company_name(name: str) -> str:
     n = name.strip()
     # Strip common suffixes
@@ -29,6 +64,15 @@ def normalize_company_name(name: str) -> str:
             n = n[: -len(s)]
     return n.strip()
 
+def dedupe_key_for(raw_job: RawJob) -> str:
+    return generate_dedupe_key(normalize_company_name(raw_job.company or ""), raw_job.title, raw_job.location)
+
+def listing_dedupe_key(listing: dict) -> str:
+    """dedupe_key_for() of the RawJob a list-phase entry will become."""
+    return generate_dedupe_key(
+        normalize_company_name(listing.get("company") or ""), listing.get("title") or "", listing.get("location")
+    )
+
 def parse_date_safe(date_str: str | None) -> datetime:
     if not date_str:
         return datetime.utcnow()
@@ -37,19 +81,63 @@ def parse_date_safe(date_str: str | None) -> datetime:
     except Exception:
         return datetime.utcnow()
 
-async def upsert_raw_job(session: AsyncSession, raw_job: RawJob):
-    # 1. Get or Create Company
+async def upsert_raw_job(session: AsyncSession, raw_job: RawJob, run: IngestRun | None = None) -> str:
+    """
+    Inserts or updates one job. Returns "inserted", "updated" or "unchanged".
+
+    A re-seen job whose content fingerprint matches is not updated at all: no
+    LLM call, no classification, no row write. With a run its last-seen touch
+    (and its company's last_seen) is deferred to run.flush(); without one both
+    are touched immediately.
+    """
+    try:
+        return await _upsert_raw_job(session, raw_job, run)
+    except Exception:
+        # The company this job resolved or created may have been rolled back
+        # (or deleted by a merge): the next job looks it up again
+        if run is not None:
+            run.companies.discard(normalize_company_key(raw_job.company))
+        raise
+
+async def _upsert_raw_job(session: AsyncSession, raw_job: RawJob, run: IngestRun | None) -> str:
     company_name_raw = raw_job.company or ""
     company_name = normalize_company_name(company_name_raw)
-    result = await session.execute(select(Company).where(Company.name == company_name))
-    company = result.scalars().first()
+    company_key = normalize_company_key(company_name_raw)
+
+    # 1. Dedupe key + fingerprint, checked before any expensive work
+    dedupe_key = dedupe_key_for(raw_job)
+    body = clean_description(raw_job.description)
+    content_hash = description_hash(body) if body else None
+    fingerprint = content_fingerprint(raw_job, company_name, content_hash)
+
+    result = await session.execute(select(Job).where(Job.dedupe_key == dedupe_key))
+    existing_job = result.scalars().first()
+
+    if existing_job and existing_job.content_hash == fingerprint:
+        if run is not None:
+            run.touch(existing_job.id, existing_job.company_id)
+        else:
+            now = datetime.utcnow()
+            await session.execute(update(Job).where(Job.id == existing_job.id).values(scraped_at=now))
+            await session.execute(update(Company).where(Company.id == existing_job.company_id).values(last_seen=now))
+            await session.commit()
+        return "unchanged"
+
+    # 2. Resolve or Create Company: exact key, then near-duplicate key
+    # (the run's cache usually answers without a query)
+    cache = run.companies if run is not None else None
+    company = cache.get(company_key) if cache is not None else None
+    if company is None:
+        company = await resolve_company(session, company_key)
+    # Classify under the canonical name so name variants share one LLM result
+    canonical_name = company.name if company else company_name
     
     # Classify company
     # OpenAI-backed opportunity classification (AthenaHQ view) - Async
-    opp = await classify_opportunity_async(company_name, raw_job.title, raw_job.description)
+    opp = await classify_opportunity_async(canonical_name, raw_job.title, raw_job.description)
     
     # Semantic classifier fallback
-    semantic_classification = company_classifier.classify(company_name, raw_job.description)
+    semantic_classification = company_classifier.classify(canonical_name, raw_job.description)
     
     # Decide final classification
     if opp and opp.confidence >= 0.6:
@@ -59,24 +147,12 @@ async def upsert_raw_job(session: AsyncSession, raw_job: RawJob):
     else:
         classification = semantic_classification
 
-    # Append OpenAI metadata to description (in-memory only for upsert)
-    # Also populate Job fields later
-    if opp:
-        meta_line = (
-            f"OPP_META: athena_view={opp.athena_view}; "
-            f"role_type={opp.company_role_type}; "
-            f"buyer_or_seller={opp.buyer_or_seller}; "
-            f"confidence={opp.confidence:.2f}"
-        )
-        existing_desc = raw_job.description or ""
-        if "OPP_META:" not in existing_desc:
-            raw_job.description = f"{meta_line} || {existing_desc}".strip()
-    
     from sqlalchemy.exc import IntegrityError
     
     if not company:
         company = Company(
             name=company_name, 
+            name_key=company_key,
             classification=classification,
             industry=opp.industry if opp else None,
         )
@@ -91,30 +167,34 @@ async def upsert_raw_job(session: AsyncSession, raw_job: RawJob):
         except IntegrityError:
             await session.rollback()
             # Race condition: Company created by another worker
-            result = await session.execute(select(Company).where(Company.name == company_name))
+            result = await session.execute(
+                select(Company).where(or_(Company.name_key == company_key, Company.name == company_name))
+            )
             company = result.scalars().first()
     else:
-        if not company.classification:
-            company.classification = classification
-        if opp and opp.industry and not company.industry:
-            company.industry = opp.industry
-        if not company.category:
-            company.category = "Agency / Consultancy" if company.classification == "Competitor" else "SaaS / Tools"
-    
+        if isinstance(company, CachedCompany) and (
+            not company.classification or not company.category or (opp and opp.industry and not company.industry)
+        ):
+            # This job can fill in something the company is missing: load the row
+            company = await session.get(Company, company.id)
+        if isinstance(company, Company):
+            if not company.classification:
+                company.classification = classification
+            if opp and opp.industry and not company.industry:
+                company.industry = opp.industry
+            if not company.category:
+                company.category = "Agency / Consultancy" if company.classification == "Competitor" else "SaaS / Tools"
+
     # Trigger Competitor Intel Pull
     if company.classification == "Competitor":
         await pull_competitor_clients(company.name)
     
-    # 2. Dedupe Key
-    dedupe_key = generate_dedupe_key(company_name, raw_job.title, raw_job.location)
-    
-    # 3. Check existing job
-    result = await session.execute(select(Job).where(Job.dedupe_key == dedupe_key))
-    existing_job = result.scalars().first()
-    
-    # Calculate scores (reuse cache if available)
-    relevance_score = raw_job.meta_score if raw_job.meta_score is not None else classifier.score(raw_job.title, raw_job.description)
-    role_tier = classifier.tier(raw_job.title, raw_job.description)
+    # Calculate scores (reuse the pipeline's embedding/score if available)
+    embedding = raw_job.embedding
+    if embedding is None:
+        embedding = classifier.embed(raw_job.title, raw_job.description).tolist()
+    relevance_score = raw_job.meta_score if raw_job.meta_score is not None else classifier.score_vector(embedding)
+    role_tier = classifier.tier_for_score(relevance_score)
     is_ai_search = role_tier != "out_of_scope"
     
     # Basic job fields that might update
@@ -135,12 +215,28 @@ async def upsert_raw_job(session: AsyncSession, raw_job: RawJob):
         "opp_confidence": opp.confidence if opp else None,
     }
 
+    # Description bodies are stored once per distinct text; only the hash moves
+    if content_hash and (existing_job is None or existing_job.description_hash != content_hash):
+        await session.execute(insert_description_stmt(content_hash, body))
+
+    # Near-duplicate detection state (the pipeline computes the signature pre-embedding)
+    signature = np.asarray(raw_job.minhash, dtype=np.uint32) if raw_job.minhash is not None else None
+
+    # company_stats only changes when an AI-search job appears or flips in/out of scope
+    stats_changed = (existing_job.is_ai_search != is_ai_search) if existing_job else is_ai_search
+    # The live feed (/api/jobs/stream) wants new AI-search jobs and tier changes
+    feed_changed = (existing_job.role_tier != role_tier) if existing_job else is_ai_search
+
     if existing_job:
         # Update
         existing_job.scraped_at = update_data["scraped_at"]
         existing_job.relevance_score = update_data["relevance_score"]
         existing_job.is_ai_search = update_data["is_ai_search"]
         existing_job.role_tier = update_data["role_tier"]
+        existing_job.embedding = embedding
+        existing_job.content_hash = fingerprint
+        if signature is not None:
+            existing_job.minhash = signature_bytes(signature)
         
         # Update metadata if present
         existing_job.remote_flag = update_data["remote_flag"]
@@ -154,9 +250,8 @@ async def upsert_raw_job(session: AsyncSession, raw_job: RawJob):
             existing_job.opp_buyer_or_seller = update_data["opp_buyer_or_seller"]
             existing_job.opp_confidence = update_data["opp_confidence"]
 
-        if raw_job.description:
-            if not existing_job.description or existing_job.description != raw_job.description:
-                existing_job.description = raw_job.description
+        if content_hash and existing_job.description_hash != content_hash:
+            existing_job.description_hash = content_hash
                 
     else:
         # Insert
@@ -168,12 +263,15 @@ async def upsert_raw_job(session: AsyncSession, raw_job: RawJob):
             title=raw_job.title,
             location=raw_job.location,
             url=raw_job.url,
-            description=raw_job.description,
+            description_hash=content_hash,
+            content_hash=fingerprint,
+            minhash=signature_bytes(signature) if signature is not None else None,
             posted_at=parse_date_safe(raw_job.posted_at),
 
             relevance_score=relevance_score,
             is_ai_search=is_ai_search,
             role_tier=role_tier,
+            embedding=embedding,
             
             # New fields
             remote_flag=update_data["remote_flag"],
@@ -188,7 +286,29 @@ async def upsert_raw_job(session: AsyncSession, raw_job: RawJob):
         )
         session.add(new_job)
     
-    # Update last_seen whenever we touch this company
-    company.last_seen = datetime.utcnow()
+    # Update last_seen whenever we touch this company; within a run the write
+    # is buffered so a company's jobs don't serialize on its row lock
+    if run is not None:
+        run.touch_company(company.id, changed=True)
+    else:
+        company.last_seen = datetime.utcnow()
+
+    job = existing_job or new_job
+    if stats_changed or feed_changed or signature is not None:
+        await session.flush()
+    if signature is not None:
+        # LSH buckets are only rewritten when the job's content changed
+        if existing_job:
+            await session.execute(delete_bands_stmt(job.id))
+        await session.execute(insert_bands_stmt(band_rows(job.id, minhasher.band_keys(signature))))
+    if stats_changed:
+        await session.execute(refresh_company_stats_stmt([company.id]))
+    if feed_changed:
+        await session.execute(notify_stmt(JOBS_CHANNEL, str(job.id)))
 
+    cached = CachedCompany.of(company)
     await session.commit()
+    # Only a committed company may be reused by later jobs of the run
+    if cache is not None:
+        cache.put(cached, key=company_key)
+    return "updated" if existing_job else "inserted"
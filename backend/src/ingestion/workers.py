@@ -0,0 +1,61 @@
+import asyncio
+import zlib
+
+from src.db.session import AsyncSessionLocal
+from src.ingestion.upsert import upsert_raw_job
+from src.ingestion.entities import normalize_company_key
+from src.ingestion.run import IngestRun
+
+async def process_job_safe(job, stats, run: IngestRun | None = None) -> str | None:
+    """
+    Upserts a job with its own DB session, counting the outcome in stats.
+    Returns upsert_raw_job's status, or None when the upsert failed.
+    """
+    try:
+        async with AsyncSessionLocal() as session:
+            status = await upsert_raw_job(session, job, run=run)
+        stats['unchanged' if status == "unchanged" else 'upserted'] += 1
+        return status
+    except Exception as e:
+        print(f"Error upserting job {job.url}: {e}")
+        stats['errors'] += 1
+        return None
+
+def partition_for(company: str | None, partitions: int) -> int:
+    key = normalize_company_key(company)
+    return zlib.crc32(key.encode()) % partitions
+
+class UpsertWorkers:
+    """
+    A fixed pool of upsert workers, each with its own queue. Jobs are routed by
+    a stable hash of the company key, so all of one company's jobs
+    are upserted serially by one worker and never contend for its row (or race
+    to create it), while different companies still upsert in parallel.
+    """
+
+    def __init__(self, partitions: int, stats: dict, run: IngestRun | None = None):
+        self.stats = stats
+        self.run = run
+        # Jobs whose upsert went through (see Source.commit)
+        self.persisted = []
+        self.queues = [asyncio.Queue() for _ in range(partitions)]
+        self.workers = [asyncio.create_task(self._work(q)) for q in self.queues]
+
+    def submit(self, job):
+        self.queues[partition_for(job.company, len(self.queues))].put_nowait(job)
+
+    def pending(self) -> int:
+        return sum(q.qsize() for q in self.queues)
+
+    async def _work(self, queue: asyncio.Queue):
+        while True:
+            job = await queue.get()
+            if job is None:
+                return
+            if await process_job_safe(job, self.stats, self.run) is not None:
+                self.persisted.append(job)
+
+    async def join(self):
+        for q in self.queues:
+            q.put_nowait(None)
+        await asyncio.gather(*self.workers)
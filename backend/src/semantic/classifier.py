@@ -23,23 +23,49 @@ class AISearchClassifier:
     def _compute_centroid(self, texts):
         vecs = embedder.encode(texts)
         return np.mean(vecs, axis=0)
+
+    @property
+    def centroid(self) -> np.ndarray:
+        return self._pos_centroid
     
-    def tier(self, title: str, description: str | None = None) -> str:
-        s = self.score(title, description)
+    def _text(self, title: str, description: str | None = None) -> str:
+        # Heavily weight title
+        if description:
+             return f"{title}. {description[:200]}" # Truncate description for speed/noise
+        return title
+
+    def embed(self, title: str, description: str | None = None) -> np.ndarray:
+        """Embedding used for scoring; persisted on the job so it can be re-scored later."""
+        return embedder.encode([self._text(title, description)])[0]
+
+    def score_titles(self, titles: list[str]) -> np.ndarray:
+        """Title-only scores for a whole listing in one embedding batch."""
+        if not titles:
+            return np.zeros(0, dtype=np.float32)
+        return embedder.encode(titles) @ np.asarray(self._pos_centroid, dtype=np.float32)
+
+    def score_vector(self, v) -> float:
+        return float(np.dot(v, self._pos_centroid))
+
+    def tier_for_score(self, s: float) -> str:
         if s >= self.high_conf:
             return "core_ai_search"
         if s >= self.medium_conf:
             return "related_search_or_seo"
         return "out_of_scope"
 
+    def tiers_for_scores(self, scores: np.ndarray) -> np.ndarray:
+        """Vectorized tier_for_score over an array of scores."""
+        return np.where(
+            scores >= self.high_conf, "core_ai_search",
+            np.where(scores >= self.medium_conf, "related_search_or_seo", "out_of_scope"),
+        )
+    
+    def tier(self, title: str, description: str | None = None) -> str:
+        return self.tier_for_score(self.score(title, description))
+
     def score(self, title: str, description: str | None = None) -> float:
-        # Heavily weight title
-        text = title 
-        if description:
-             text = f"{title}. {description[:200]}" # Truncate description for speed/noise
-             
-        v = embedder.encode([text])[0]
-        return float(np.dot(v, self._pos_centroid))
+        return self.score_vector(self.embed(title, description))
 
     def is_relevant(self, title: str, description: str | None = None) -> bool:
         return self.score(title, description) >= self.threshold
@@ -1,5 +1,6 @@
 import numpy as np
 from .embedder import embedder
+from .keywords import KeywordMatcher
 
 COMPETITOR_SEEDS = [
     "Digital Marketing Agency",
@@ -50,6 +51,14 @@ COMP_HARD_HINTS = [
     "creative agency", "advertising agency",
 ]
 
+# All four keyword lists compiled into one word-bounded matcher (single scan per text)
+COMPANY_KEYWORDS = KeywordMatcher({
+    "client_kw": CLIENT_KEYWORDS,
+    "comp_kw": COMPETITOR_KEYWORDS,
+    "neg_client": NEG_CLIENT_HINTS,
+    "comp_hard": COMP_HARD_HINTS,
+})
+
 class CompanyClassifier:
     def __init__(self):
         self._competitor_centroid = self._compute_centroid(COMPETITOR_SEEDS)
@@ -59,29 +68,26 @@ class CompanyClassifier:
         vecs = embedder.encode(texts)
         return np.mean(vecs, axis=0)
 
-    def classify(self, company_name: str, description: str | None = None) -> str:
-        """
-        Classifies a company as 'Competitor' or 'Client' using separate keyword heuristics + margin-based semantic similarity.
-        """
-        text = company_name
+    def _text(self, company_name: str, description: str | None = None) -> str:
         if description:
-             text = f"{company_name}. {description[:200]}"
-        
-        text_lower = text.lower()
+             return f"{company_name}. {description[:200]}"
+        return company_name
+
+    def _heuristic(self, text: str) -> str | None:
+        """Keyword-only decision; None means the embedding has to decide."""
+        features = COMPANY_KEYWORDS.features(text)
         
         # 1. Keyword Heuristics
-        has_client_kw = any(kw in text_lower for kw in CLIENT_KEYWORDS)
-        has_comp_kw = any(kw in text_lower for kw in COMPETITOR_KEYWORDS)
+        has_client_kw = "client_kw" in features
+        has_comp_kw = "comp_kw" in features
         
         # Immediate Client override (strong signal)
         if has_client_kw and not has_comp_kw:
             return "Client"
             
         # 2. Semantic Scores
-        text_lower = text.lower()
-        
-        has_comp = any(h in text_lower for h in COMP_HARD_HINTS)
-        has_neg_client = any(h in text_lower for h in NEG_CLIENT_HINTS)
+        has_comp = "comp_hard" in features
+        has_neg_client = "neg_client" in features
 
         # 1) Hard competitor hints win unless clearly product-ish
         if has_comp and not has_neg_client:
@@ -91,8 +97,9 @@ class CompanyClassifier:
         if has_neg_client and not has_comp:
             return "Client"
 
-        v = embedder.encode([text])[0]
-        
+        return None
+
+    def _decide(self, v: np.ndarray) -> str:
         score_competitor = float(np.dot(v, self._competitor_centroid))
         score_client = float(np.dot(v, self._client_centroid))
         
@@ -102,4 +109,31 @@ class CompanyClassifier:
         else:
             return "Client"
 
+    def classify(self, company_name: str, description: str | None = None) -> str:
+        """
+        Classifies a company as 'Competitor' or 'Client' using separate keyword heuristics + margin-based semantic similarity.
+        """
+        text = self._text(company_name, description)
+        label = self._heuristic(text)
+        if label:
+            return label
+
+        v = embedder.encode([text])[0]
+        return self._decide(v)
+
+    def classify_many(self, items: list[tuple[str, str | None]]) -> list[str]:
+        """
+        Batch version of classify() for (company_name, description) pairs.
+        Heuristics run per item; the embedding fallback is encoded in one batch.
+        """
+        texts = [self._text(name, description) for name, description in items]
+        labels = [self._heuristic(text) for text in texts]
+
+        pending = [i for i, label in enumerate(labels) if label is None]
+        if pending:
+            vecs = embedder.encode([texts[i] for i in pending])
+            for i, v in zip(pending, vecs):
+                labels[i] = self._decide(v)
+        return labels
+
 company_classifier = CompanyClassifier()
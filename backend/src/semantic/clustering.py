@@ -1,29 +1,137 @@
-from sklearn.cluster import KMeans
+import os
+from datetime import datetime
+
+import joblib
 import numpy as np
-from .embedder import embedder
+from sklearn.cluster import MiniBatchKMeans
+from sqlalchemy import select, update, func, values, column, cast, Integer
+from sqlalchemy.ext.asyncio import AsyncSession
+from pgvector.sqlalchemy import Vector
 
-def cluster_companies(company_texts: dict[str, str], n_clusters: int = 3):
-    """
-    company_texts: {company_name: concatenated_job_titles}
-    Returns: {company_name: cluster_id}
-    """
-    if not company_texts:
-        return {}
-        
-    names = list(company_texts.keys())
-    texts = list(company_texts.values())
-    
-    if len(texts) < n_clusters:
-         # Fallback if too few samples
-         return {name: 0 for name in names}
-
-    X = embedder.encode(texts)
-    km = KMeans(n_clusters=n_clusters, random_state=42, n_init=10)
-    labels = km.fit_predict(X)
-    return {name: int(label) for name, label in zip(names, labels)}
+from src.db.models import Company, Job
+from src.core.config import settings
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
 
 CLUSTER_LABELS = {
     0: "SaaS / Tools",
     1: "Agency / Consultancy",
     2: "In-house / Brand",
 }
+
+class CompanyClusterer:
+    """
+    Incremental company clustering over stored embeddings.
+
+    A company's embedding is the (re-normalized) mean of its job embeddings. The
+    MiniBatchKMeans state lives on disk and is updated with partial_fit on the
+    companies touched by each ingestion run, so nothing is re-embedded and no
+    full KMeans refit is needed.
+    """
+
+    def __init__(self, n_clusters: int | None = None, model_path: str | None = None):
+        self.n_clusters = n_clusters or settings.CLUSTER_N_CLUSTERS
+        self.model_path = model_path or settings.CLUSTER_MODEL_PATH
+        self._model: MiniBatchKMeans | None = None
+
+    @property
+    def model(self) -> MiniBatchKMeans:
+        if self._model is None:
+            if os.path.exists(self.model_path):
+                self._model = joblib.load(self.model_path)
+            else:
+                self._model = MiniBatchKMeans(n_clusters=self.n_clusters, random_state=42, n_init=3)
+        return self._model
+
+    @property
+    def is_fitted(self) -> bool:
+        return hasattr(self.model, "cluster_centers_")
+
+    def reset(self):
+        self._model = MiniBatchKMeans(n_clusters=self.n_clusters, random_state=42, n_init=3)
+
+    def save(self):
+        directory = os.path.dirname(self.model_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        joblib.dump(self.model, self.model_path)
+
+    def partial_fit_predict(self, X: np.ndarray) -> np.ndarray | None:
+        """
+        Updates the model with X and returns cluster ids for X.
+        Returns None while there are too few samples to initialize the model.
+        """
+        if len(X) == 0:
+            return None
+        if not self.is_fitted and len(X) < self.n_clusters:
+            return None
+        self.model.partial_fit(X)
+        return self.model.predict(X)
+
+def _normalize(X: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(X, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return X / norms
+
+def company_embeddings_stmt(company_ids: list[int] | None = None, since: datetime | None = None):
+    """Mean job embedding per company, computed in Postgres."""
+    stmt = (
+        select(Job.company_id, func.avg(Job.embedding, type_=Vector(384)).label("embedding"))
+        .where(Job.embedding.is_not(None))
+        .group_by(Job.company_id)
+        .order_by(Job.company_id)
+    )
+    if company_ids is not None:
+        stmt = stmt.where(Job.company_id.in_(company_ids))
+    if since is not None:
+        stmt = stmt.join(Company, Company.id == Job.company_id).where(Company.last_seen >= since)
+    return stmt
+
+def bulk_assign_stmt(ids: list[int], X: np.ndarray, labels: np.ndarray):
+    v = values(
+        column("id", Integer),
+        column("embedding", Vector(384)),
+        column("cluster_id", Integer),
+        name="clusters",
+    ).data([(i, x.tolist(), int(label)) for i, x, label in zip(ids, X, labels)])
+    return (
+        update(Company)
+        .where(Company.id == v.c.id)
+        # VALUES columns come through untyped; cast explicitly for the vector column
+        .values(embedding=cast(v.c.embedding, Vector(384)), cluster_id=v.c.cluster_id)
+        .execution_options(synchronize_session=False)
+    )
+
+async def update_company_clusters(
+    session: AsyncSession,
+    company_ids: list[int] | None = None,
+    since: datetime | None = None,
+    clusterer: CompanyClusterer | None = None,
+) -> dict[int, int]:
+    """
+    Refreshes embeddings and cluster assignments for the given companies (or those
+    seen since a timestamp), updates the model with partial_fit and persists both
+    the assignments and the model state. Returns {company_id: cluster_id}.
+    """
+    clusterer = clusterer or CompanyClusterer()
+
+    result = await session.execute(company_embeddings_stmt(company_ids, since))
+    rows = result.all()
+    if not rows:
+        return {}
+
+    ids = [row.company_id for row in rows]
+    X = _normalize(np.vstack([np.asarray(row.embedding, dtype=np.float32) for row in rows]))
+
+    labels = clusterer.partial_fit_predict(X)
+    if labels is None:
+        logger.info("[cluster] Not enough companies to initialize clusters yet", extra={"count": len(ids)})
+        return {}
+
+    await session.execute(bulk_assign_stmt(ids, X, labels))
+    await session.commit()
+    clusterer.save()
+
+    logger.info("[cluster] Updated company clusters", extra={"count": len(ids)})
+    return {i: int(label) for i, label in zip(ids, labels)}
@@ -0,0 +1,47 @@
+import re
+from typing import Iterable, Mapping
+
+
+class KeywordMatcher:
+    """
+    Compiled, word-bounded keyword matcher.
+
+    All keywords are folded into one alternation regex, so a text is scanned once
+    and every matched feature is returned together (instead of one substring scan
+    per keyword). Matches are word-bounded: "ai" no longer matches "maintain" and
+    "us" no longer matches "business".
+    """
+
+    def __init__(self, features: Mapping[str, Iterable[str]]):
+        # keyword (lowercase) -> set of feature names it signals
+        self._features: dict[str, set[str]] = {}
+        for feature, keywords in features.items():
+            for kw in keywords:
+                kw = kw.strip().lower()
+                if kw:
+                    self._features.setdefault(kw, set()).add(feature)
+
+        # Longest first so "digital marketing" wins over "marketing" in the alternation
+        keywords = sorted(self._features, key=len, reverse=True)
+        alternation = "|".join(re.escape(kw) for kw in keywords)
+        self._pattern = re.compile(rf"(?<!\w)(?:{alternation})(?!\w)", re.IGNORECASE)
+
+        # Alternation matches don't overlap, so a long keyword hides the shorter keywords
+        # inside it ("media group" hides "media"). Fold those features in up front.
+        for kw in keywords:
+            for other in keywords:
+                if other != kw and len(other) < len(kw) and re.search(rf"(?<!\w){re.escape(other)}(?!\w)", kw):
+                    self._features[kw] |= self._features[other]
+
+    def keywords(self, text: str | None) -> set[str]:
+        """Returns every keyword found in text (lowercased)."""
+        if not text:
+            return set()
+        return {m.lower() for m in self._pattern.findall(text)}
+
+    def features(self, text: str | None) -> set[str]:
+        """Returns every feature with at least one keyword in text."""
+        found: set[str] = set()
+        for kw in self.keywords(text):
+            found |= self._features[kw]
+        return found
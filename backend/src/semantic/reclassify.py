@@ -0,0 +1,180 @@
+import json
+import os
+from dataclasses import dataclass, field
+
+from sqlalchemy import select, update, func, values, column, Integer, String
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+
+from src.db.session import engine, AsyncSessionLocal
+from src.db.models import Company, Job
+from src.db.generation import bump_generation
+from src.semantic.classifier_company import company_classifier
+from src.semantic.keywords import KeywordMatcher
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+TITLES_PER_COMPANY = 5
+DEFAULT_CHUNK_SIZE = 1000
+
+# Title signals appended to the description proxy (order is preserved in the output)
+TITLE_TAGS = KeywordMatcher({
+    "client services agency": ["account manager", "customer success"],
+    "strong seo leadership": ["head of seo", "director of seo", "seo director"],
+    "performance marketing": ["performance marketing", "paid media"],
+})
+TITLE_TAG_ORDER = ["client services agency", "strong seo leadership", "performance marketing"]
+
+@dataclass
+class ReclassifyChange:
+    id: int
+    name: str
+    old_classification: str | None
+    old_category: str | None
+    classification: str
+    category: str
+
+@dataclass
+class ReclassifyReport:
+    scanned: int = 0
+    changed: int = 0
+    last_id: int = 0
+    changes: list[ReclassifyChange] = field(default_factory=list)
+
+def category_for(classification: str | None) -> str:
+    return "Agency / Consultancy" if classification == "Competitor" else "SaaS / Tools"
+
+def describe_titles(titles: list[str] | None) -> str:
+    """
+    Builds the description proxy used to classify a company from its job titles.
+    """
+    if not titles:
+        return ""
+    features = TITLE_TAGS.features(" || ".join(titles))
+    tags = [tag for tag in TITLE_TAG_ORDER if tag in features]
+
+    description_text = "Hiring for: " + ", ".join(titles)
+    if tags:
+        description_text += ". Tags: " + ", ".join(tags)
+    return description_text
+
+def company_titles_stmt(after_id: int = 0, titles_per_company: int = TITLES_PER_COMPANY):
+    """
+    One windowed query returning every company with its first N job titles,
+    ordered by company id so it can be streamed and resumed.
+    """
+    ranked = (
+        select(
+            Job.company_id,
+            Job.title,
+            func.row_number().over(partition_by=Job.company_id, order_by=Job.id).label("rn"),
+        )
+        .subquery()
+    )
+    titles = (
+        select(
+            ranked.c.company_id,
+            func.array_agg(aggregate_order_by(ranked.c.title, ranked.c.rn)).label("titles"),
+        )
+        .where(ranked.c.rn <= titles_per_company)
+        .group_by(ranked.c.company_id)
+        .subquery()
+    )
+    return (
+        select(Company.id, Company.name, Company.classification, Company.category, titles.c.titles)
+        .outerjoin(titles, titles.c.company_id == Company.id)
+        .where(Company.id > after_id)
+        .order_by(Company.id)
+    )
+
+def classify_chunk(rows) -> list[ReclassifyChange]:
+    """
+    Classifies a chunk of (id, name, classification, category, titles) rows in one batch
+    and returns only the companies whose classification or category changes.
+    """
+    labels = company_classifier.classify_many(
+        [(row.name, describe_titles(row.titles)) for row in rows]
+    )
+    changes = []
+    for row, classification in zip(rows, labels):
+        category = category_for(classification)
+        if row.classification != classification or row.category != category:
+            changes.append(ReclassifyChange(
+                id=row.id,
+                name=row.name,
+                old_classification=row.classification,
+                old_category=row.category,
+                classification=classification,
+                category=category,
+            ))
+    return changes
+
+def bulk_update_stmt(changes: list[ReclassifyChange]):
+    """UPDATE companies ... FROM (VALUES ...) for a whole chunk in one statement."""
+    v = values(
+        column("id", Integer),
+        column("classification", String),
+        column("category", String),
+        name="changes",
+    ).data([(c.id, c.classification, c.category) for c in changes])
+    return (
+        update(Company)
+        .where(Company.id == v.c.id)
+        .values(classification=v.c.classification, category=v.c.category)
+        .execution_options(synchronize_session=False)
+    )
+
+def load_checkpoint(path: str) -> int:
+    if not os.path.exists(path):
+        return 0
+    with open(path) as f:
+        return int(json.load(f).get("last_id", 0))
+
+def save_checkpoint(path: str, last_id: int):
+    with open(path, "w") as f:
+        json.dump({"last_id": last_id}, f)
+
+async def reclassify_companies(
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dry_run: bool = False,
+    after_id: int = 0,
+    checkpoint_path: str | None = None,
+) -> ReclassifyReport:
+    """
+    Set-based company reclassification.
+
+    Rows are streamed from a server-side cursor on a dedicated read connection; each
+    chunk is classified in one batch and its changes are written with a single bulk
+    UPDATE committed on its own, so no transaction holds locks for the whole run.
+    With a checkpoint path the last committed company id is recorded after every
+    chunk and picked up again on the next run. In dry-run mode nothing is written
+    and the report carries the full diff.
+    """
+    report = ReclassifyReport(last_id=after_id)
+
+    async with engine.connect() as read_conn:
+        result = await read_conn.stream(
+            company_titles_stmt(after_id).execution_options(yield_per=chunk_size)
+        )
+        async for rows in result.partitions(chunk_size):
+            changes = classify_chunk(rows)
+
+            if changes and not dry_run:
+                async with AsyncSessionLocal() as session:
+                    await session.execute(bulk_update_stmt(changes))
+                    await bump_generation(session, reason="reclassify")
+                    await session.commit()
+
+            report.scanned += len(rows)
+            report.changed += len(changes)
+            report.last_id = rows[-1].id
+            if dry_run:
+                report.changes.extend(changes)
+            elif checkpoint_path:
+                save_checkpoint(checkpoint_path, report.last_id)
+
+            logger.info("[reclassify] chunk done", extra={
+                "scanned": report.scanned, "changed": report.changed, "last_id": report.last_id
+            })
+
+    return report
@@ -0,0 +1,130 @@
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+import numpy as np
+from sqlalchemy import select, update, values, column, Integer, Float, String, Boolean
+
+from src.db.session import engine, AsyncSessionLocal
+from src.db.models import Job
+from src.db.aggregates import refresh_company_stats_stmt
+from src.db.generation import bump_generation
+from src.db.listener import JOBS_CHANNEL, notify_many_stmt
+from src.semantic.classifier import AISearchClassifier, classifier as default_classifier
+from src.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_CHUNK_SIZE = 20000
+
+@dataclass
+class RescoreReport:
+    scanned: int = 0
+    updated: int = 0
+    seconds: float = 0.0
+    # (old_tier, new_tier) -> count, only for rows whose tier changed
+    transitions: Counter = field(default_factory=Counter)
+    # Companies whose AI-search job set changed (company_stats refreshed)
+    companies_refreshed: int = 0
+
+def rescore_chunk(clf: AISearchClassifier, rows, update_scores: bool = False):
+    """
+    Re-scores one chunk of (id, company_id, embedding, role_tier, relevance_score)
+    rows with a single matmul against the classifier centroid.
+
+    Returns (updates, transitions, company_ids) where updates are
+    (id, score, tier, is_ai_search) tuples for rows whose tier changed (or whose
+    score moved, with update_scores) and company_ids are the companies with a job
+    moving in or out of AI-search scope.
+    """
+    ids = np.fromiter((r.id for r in rows), dtype=np.int64, count=len(rows))
+    matrix = np.vstack([np.asarray(r.embedding, dtype=np.float32) for r in rows])
+    scores = matrix @ np.asarray(clf.centroid, dtype=np.float32)
+    tiers = clf.tiers_for_scores(scores)
+    old_tiers = np.array([r.role_tier for r in rows], dtype=object)
+
+    changed = tiers != old_tiers
+    if update_scores:
+        old_scores = np.array(
+            [np.nan if r.relevance_score is None else r.relevance_score for r in rows], dtype=np.float64
+        )
+        changed |= ~np.isclose(scores, old_scores, atol=1e-6)
+
+    transitions = Counter(
+        (old, new) for old, new in zip(old_tiers[tiers != old_tiers], tiers[tiers != old_tiers])
+    )
+    updates = [
+        (int(i), float(s), str(t), str(t) != "out_of_scope")
+        for i, s, t in zip(ids[changed], scores[changed], tiers[changed])
+    ]
+    scope_flipped = (tiers == "out_of_scope") != (old_tiers == "out_of_scope")
+    company_ids = {r.company_id for r, flipped in zip(rows, scope_flipped) if flipped}
+    return updates, transitions, company_ids
+
+def bulk_update_stmt(updates):
+    v = values(
+        column("id", Integer),
+        column("relevance_score", Float),
+        column("role_tier", String),
+        column("is_ai_search", Boolean),
+        name="rescored",
+    ).data(updates)
+    return (
+        update(Job)
+        .where(Job.id == v.c.id)
+        .values(relevance_score=v.c.relevance_score, role_tier=v.c.role_tier, is_ai_search=v.c.is_ai_search)
+        .execution_options(synchronize_session=False)
+    )
+
+async def rescore_jobs(
+    clf: AISearchClassifier | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dry_run: bool = False,
+    update_scores: bool = False,
+) -> RescoreReport:
+    """
+    Recomputes relevance_score / role_tier / is_ai_search for every job from its
+    stored embedding, without running the embedding model over job text.
+
+    Use after changing POSITIVE_SEEDS or the classifier thresholds. Embeddings are
+    streamed in large chunks; only rows whose tier changed are written (plus rows
+    whose score moved when update_scores is set), one bulk UPDATE per chunk.
+    """
+    clf = clf or default_classifier
+    report = RescoreReport()
+    started = time.perf_counter()
+
+    stmt = (
+        select(Job.id, Job.company_id, Job.embedding, Job.role_tier, Job.relevance_score)
+        .where(Job.embedding.is_not(None))
+        .order_by(Job.id)
+        .execution_options(yield_per=chunk_size)
+    )
+
+    async with engine.connect() as read_conn:
+        result = await read_conn.stream(stmt)
+        async for rows in result.partitions(chunk_size):
+            updates, transitions, company_ids = rescore_chunk(clf, rows, update_scores=update_scores)
+            report.scanned += len(rows)
+            report.updated += len(updates)
+            report.transitions.update(transitions)
+            report.companies_refreshed += len(company_ids)
+
+            if updates and not dry_run:
+                async with AsyncSessionLocal() as session:
+                    await session.execute(bulk_update_stmt(updates))
+                    if company_ids:
+                        await session.execute(refresh_company_stats_stmt(company_ids))
+                    # Re-tiered jobs go out on the live feed like upsert's
+                    old_tiers = {r.id: r.role_tier for r in rows}
+                    retiered = [str(u[0]) for u in updates if u[2] != old_tiers[u[0]]]
+                    if retiered:
+                        await session.execute(notify_many_stmt(JOBS_CHANNEL, retiered))
+                    await bump_generation(session, reason="rescore")
+                    await session.commit()
+
+    report.seconds = time.perf_counter() - started
+    logger.info("[rescore] done", extra={
+        "scanned": report.scanned, "updated": report.updated, "seconds": round(report.seconds, 2)
+    })
+    return report
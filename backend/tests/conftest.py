@@ -2,10 +2,14 @@ import pytest
 import asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 from httpx import AsyncClient, ASGITransport
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
 
 from src.db.session import get_session
 from src.api.main import app
+from src.core.cache import invalidate_all
+from src.db.generation import generation_tracker
 
 @pytest.fixture(scope="session")
 def event_loop():
@@ -13,6 +17,19 @@ def event_loop():
     yield loop
     loop.close()
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    invalidate_all()
+    yield
+    invalidate_all()
+
+@pytest.fixture(autouse=True)
+def fixed_generation(monkeypatch):
+    # Don't hit Postgres for the data generation; tests can bump it via the mock
+    current = AsyncMock(return_value=1)
+    monkeypatch.setattr(generation_tracker, "current", current)
+    return current
+
 @pytest.fixture
 def mock_session():
     return AsyncMock(spec=AsyncSession)
@@ -25,3 +42,80 @@ def app_client(mock_session):
     app.dependency_overrides[get_session] = override_get_session
     return AsyncClient(transport=ASGITransport(app=app), base_url="http://test")
 
+@pytest.fixture
+def ingest(monkeypatch):
+    """
+    Runs pipeline.run_ingestion over `sources` with the DB, the model and the
+    upserts faked out; every fetched job is relevant and upserts succeed.
+    `duplicates` maps a job url to the stored dedupe key it is folded into.
+    Returns the dedupe keys each source marked seen.
+    """
+    from src.ingestion import pipeline, workers
+    from src.ingestion.minhash import NearDuplicate
+    from src.ingestion.run import IngestRun
+    from src.ingestion.sources.base import Source
+
+    class NoSource(Source):
+        name = "none"
+
+        async def fetch(self):
+            return
+            yield
+
+    async def run(sources, duplicates=None):
+        duplicates = duplicates or {}
+        seen = {}
+
+        class RecordingRun(IngestRun):
+            def see(self, source, dedupe_key):
+                seen.setdefault(source, set()).add(dedupe_key)
+                super().see(source, dedupe_key)
+
+        class FakeDetector:
+            def __init__(self, session_factory):
+                pass
+
+            async def prime(self, session, dedupe_keys):
+                return 0
+
+            async def check(self, job, dedupe_key):
+                if job.url in duplicates:
+                    return NearDuplicate(duplicates[job.url], 0.9, job_id=1, company_id=1)
+                return None
+
+            def accept(self, dedupe_key):
+                pass
+
+            def reject(self, dedupe_key):
+                pass
+
+        classifier = MagicMock(threshold=0.5)
+        classifier.embed.return_value = np.zeros(3)
+        classifier.score_vector.return_value = 1.0
+        session = AsyncMock()
+        session.execute.return_value = MagicMock()
+        session_factory = MagicMock()
+        session_factory.return_value.__aenter__ = AsyncMock(return_value=session)
+        session_factory.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        async def upsert_ok(job, stats, run=None):
+            return "inserted"
+
+        # The sources under test stand in for the ATS boards after an empty SEOJobs
+        monkeypatch.setattr(pipeline, "SEOJobsSource", NoSource)
+        monkeypatch.setattr(pipeline, "ats_sources", lambda specs: list(sources))
+        monkeypatch.setattr(pipeline, "IngestRun", RecordingRun)
+        monkeypatch.setattr(pipeline, "NearDuplicateDetector", FakeDetector)
+        monkeypatch.setattr(pipeline, "classifier", classifier)
+        monkeypatch.setattr(pipeline, "AsyncSessionLocal", session_factory)
+        monkeypatch.setattr(pipeline, "bump_generation", AsyncMock())
+        monkeypatch.setattr(workers, "process_job_safe", upsert_ok)
+        for name, value in {
+            "ENABLE_NEAR_DUPLICATE_CHECK": True, "INGEST_TITLE_PRESCREEN": False,
+            "ENABLE_LINKEDIN": False, "INGEST_COMPANY_CACHE_PROCESS_SCOPED": False,
+        }.items():
+            monkeypatch.setattr(pipeline.settings, name, value)
+
+        await pipeline.run_ingestion()
+        return seen
+    return run
@@ -1,8 +1,12 @@
+import json
+import warnings
 import pytest
 import datetime
 from unittest.mock import MagicMock
 
 from src.db.models import Company, Job
+from src.semantic.schema import JobOut
+from src.api.responses import rows_response
 
 @pytest.mark.asyncio
 async def test_health_check(app_client):
@@ -14,12 +18,21 @@ async def test_health_check(app_client):
 @pytest.mark.asyncio
 async def test_list_companies(app_client, mock_session):
     mock_result = MagicMock()
-    company = Company(id=1, name="Test Company", category="SaaS / Tools")
-    
-    # Mock aggregation row: (Company, job_count, titles_list)
-    mock_result.all.return_value = [
-        (company, 3, ["AI SEO Specialist", "Search Engineer", "SEO Manager"])
-    ]
+    # Mock projection row: company columns + company_stats aggregates
+    mock_result.mappings.return_value.all.return_value = [{
+        "id": 1,
+        "name": "Test Company",
+        "website": None,
+        "industry": None,
+        "careers_url": None,
+        "category": "SaaS / Tools",
+        "region": None,
+        "classification": None,
+        "last_seen": None,
+        "ai_search_roles": 3,
+        "sample_titles": "AI SEO Specialist, Search Engineer, SEO Manager",
+        "latest_job_at": datetime.datetime(2025, 1, 1),
+    }]
     mock_session.execute.return_value = mock_result
     
     async with app_client as client:
@@ -36,27 +49,45 @@ async def test_list_companies(app_client, mock_session):
         # Ensure at least one of the mocked titles is present
         assert "AI SEO Specialist" in row["sample_titles"]
 
+def _job_row(**overrides):
+    # Projection row as returned by job_list_select() (JobOut columns + company_name)
+    row = {
+        "id": 1,
+        "title": "AI SEO Specialist",
+        "company_name": "Test Company",
+        "location": "Remote",
+        "posted_at": None,
+        "url": "https://example.com/job1",
+        "relevance_score": 0.9,
+        "source": "seo_jobs",
+        "is_ai_search": True,
+        "role_tier": "core_ai_search",
+        "remote_flag": None,
+        "employment_type": None,
+        "seniority": None,
+        "ai_forward": None,
+        "opp_athena_view": None,
+        "opp_role_type": None,
+        "opp_confidence": None,
+    }
+    row.update(overrides)
+    return row
+
+def test_rows_response_matches_schema_serialization():
+    # The orjson fast path must produce exactly what response_model would
+    row = _job_row(posted_at=datetime.datetime(2025, 1, 3, 12, 30, 15, 123456), opp_confidence=0.75)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        resp = rows_response([row], JobOut)
+    assert resp.media_type == "application/json"
+    fast = json.loads(resp.body)
+    assert fast == [JobOut.model_validate(row).model_dump(mode="json")]
+    assert list(fast[0]) == list(JobOut.model_fields)
+
 @pytest.mark.asyncio
 async def test_list_jobs(app_client, mock_session):
-    job = Job(
-        id=1,
-        company_id=1,
-        dedupe_key="dk",
-        external_id="ext-1",
-        source="seo_jobs",
-        title="AI SEO Specialist",
-        location="Remote",
-        url="https://example.com/job1",
-        posted_at=None,
-        scraped_at=None,
-        description="",
-        relevance_score=0.9,
-        is_ai_search=True,
-    )
-    job.company = Company(id=1, name="Test Company")
-
     mock_result = MagicMock()
-    mock_result.scalars.return_value.all.return_value = [job]
+    mock_result.mappings.return_value.all.return_value = [_job_row()]
     mock_session.execute.return_value = mock_result
 
     async with app_client as client:
@@ -71,6 +102,13 @@ async def test_list_jobs(app_client, mock_session):
         assert row["location"] == "Remote"
         assert row["url"] == "https://example.com/job1"
         assert row["posted_at"] is None
+
+        # One query, projected columns only
+        assert mock_session.execute.call_count == 1
+        sql = str(mock_session.execute.call_args[0][0])
+        assert "companies.name AS company_name" in sql
+        assert "jobs.description" not in sql
+        assert "jobs.embedding" not in sql
 @pytest.mark.asyncio
 async def test_job_detail(app_client, mock_session):
     company = Company(id=1, name="Test Company", classification="Client", category="SaaS / Tools")
@@ -85,14 +123,14 @@ async def test_job_detail(app_client, mock_session):
         url="https://example.com/job1",
         posted_at=None,
         scraped_at=None,
-        description="META: ai_forward=true || OPP_META: athena_view=Client; ...",
         relevance_score=0.9,
         is_ai_search=True,
+        ai_forward=True,
     )
     job.company = company
 
     mock_result = MagicMock()
-    mock_result.first.return_value = (job, company)
+    mock_result.first.return_value = (job, company, "We are hiring an AI SEO Specialist.")
     mock_session.execute.return_value = mock_result
 
     async with app_client as client:
@@ -105,7 +143,8 @@ async def test_job_detail(app_client, mock_session):
         assert data["company_classification"] == "Client"
         assert data["company_category"] == "SaaS / Tools"
         assert data["dedupe_key"] == "abc123"
-        assert "META:" in data["description"]
+        assert data["description"] == "We are hiring an AI SEO Specialist."
+        assert data["ai_forward"] is True
 
 @pytest.mark.asyncio
 async def test_job_detail_with_opp_meta(app_client, mock_session):
@@ -121,22 +160,27 @@ async def test_job_detail_with_opp_meta(app_client, mock_session):
         url="https://example.com/job2",
         posted_at=None,
         scraped_at=None,
-        description="OPP_META: athena_view=Client; confidence=0.95 || META: remote=onsite || Job description...",
         relevance_score=0.95,
         is_ai_search=True,
+        remote_flag="onsite",
+        opp_athena_view="Client",
+        opp_confidence=0.95,
     )
     job.company = company
     
     mock_result = MagicMock()
-    mock_result.first.return_value = (job, company)
+    mock_result.first.return_value = (job, company, "Job description...")
     mock_session.execute.return_value = mock_result
     
     async with app_client as client:
         resp = await client.get("/api/jobs/2")
         assert resp.status_code == 200
         data = resp.json()
-        assert "OPP_META:" in data["description"]
-        assert "athena_view=Client" in data["description"]
+        # Metadata comes from structured columns, not description prefixes
+        assert data["description"] == "Job description..."
+        assert data["opp_athena_view"] == "Client"
+        assert data["opp_confidence"] == 0.95
+        assert data["remote_flag"] == "onsite"
 
 
 
@@ -144,23 +188,17 @@ async def test_job_detail_with_opp_meta(app_client, mock_session):
 
 @pytest.mark.asyncio
 async def test_stats(app_client, mock_session):
-    # Prepare five result objects corresponding to the five execute() calls
-    r1 = MagicMock()
-    r1.scalar_one.return_value = 10  # total_companies
+    # All counters come back from a single aggregate query
+    row = MagicMock()
+    row.total_companies = 10
+    row.total_jobs = 27
+    row.total_competitors = 4
+    row.total_clients = 6
+    row.last_ingestion_at = "2025-01-01T00:00:00"
 
-    r2 = MagicMock()
-    r2.scalar_one.return_value = 27  # total_jobs
-
-    r3 = MagicMock()
-    r3.scalar_one.return_value = 4   # total_competitors
-
-    r4 = MagicMock()
-    r4.scalar_one.return_value = 6   # total_clients
-
-    r5 = MagicMock()
-    r5.scalar_one.return_value = "2025-01-01T00:00:00"  # last_ingestion_at
-
-    mock_session.execute.side_effect = [r1, r2, r3, r4, r5]
+    mock_result = MagicMock()
+    mock_result.one.return_value = row
+    mock_session.execute.return_value = mock_result
 
     async with app_client as client:
         resp = await client.get("/api/stats/")
@@ -172,28 +210,22 @@ async def test_stats(app_client, mock_session):
         assert data["total_competitors"] == 4
         assert data["total_clients"] == 6
         assert data["last_ingestion_at"] == "2025-01-01T00:00:00"
+        assert mock_session.execute.call_count == 1
+
+        # Second call is served from the in-process cache
+        resp = await client.get("/api/stats/")
+        assert resp.json()["total_jobs"] == 27
+        assert mock_session.execute.call_count == 1
 
 
 
 @pytest.mark.asyncio
 async def test_list_company_jobs_route(app_client, mock_session):
-    company = Company(id=1, name="Test Company")
-    job = Job(
-        id=1,
-        company_id=1,
-        title="AI Search Engineer",
-        external_id="ext-1",
-        is_ai_search=True,
-        scraped_at=None,
-        posted_at=None,
-        description="Desc"
-    )
-    job.company = company
-    
-    # Mock result for the query
-    # The query selects (Job, Company.name)
+    # The query projects JobOut columns plus scraped_at for the cursor
     mock_result = MagicMock()
-    mock_result.all.return_value = [(job, "Test Company")]
+    mock_result.mappings.return_value.all.return_value = [
+        _job_row(title="AI Search Engineer", scraped_at=None)
+    ]
     mock_session.execute.return_value = mock_result
     
     async with app_client as client:
@@ -203,3 +235,144 @@ async def test_list_company_jobs_route(app_client, mock_session):
         assert len(data) == 1
         assert data[0]["title"] == "AI Search Engineer"
         assert data[0]["company_name"] == "Test Company"
+        assert "scraped_at" not in data[0]
+
+
+@pytest.mark.asyncio
+async def test_list_jobs_keyset_pagination(app_client, mock_session):
+    from src.api.pagination import decode_cursor
+
+    rows = [
+        _job_row(id=i, title=f"Search Engineer {i}", posted_at=datetime.datetime(2025, 1, i))
+        for i in (3, 2)
+    ]
+
+    mock_result = MagicMock()
+    mock_result.mappings.return_value.all.return_value = rows
+    mock_session.execute.return_value = mock_result
+
+    async with app_client as client:
+        resp = await client.get("/api/jobs/", params={"limit": 1, "role_tier": "core_ai_search"})
+        assert resp.status_code == 200
+        assert len(resp.json()) == 1
+        cursor = resp.headers["X-Next-Cursor"]
+        assert decode_cursor(cursor, 2) == ["2025-01-03T00:00:00", 3]
+
+        # Filters and the keyset condition end up in the query
+        stmt = mock_session.execute.call_args[0][0]
+        sql = str(stmt)
+        assert "jobs.role_tier = " in sql
+        assert "LIMIT" in sql
+
+        resp = await client.get("/api/jobs/", params={"limit": 1, "cursor": cursor})
+        assert resp.status_code == 200
+        sql = str(mock_session.execute.call_args[0][0])
+        assert "(jobs.posted_at, jobs.id) < " in sql
+
+@pytest.mark.asyncio
+async def test_list_jobs_invalid_cursor(app_client, mock_session):
+    async with app_client as client:
+        resp = await client.get("/api/jobs/", params={"cursor": "not-a-cursor"})
+        assert resp.status_code == 400
+
+@pytest.mark.asyncio
+async def test_response_cache_and_etag(app_client, mock_session, fixed_generation):
+    mock_result = MagicMock()
+    mock_result.mappings.return_value.all.return_value = [_job_row()]
+    mock_session.execute.return_value = mock_result
+
+    async with app_client as client:
+        first = await client.get("/api/jobs/", params={"limit": 5, "source": "seo_jobs"})
+        # Same params in a different order hit the cache
+        second = await client.get("/api/jobs/", params={"source": "seo_jobs", "limit": 5})
+        assert first.status_code == second.status_code == 200
+        assert first.json() == second.json()
+        assert first.headers["etag"] == second.headers["etag"]
+        assert mock_session.execute.call_count == 1
+
+        revalidated = await client.get(
+            "/api/jobs/", params={"limit": 5, "source": "seo_jobs"},
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+        assert revalidated.status_code == 304
+        assert mock_session.execute.call_count == 1
+
+        # A writer bumped the generation: old ETag no longer matches, data is re-read
+        fixed_generation.return_value = 2
+        refreshed = await client.get(
+            "/api/jobs/", params={"limit": 5, "source": "seo_jobs"},
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+        assert refreshed.status_code == 200
+        assert refreshed.headers["etag"] != first.headers["etag"]
+        assert mock_session.execute.call_count == 2
+
+@pytest.mark.asyncio
+async def test_errors_are_not_cached(app_client, mock_session):
+    mock_result = MagicMock()
+    mock_result.first.return_value = None
+    mock_session.execute.return_value = mock_result
+
+    async with app_client as client:
+        assert (await client.get("/api/jobs/999")).status_code == 404
+        assert (await client.get("/api/jobs/999")).status_code == 404
+    assert mock_session.execute.call_count == 2
+
+@pytest.mark.asyncio
+async def test_large_responses_are_gzipped(app_client, mock_session):
+    mock_result = MagicMock()
+    mock_result.mappings.return_value.all.return_value = [_job_row(id=i) for i in range(1, 51)]
+    mock_session.execute.return_value = mock_result
+
+    async with app_client as client:
+        resp = await client.get("/api/jobs/", headers={"Accept-Encoding": "gzip"})
+    assert resp.status_code == 200
+    assert resp.headers["content-encoding"] == "gzip"
+    assert len(resp.json()) == 50
+
+@pytest.mark.asyncio
+async def test_list_jobs_full_text_search(app_client, mock_session):
+    from sqlalchemy.dialects import postgresql
+    from src.api.pagination import decode_cursor
+
+    mock_result = MagicMock()
+    mock_result.mappings.return_value.all.return_value = [
+        _job_row(id=7, rank=0.5), _job_row(id=3, rank=0.25),
+    ]
+    mock_session.execute.return_value = mock_result
+
+    async with app_client as client:
+        resp = await client.get("/api/jobs/", params={"q": "answer engine -intern", "limit": 1})
+
+    assert resp.status_code == 200
+    assert [j["id"] for j in resp.json()] == [7]
+    assert "rank" not in resp.json()[0]
+    assert decode_cursor(resp.headers["X-Next-Cursor"], 2) == [0.5, 7]
+
+    stmt = mock_session.execute.call_args.args[0]
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "jobs.search_vector @@ websearch_to_tsquery" in sql
+    assert "ORDER BY ts_rank_cd(jobs.search_vector" in sql
+
+@pytest.mark.asyncio
+async def test_search_rejects_posted_at_cursor(app_client, mock_session):
+    from src.api.pagination import encode_cursor
+
+    async with app_client as client:
+        cursor = encode_cursor(datetime.datetime(2025, 1, 1), 5)
+        resp = await client.get("/api/jobs/", params={"q": "seo", "cursor": cursor})
+    assert resp.status_code == 400
+
+@pytest.mark.asyncio
+async def test_list_jobs_open_only(app_client, mock_session):
+    mock_result = MagicMock()
+    mock_result.mappings.return_value.all.return_value = [_job_row()]
+    mock_session.execute.return_value = mock_result
+
+    async with app_client as client:
+        resp = await client.get("/api/jobs/")
+        assert "jobs.closed_at IS NULL" not in str(mock_session.execute.call_args.args[0])
+        resp = await client.get("/api/jobs/", params={"open_only": "true"})
+
+    assert resp.status_code == 200
+    assert "jobs.closed_at IS NULL" in str(mock_session.execute.call_args.args[0])
@@ -0,0 +1,147 @@
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+import pytest
+
+from src.ingestion.crawl_state import CrawlEntry
+from src.ingestion.sources.ats import GreenhouseSource, LeverSource, ats_sources, parse_board_spec
+
+FIXTURES = Path(__file__).parent / "fixtures" / "ats"
+
+ACME_HEAD = "https://job-boards.greenhouse.io/acme/jobs/4012345"
+ACME_RELEVANCE = "https://job-boards.greenhouse.io/acme/jobs/4012399"
+
+class FakeState:
+    def __init__(self, entries=()):
+        self.entries = {e.url: e for e in entries}
+        self.saved = []
+
+    async def load(self, source):
+        return dict(self.entries)
+
+    async def save(self, source, entries):
+        self.saved.extend(entries)
+
+def replay(requests):
+    """Serves the recorded board JSON; unknown boards are a 404."""
+    boards = {
+        "/v1/boards/acme/jobs": "greenhouse_acme.json",
+        "/v0/postings/globex": "lever_globex.json",
+    }
+
+    def handler(request: httpx.Request):
+        requests.append(request.url.path)
+        name = boards.get(request.url.path)
+        if name is None:
+            return httpx.Response(404, json={"status": 404, "error": "Job not found"})
+        return httpx.Response(200, content=(FIXTURES / name).read_bytes(), headers={"Content-Type": "application/json"})
+    return httpx.MockTransport(handler)
+
+async def _run(source):
+    return [job async for job in source.fetch()]
+
+def test_parse_board_spec():
+    assert parse_board_spec("greenhouse:acme") == ("greenhouse", "acme", None)
+    assert parse_board_spec(" Lever:globex=Globex Corp ") == ("lever", "globex", "Globex Corp")
+    with pytest.raises(ValueError):
+        parse_board_spec("acme")
+
+def test_ats_sources_groups_boards_by_provider():
+    sources = ats_sources(["greenhouse:acme", "lever:globex=Globex", "greenhouse:initech", "workday:nope", "bad"])
+    assert [(s.name, s.boards) for s in sources] == [
+        ("greenhouse", [("acme", None), ("initech", None)]),
+        ("lever", [("globex", "Globex")]),
+    ]
+
+@pytest.mark.asyncio
+async def test_greenhouse_board_maps_to_raw_jobs():
+    requests = []
+    state = FakeState()
+    source = GreenhouseSource([("acme", None)], transport=replay(requests), state=state)
+
+    jobs = await _run(source)
+
+    # One request for the whole board
+    assert requests == ["/v1/boards/acme/jobs"]
+    by_url = {j.url: j for j in jobs}
+    head = by_url[ACME_HEAD]
+    assert (head.title, head.company, head.location, head.source) == ("Head of AI Search", "Acme Inc.", "Remote - US", "greenhouse")
+    assert head.external_id == "acme:4012345"
+    assert head.description.startswith("<p>Lead our <strong>answer engine optimization</strong>")
+    assert head.posted_at == "2026-02-20T09:00:00-05:00"
+    assert by_url[ACME_RELEVANCE].title == "Search Relevance Engineer"
+    # Enriched like scraped jobs
+    assert head.seniority == "director"
+    assert source.complete_listing is True
+
+    # Recorded only once the pipeline commits the persisted/dropped jobs
+    assert state.saved == []
+    await source.commit(jobs)
+    saved = {e.url: e for e in state.saved}
+    assert saved[ACME_HEAD].lastmod == datetime(2026, 3, 5, 15, 30)
+
+@pytest.mark.asyncio
+async def test_greenhouse_skips_postings_not_updated_since_last_run():
+    state = FakeState([
+        CrawlEntry(ACME_HEAD, datetime(2026, 3, 5, 15, 30), "Head of AI Search", "Acme Inc.", "Remote - US"),
+        CrawlEntry(ACME_RELEVANCE, datetime(2026, 2, 1), "Search Relevance Engineer", "Acme Inc.", "New York, NY"),
+    ])
+    source = GreenhouseSource([("acme", None)], transport=replay([]), state=state)
+    listed = []
+
+    async def on_listing(listings):
+        listed.extend(listings)
+        return None
+
+    source.on_listing = on_listing
+    jobs = await _run(source)
+
+    # Both listed (so both stay open); only the updated one is yielded
+    assert {l["url"]: l["changed"] for l in listed} == {ACME_HEAD: False, ACME_RELEVANCE: True}
+    assert [j.url for j in jobs] == [ACME_RELEVANCE]
+    assert state.saved == []
+    await source.commit(jobs)
+    assert [e.url for e in state.saved] == [ACME_RELEVANCE]
+
+@pytest.mark.asyncio
+async def test_folded_posting_keeps_its_job_listed_across_runs(ingest):
+    # A folded posting is never recorded: each run yields and folds it again,
+    # marking the job it was folded into seen
+    state = FakeState()
+    for _ in range(2):
+        source = GreenhouseSource([("acme", None)], transport=replay([]), state=state)
+        seen = await ingest([source], duplicates={ACME_RELEVANCE: "kept-key"})
+
+        assert "kept-key" in seen["greenhouse"]
+        assert ACME_RELEVANCE not in {e.url for e in state.saved}
+        state = FakeState([*state.entries.values(), *state.saved])
+    # Only the posting that was upserted was ever recorded
+    assert set(state.entries) == {ACME_HEAD}
+
+@pytest.mark.asyncio
+async def test_lever_board_maps_to_raw_jobs():
+    source = LeverSource([("globex", "Globex")], transport=replay([]), state=FakeState())
+
+    jobs = {j.title: j for j in await _run(source)}
+
+    seo = jobs["Senior SEO Manager"]
+    assert (seo.company, seo.location, seo.source) == ("Globex", "Austin, TX", "lever")
+    assert "Run technical audits" in seo.description and "Full-time, hybrid." in seo.description
+    assert seo.posted_at == "2026-03-01T08:00:00"
+    assert jobs["Content Strategist"].location == "Remote"
+
+@pytest.mark.asyncio
+async def test_failed_board_makes_listing_incomplete():
+    state = FakeState()
+    source = GreenhouseSource([("missing", None), ("acme", None)], transport=replay([]), state=state)
+
+    jobs = await _run(source)
+
+    # The other board still comes through, but nothing may be swept
+    assert len(jobs) == 2
+    assert source.complete_listing is False
+
+    # A posting whose upsert failed is not committed and comes back next run
+    await source.commit([j for j in jobs if j.url != ACME_HEAD])
+    assert [e.url for e in state.saved] == [ACME_RELEVANCE]
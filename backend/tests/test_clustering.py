@@ -0,0 +1,38 @@
+import os
+import numpy as np
+
+from src.semantic.clustering import CompanyClusterer, _normalize
+
+def _blobs():
+    rng = np.random.default_rng(0)
+    centers = np.eye(3, 8)
+    X = np.vstack([c + 0.01 * rng.standard_normal((10, 8)) for c in centers])
+    return _normalize(X.astype(np.float32))
+
+def test_partial_fit_needs_enough_samples(tmp_path):
+    clusterer = CompanyClusterer(n_clusters=3, model_path=str(tmp_path / "m.joblib"))
+    assert clusterer.partial_fit_predict(_blobs()[:2]) is None
+    assert not clusterer.is_fitted
+
+def test_partial_fit_persists_and_resumes(tmp_path):
+    path = str(tmp_path / "m.joblib")
+    X = _blobs()
+
+    clusterer = CompanyClusterer(n_clusters=3, model_path=path)
+    labels = clusterer.partial_fit_predict(X)
+    assert labels is not None
+    # Each blob lands in its own cluster
+    assert len({int(labels[0]), int(labels[10]), int(labels[20])}) == 3
+    clusterer.save()
+
+    # A new instance picks up the saved state and can update with a small batch
+    resumed = CompanyClusterer(n_clusters=3, model_path=path)
+    assert resumed.is_fitted
+    new_labels = resumed.partial_fit_predict(X[:1])
+    assert int(new_labels[0]) == int(labels[0])
+
+def test_cluster_model_path_is_independent_of_cwd(monkeypatch, tmp_path):
+    from src.core.config import Settings, BACKEND_ROOT
+    monkeypatch.chdir(tmp_path)
+    assert Settings().CLUSTER_MODEL_PATH == os.path.join(BACKEND_ROOT, "data", "company_clusters.joblib")
+    assert Settings(CLUSTER_MODEL_PATH="/srv/m.joblib").CLUSTER_MODEL_PATH == "/srv/m.joblib"
@@ -14,18 +14,10 @@ def test_enrich_preserves_description():
     )
     enriched = enrich_raw_job(raw)
     
-    # Check that original text is still there
-    assert "Original valuable content." in enriched.description
-    
-    # Check that META was added (assuming inference triggers it, e.g. remote or title)
-    # "Remote" location -> META: remote=remote
-    assert "META:" in enriched.description
-    assert "remote=remote" in enriched.description
-    
-    # Verify structure
-    parts = enriched.description.split(" || ")
-    assert len(parts) >= 2
-    assert parts[-1] == "Original valuable content."
+    # Description is never rewritten; metadata only goes to structured fields
+    assert enriched.description == "Original valuable content."
+    assert enriched.remote_flag == "remote"
+    assert enriched.ai_forward is True
 
 def test_enrich_with_empty_description():
     raw = RawJob(
@@ -39,8 +31,38 @@ def test_enrich_with_empty_description():
     )
     enriched = enrich_raw_job(raw)
     
-    assert "META:" in enriched.description
-    assert "seniority=senior" in enriched.description
-    # Should end with || (empty string)
-    assert enriched.description.endswith("||")
+    assert enriched.description == ""
+    assert enriched.seniority == "senior"
+
+def test_clean_description_strips_html():
+    from src.ingestion.descriptions import clean_description
+
+    html = "<div><p>We are <b>hiring</b>.</p><script>track()</script><ul><li>Python</li><li>SEO</li></ul></div>"
+    assert clean_description(html) == "We are hiring.\nPython\nSEO"
+    assert clean_description("  plain   text \n\n\n second ") == "plain text\n\nsecond"
+    assert clean_description("") is None
+
+def test_description_backfill_hashes_match_ingestion():
+    import importlib.util
+    from pathlib import Path
+    from src.ingestion.descriptions import clean_description, description_hash
+
+    path = next((Path(__file__).parent.parent / "src/db/migrations/versions").glob("0a6e4b1d9f27_*.py"))
+    spec = importlib.util.spec_from_file_location("migration_0a6e4b1d9f27", path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    html = "<div><p>We are <b>hiring</b>.</p><ul><li>Python</li><li>SEO</li></ul></div>"
+    stored = "OPP_META: Client || META: remote | senior || " + html
+    # Stamped prefixes are stripped; the rest hashes like a freshly ingested body
+    assert migration._clean_description(stored) == clean_description(html)
+    assert description_hash(migration._clean_description(stored)) == description_hash(clean_description(html))
+    assert migration._clean_description("  plain   text ") == clean_description("  plain   text ")
+
+def test_orphan_description_cleanup_is_one_anti_join():
+    from sqlalchemy.dialects import postgresql
+    from src.ingestion.descriptions import delete_orphan_descriptions_stmt
 
+    sql = str(delete_orphan_descriptions_stmt().compile(dialect=postgresql.dialect()))
+    assert sql.startswith("DELETE FROM job_descriptions WHERE NOT (EXISTS")
+    assert "jobs.description_hash = job_descriptions.content_hash" in sql
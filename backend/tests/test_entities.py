@@ -0,0 +1,60 @@
+from sqlalchemy.dialects import postgresql
+
+from src.ingestion.entities import (
+    normalize_company_key, resolve_company_stmt, merge_plan, merge_companies_stmts,
+)
+
+def _sql(stmt):
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+def test_normalize_company_key_folds_variants():
+    variants = ["Acme Corp", "ACME Corporation ", "Acme, Inc", "Acme, Inc.", "acme llc", "The Acme Corp."]
+    assert {normalize_company_key(v) for v in variants} == {"acme"}
+    # "Company" is part of the name, not a legal form
+    assert normalize_company_key("Fast Company") == "fast company"
+    assert normalize_company_key("The Browser Company") == "browser company"
+    assert normalize_company_key("Fast Company") != normalize_company_key("Fast")
+    assert normalize_company_key("A.C.M.E. Labs") == "acme labs"
+    assert normalize_company_key("Ogilvy & Mather") == "ogilvy and mather"
+    assert normalize_company_key("Müller GmbH") == "muller"
+    # A suffix alone is still a name
+    assert normalize_company_key("Inc") == "inc"
+    assert normalize_company_key(None) == ""
+
+def test_resolve_prefers_exact_key_then_trigram_match():
+    sql = _sql(resolve_company_stmt("acme labs", threshold=0.8))
+    assert "WHERE companies.name_key = %(name_key_1)s OR (companies.name_key %% %(name_key_2)s)" in sql
+    assert "similarity(companies.name_key, %(similarity_1)s) >= %(similarity_2)s" in sql
+    assert "ORDER BY companies.name_key = %(name_key_1)s DESC, similarity(" in sql
+
+    # Short keys never match fuzzily
+    assert "similarity" not in _sql(resolve_company_stmt("ai"))
+
+def test_merge_plan_groups_transitively_and_keeps_biggest():
+    plan = merge_plan([(1, 2), (2, 3), (7, 8)], {1: 2, 2: 10, 3: 0, 7: 1, 8: 1})
+    assert plan == {1: 2, 3: 2, 8: 7}
+    assert merge_plan([], {}) == {}
+
+def test_merge_companies_is_set_based():
+    stmts = merge_companies_stmts({3: 1, 4: 1, 9: 8})
+    assert len(stmts) == 4
+    repoint, fill, remove, stats = (_sql(s) for s in stmts)
+    assert repoint.startswith("UPDATE jobs SET company_id=merge.canonical_id FROM (VALUES")
+    assert "coalesce(companies.classification, companies_1.classification)" in fill
+    assert remove.startswith("DELETE FROM companies WHERE companies.id IN")
+    assert "company_stats" in stats
+    assert merge_companies_stmts({}) == []
+
+def test_name_key_migration_keys_match_runtime():
+    import importlib.util
+    from pathlib import Path
+
+    path = next((Path(__file__).parent.parent / "src/db/migrations/versions").glob("3d9a5b7c1e24_*.py"))
+    spec = importlib.util.spec_from_file_location("migration_3d9a5b7c1e24", path)
+    migration = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(migration)
+
+    # The migration carries its own copy of the key function (no app imports)
+    assert "from src" not in path.read_text()
+    for name in ["Acme, Inc.", "The Browser Company", "Müller GmbH", "Ogilvy & Mather", "A.C.M.E. Labs", "Inc", None]:
+        assert migration._company_key(name) == normalize_company_key(name)
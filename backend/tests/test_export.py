@@ -0,0 +1,68 @@
+import csv
+import io
+import json
+import pytest
+from datetime import datetime
+
+from src.db import export
+from src.db.export import export_jobs_stmt, encoder_for
+
+ROWS = [
+    (1, 10, "Acme", "AI SEO Lead", "Remote", "https://x/1", "seo_jobs", "e1",
+     datetime(2025, 1, 2, 3, 4, 5), datetime(2025, 1, 3), datetime(2025, 1, 3), None, 0.91, True, "core_ai_search",
+     "remote", "full_time", "lead", True, "Client", "BrandBuyer", "Buyer", 0.8),
+    (2, 11, "Beta", "Search Engineer", None, None, "seo_jobs", None,
+     None, datetime(2025, 1, 4), datetime(2025, 1, 4), datetime(2025, 1, 5), 0.55, True, "adjacent", None, None, None, None, None, None, None, None),
+]
+
+def _encode(fmt, chunks):
+    encoder = encoder_for(fmt, export_jobs_stmt())
+    out = encoder.begin()
+    for chunk in chunks:
+        out += encoder.encode(chunk)
+    return out + encoder.end()
+
+def test_ndjson_encoder_streams_one_object_per_line():
+    data = _encode("ndjson", [ROWS[:1], ROWS[1:]])
+    lines = [json.loads(line) for line in data.decode().splitlines()]
+    assert [l["id"] for l in lines] == [1, 2]
+    assert lines[0]["company_name"] == "Acme"
+    assert lines[0]["posted_at"] == "2025-01-02T03:04:05"
+    assert lines[1]["location"] is None
+
+def test_csv_encoder_writes_header_once():
+    data = _encode("csv", [ROWS[:1], ROWS[1:]])
+    reader = list(csv.DictReader(io.StringIO(data.decode())))
+    assert len(reader) == 2
+    assert reader[0]["title"] == "AI SEO Lead"
+    assert reader[1]["posted_at"] == ""
+
+def test_parquet_encoder_round_trips():
+    pq = pytest.importorskip("pyarrow.parquet")
+    data = _encode("parquet", [ROWS[:1], ROWS[1:]])
+    table = pq.read_table(io.BytesIO(data))
+    assert table.num_rows == 2
+    assert table.column("title").to_pylist() == ["AI SEO Lead", "Search Engineer"]
+    assert table.column("posted_at").to_pylist()[0] == datetime(2025, 1, 2, 3, 4, 5)
+    # One row group per streamed chunk
+    assert pq.ParquetFile(io.BytesIO(data)).num_row_groups == 2
+
+@pytest.mark.asyncio
+async def test_export_endpoint_streams_filtered_rows(app_client, monkeypatch):
+    seen = {}
+
+    async def fake_stream_rows(stmt, chunk_size):
+        seen["sql"] = str(stmt)
+        yield ROWS[:1]
+        yield ROWS[1:]
+
+    monkeypatch.setattr(export, "stream_rows", fake_stream_rows)
+
+    async with app_client as client:
+        resp = await client.get("/api/export/jobs", params={"format": "csv", "source": "seo_jobs"})
+
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+    assert 'filename="jobs.csv"' in resp.headers["content-disposition"]
+    assert len(resp.text.strip().splitlines()) == 3
+    assert "jobs.source" in seen["sql"]
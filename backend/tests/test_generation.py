@@ -0,0 +1,53 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects import postgresql
+
+from src.core.cache import TTLCache
+from src.db.generation import GENERATION_CHANNEL, GenerationTracker, bump_generation, on_generation_notify
+from src.db import generation as generation_module
+from src.db.listener import PgListener, listener_dsn
+
+@pytest.mark.asyncio
+async def test_bump_generation_notifies_with_new_value():
+    session = AsyncMock()
+    bumped = MagicMock()
+    bumped.scalar_one_or_none.return_value = 7
+    session.execute.side_effect = [bumped, MagicMock()]
+
+    assert await bump_generation(session, reason="test") == 7
+
+    notify = session.execute.call_args_list[1].args[0]
+    sql = str(notify.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    assert "pg_notify" in sql
+    assert GENERATION_CHANNEL in sql and "'7'" in sql
+
+def test_notify_invalidates_caches_and_sets_generation(monkeypatch):
+    tracker = GenerationTracker(poll_seconds=60)
+    monkeypatch.setattr(generation_module, "generation_tracker", tracker)
+    cache = TTLCache(ttl_seconds=60)
+    cache.set("k", "v")
+
+    on_generation_notify("12")
+    assert cache.get("k") is None
+    assert tracker._value == 12
+
+    # After a reconnect the generation must be re-read
+    on_generation_notify(None)
+    assert tracker._value is None and tracker._expires_at == 0.0
+
+def test_listener_dispatch_isolates_handler_errors():
+    listener = PgListener(dsn="postgresql://x")
+    seen = []
+
+    def broken(payload):
+        raise RuntimeError("boom")
+
+    listener.subscribe("chan", broken)
+    listener.subscribe("chan", seen.append)
+    listener.subscribe("chan", seen.append)  # duplicate subscriptions are ignored
+    listener._on_notification(None, 1, "chan", "3")
+    assert seen == ["3"]
+
+def test_listener_dsn_strips_driver():
+    assert listener_dsn("postgresql+asyncpg://u:p@h:5432/db") == "postgresql://u:p@h:5432/db"
@@ -0,0 +1,35 @@
+from src.semantic.keywords import KeywordMatcher
+from src.ingestion.enrich import infer_ai_signal, infer_remote_flag, infer_seniority
+
+def test_matcher_returns_all_features_in_one_pass():
+    m = KeywordMatcher({
+        "remote": ["remote"],
+        "ai": ["ai", "llm"],
+        "agency": ["agency", "seo agency"],
+    })
+    assert m.features("Remote LLM engineer at an SEO Agency") == {"remote", "ai", "agency"}
+    assert m.keywords("Remote LLM engineer at an SEO Agency") == {"remote", "llm", "seo agency"}
+    assert m.features(None) == set()
+
+def test_matcher_is_word_bounded():
+    m = KeywordMatcher({"ai": ["ai"], "region": ["us"], "lead": ["lead"]})
+    assert m.features("Maintain the business backlog") == set()
+    assert m.features("Leadership role") == set()
+    assert m.features("AI engineer (US)") == {"ai", "region"}
+
+def test_longer_keyword_keeps_features_of_contained_keywords():
+    m = KeywordMatcher({
+        "comp_kw": ["media"],
+        "comp_hard": ["media group"],
+    })
+    # "media group" shadows "media" in the alternation but must still signal both
+    assert m.features("Acme Media Group") == {"comp_kw", "comp_hard"}
+
+def test_enrich_inference_avoids_substring_false_positives():
+    assert infer_ai_signal("Maintain our email campaigns") is False
+    assert infer_ai_signal("Build AI-powered search") is True
+    assert infer_remote_flag("Remote role supporting business teams") is None
+    assert infer_remote_flag("Remote (USA)") == "remote"
+    assert infer_seniority("Team leadership experience") is None
+    assert infer_seniority("Sr. SEO Manager") == "senior"
+    assert infer_seniority("VP of Marketing, Head of Growth") == "vp"
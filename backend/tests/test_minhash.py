@@ -0,0 +1,157 @@
+import numpy as np
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.ingestion.minhash import (
+    MinHasher, MinHashIndex, NearDuplicateDetector, minhash_text, signature_bytes, signature_from_bytes,
+)
+from src.ingestion.sources.base import RawJob
+
+BODY = (
+    "We are hiring an AI search lead to own answer engine optimization across ChatGPT, "
+    "Perplexity and Google AI Overviews. You will run experiments on citations, build "
+    "measurement for brand visibility in LLM answers and partner with content and product teams."
+)
+
+def _job(company="Acme", title="AI Search Lead", location="Remote (US)", body=BODY):
+    return RawJob(external_id=None, title=title, company=company, location=location,
+                  url="https://x/1", source="test", description=body)
+
+def test_signature_is_stable_and_estimates_jaccard():
+    hasher = MinHasher(num_perm=128, bands=16)
+    a = hasher.signature(minhash_text("AI Search Lead", BODY))
+    b = hasher.signature(minhash_text("AI Search Lead (Remote)", BODY + " Apply now."))
+    c = hasher.signature(minhash_text("Pastry Chef", "Bake bread and croissants every morning for our cafe."))
+
+    assert a.dtype == np.uint32 and a.shape == (128,)
+    assert np.array_equal(a, MinHasher(num_perm=128, bands=16).signature(minhash_text("AI Search Lead", BODY)))
+    assert hasher.similarity(a, b) > 0.8
+    assert hasher.similarity(a, c) < 0.2
+    assert hasher.signature("") is None
+    assert np.array_equal(signature_from_bytes(signature_bytes(a)), a)
+
+def test_band_keys_collide_for_near_duplicates():
+    hasher = MinHasher(num_perm=128, bands=16)
+    a = hasher.band_keys(hasher.signature(minhash_text("AI Search Lead", BODY)))
+    b = hasher.band_keys(hasher.signature(minhash_text("AI Search Lead (Remote)", BODY + " Apply now.")))
+    assert len(a) == 16 and all(-(2 ** 63) <= bucket < 2 ** 63 for _, bucket in a)
+    assert set(a) & set(b)
+
+def test_index_matches_same_company_only():
+    hasher = MinHasher()
+    index = MinHashIndex(hasher)
+    sig = hasher.signature(minhash_text("AI Search Lead", BODY))
+    index.add("k1", "acme", sig)
+
+    assert index.query("k2", "acme", sig, 0.8).dedupe_key == "k1"
+    assert index.query("k2", "other co", sig, 0.8) is None
+    assert index.query("k1", "acme", sig, 0.8) is None
+
+@pytest.mark.asyncio
+async def test_detector_flags_in_run_repost_before_embedding():
+    # Nothing stored: no band candidates and no row of the job itself
+    no_rows = MagicMock()
+    no_rows.all.return_value = []
+    session = AsyncMock()
+    session.execute.return_value = no_rows
+    factory = MagicMock()
+    factory.return_value.__aenter__ = AsyncMock(return_value=session)
+    factory.return_value.__aexit__ = AsyncMock(return_value=False)
+    detector = NearDuplicateDetector(factory, hasher=MinHasher(), threshold=0.8)
+
+    first = _job()
+    assert await detector.check(first, "k1") is None
+    assert first.minhash is not None
+    detector.accept("k1")
+
+    # Same role on another source: different location string, company suffix
+    repost = _job(company="Acme Inc.", location="United States")
+    dup = await detector.check(repost, "k2")
+    assert dup.dedupe_key == "k1" and dup.job_id is None
+
+    # A different role at the same company is not a duplicate
+    other = _job(title="Pastry Chef", body="Bake bread and croissants every morning for our cafe.")
+    assert await detector.check(other, "k3") is None
+
+@pytest.mark.asyncio
+async def test_detector_matches_stored_jobs_by_band():
+    hasher = MinHasher()
+    stored = hasher.signature(minhash_text("AI Search Lead", BODY))
+    candidates = MagicMock()
+    candidates.all.return_value = [
+        MagicMock(id=42, company_id=7, dedupe_key="stored", minhash=signature_bytes(stored), name_key="acme"),
+    ]
+    session = AsyncMock()
+    session.execute.return_value = candidates
+    factory = MagicMock()
+    factory.return_value.__aenter__ = AsyncMock(return_value=session)
+    factory.return_value.__aexit__ = AsyncMock(return_value=False)
+    detector = NearDuplicateDetector(factory, hasher=hasher, threshold=0.8)
+
+    dup = await detector.check(_job(title="AI Search Lead "), "new-key")
+
+    assert (dup.job_id, dup.company_id, dup.dedupe_key) == (42, 7, "stored")
+    # One round trip: band candidates plus the job's own row, if stored
+    assert session.execute.call_count == 1
+    sql = str(session.execute.call_args.args[0])
+    assert "job_minhash_bands" in sql and "jobs.dedupe_key !=" in sql and "UNION ALL" in sql
+
+def _detector(session):
+    factory = MagicMock()
+    factory.return_value.__aenter__ = AsyncMock(return_value=session)
+    factory.return_value.__aexit__ = AsyncMock(return_value=False)
+    return NearDuplicateDetector(factory, hasher=MinHasher(), threshold=0.8)
+
+@pytest.mark.asyncio
+async def test_detector_never_folds_a_stored_job():
+    # Two stored near-duplicates: re-seeing either must reach the upsert
+    stored = MagicMock()
+    stored.scalars.return_value.all.return_value = ["stored-a", "stored-b"]
+    session = AsyncMock()
+    session.execute.return_value = stored
+    detector = _detector(session)
+
+    # The listing resolves which keys are stored in one query
+    assert await detector.prime(session, ["stored-a", "stored-b", "new"]) == 2
+    assert session.execute.call_count == 1
+    assert session.execute.call_args.args[0].compile().params["keys"] == ["new", "stored-a", "stored-b"]
+
+    assert await detector.check(_job(), "stored-a") is None
+    detector.accept("stored-a")
+    # Not even against a stored twin accepted earlier in the run
+    assert await detector.check(_job(company="Acme Inc.", location="United States"), "stored-b") is None
+    # No lookups per job at all
+    assert session.execute.call_count == 1
+
+@pytest.mark.asyncio
+async def test_detector_learns_unlisted_stored_key_from_band_query():
+    # A key the listing didn't cover: the band query returns its own row
+    own = MagicMock()
+    own.all.return_value = [MagicMock(id=42, company_id=7, dedupe_key="stored-a", minhash=None, name_key="acme")]
+    session = AsyncMock()
+    session.execute.return_value = own
+    detector = _detector(session)
+
+    assert await detector.check(_job(), "stored-a") is None
+    assert await detector.check(_job(), "stored-a") is None
+    assert session.execute.call_count == 1
+
+@pytest.mark.asyncio
+async def test_detector_folds_known_new_key_into_in_run_job_without_query():
+    unstored = MagicMock()
+    unstored.scalars.return_value.all.return_value = []
+    unstored.all.return_value = []
+    session = AsyncMock()
+    session.execute.return_value = unstored
+    detector = _detector(session)
+    await detector.prime(session, ["k1", "k2"])
+
+    assert await detector.check(_job(), "k1") is None
+    detector.accept("k1")
+    # k1's band query went without the own-row lookup
+    assert "UNION" not in str(session.execute.call_args.args[0])
+    calls = session.execute.call_count
+
+    dup = await detector.check(_job(company="Acme Inc.", location="United States"), "k2")
+    assert dup.dedupe_key == "k1"
+    assert session.execute.call_count == calls
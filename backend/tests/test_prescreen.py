@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from src.ingestion.prescreen import prescreen_listings
+from src.ingestion.sources.base import Source, RawJob
+from src.ingestion.upsert import dedupe_key_for, listing_dedupe_key
+
+class FakeClassifier:
+    threshold = 0.35
+
+    def __init__(self, scores):
+        self.scores = scores
+        self.calls = 0
+
+    def score_titles(self, titles):
+        self.calls += 1
+        return np.array([self.scores[t] for t in titles], dtype=np.float32)
+
+def _listing(title):
+    return {"title": title, "company": "Acme Inc.", "location": "Remote", "url": f"https://x/{title}"}
+
+def test_prescreen_drops_clear_misses_and_orders_by_score():
+    clf = FakeClassifier({"Pastry Chef": 0.05, "SEO Manager": 0.30, "Head of AI Search": 0.62, "Search Engineer": 0.41})
+    listings = [_listing(t) for t in clf.scores]
+
+    kept, dropped = prescreen_listings(listings, clf=clf, margin=0.1)
+
+    # One batch; 0.30 is under the threshold but inside the margin, so it is kept
+    assert clf.calls == 1
+    assert [l["title"] for l in kept] == ["Head of AI Search", "Search Engineer", "SEO Manager"]
+    assert [l["title"] for l in dropped] == ["Pastry Chef"]
+    assert kept[0]["title_score"] == pytest.approx(0.62)
+    assert prescreen_listings([], clf=clf) == ([], [])
+
+def test_listing_dedupe_key_matches_raw_job():
+    listing = _listing("SEO Manager")
+    raw = RawJob(external_id=listing["url"], source="test", **listing)
+    assert listing_dedupe_key(listing) == dedupe_key_for(raw)
+
+@pytest.mark.asyncio
+async def test_source_listed_applies_hook():
+    source = Source()
+    listings = [_listing("a"), _listing("b")]
+    assert await source.listed(listings) == listings
+
+    async def keep_last(entries):
+        return entries[-1:]
+
+    source.on_listing = keep_last
+    assert await source.listed(listings) == listings[-1:]
+
+    async def observe(entries):
+        return None
+
+    source.on_listing = observe
+    assert await source.listed(listings) == listings
+
+def test_prescreen_keeps_untitled_listings():
+    clf = FakeClassifier({"Pastry Chef": 0.05, "Search Engineer": 0.41})
+    new_url = {"title": None, "company": None, "location": None, "url": "https://x/new", "changed": True}
+    listings = [_listing("Pastry Chef"), new_url, _listing("Search Engineer")]
+
+    kept, dropped = prescreen_listings(listings, clf=clf, margin=0.1)
+
+    assert [l["url"] for l in kept] == ["https://x/Search Engineer", "https://x/new"]
+    assert [l["title"] for l in dropped] == ["Pastry Chef"]
+    assert prescreen_listings([new_url], clf=clf) == ([new_url], [])
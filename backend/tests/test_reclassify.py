@@ -0,0 +1,49 @@
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from sqlalchemy.dialects import postgresql
+
+from src.semantic.reclassify import (
+    describe_titles, classify_chunk, bulk_update_stmt, company_titles_stmt, ReclassifyChange,
+)
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect()))
+
+def test_describe_titles_adds_tags():
+    text = describe_titles(["Account Manager", "Head of SEO"])
+    assert text.startswith("Hiring for: Account Manager, Head of SEO")
+    assert "Tags: client services agency, strong seo leadership" in text
+    assert describe_titles([]) == ""
+    assert describe_titles(None) == ""
+
+@patch("src.semantic.reclassify.company_classifier")
+def test_classify_chunk_returns_only_changes(mock_clf):
+    mock_clf.classify_many.return_value = ["Competitor", "Client"]
+    rows = [
+        SimpleNamespace(id=1, name="Acme Agency", classification="Client", category="SaaS / Tools", titles=["SEO Manager"]),
+        SimpleNamespace(id=2, name="Widgets", classification="Client", category="SaaS / Tools", titles=None),
+    ]
+    changes = classify_chunk(rows)
+
+    # One batch call for the whole chunk
+    mock_clf.classify_many.assert_called_once()
+    assert len(changes) == 1
+    assert changes[0].id == 1
+    assert changes[0].classification == "Competitor"
+    assert changes[0].category == "Agency / Consultancy"
+
+def test_titles_query_is_windowed_and_resumable():
+    sql = _sql(company_titles_stmt(after_id=42))
+    assert "row_number() OVER (PARTITION BY jobs.company_id" in sql
+    assert "companies.id >" in sql
+    assert "ORDER BY companies.id" in sql
+
+def test_bulk_update_uses_values_list():
+    stmt = bulk_update_stmt([
+        ReclassifyChange(1, "A", None, None, "Client", "SaaS / Tools"),
+        ReclassifyChange(2, "B", None, None, "Competitor", "Agency / Consultancy"),
+    ])
+    sql = _sql(stmt)
+    assert sql.startswith("UPDATE companies SET")
+    assert "FROM (VALUES" in sql
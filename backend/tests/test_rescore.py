@@ -0,0 +1,44 @@
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.semantic.rescore import rescore_chunk
+
+class FakeClassifier:
+    high_conf = 0.5
+    medium_conf = 0.35
+    centroid = np.array([1.0, 0.0], dtype=np.float32)
+
+    def tiers_for_scores(self, scores):
+        return np.where(
+            scores >= self.high_conf, "core_ai_search",
+            np.where(scores >= self.medium_conf, "related_search_or_seo", "out_of_scope"),
+        )
+
+def _row(id, embedding, tier, score=None, company_id=1):
+    return SimpleNamespace(id=id, company_id=company_id, embedding=embedding, role_tier=tier, relevance_score=score)
+
+def test_rescore_chunk_writes_only_tier_changes():
+    rows = [
+        _row(1, [0.9, 0.1], "core_ai_search", 0.9),       # unchanged
+        _row(2, [0.4, 0.6], "core_ai_search", 0.6),       # demoted to related
+        _row(3, [0.1, 0.9], "related_search_or_seo", 0.4, company_id=7),  # demoted to out_of_scope
+    ]
+    updates, transitions, company_ids = rescore_chunk(FakeClassifier(), rows)
+
+    assert [u[0] for u in updates] == [2, 3]
+    assert updates[0][2] == "related_search_or_seo" and updates[0][3] is True
+    assert updates[1][2] == "out_of_scope" and updates[1][3] is False
+    assert transitions == {
+        ("core_ai_search", "related_search_or_seo"): 1,
+        ("related_search_or_seo", "out_of_scope"): 1,
+    }
+    # Only job 3 left AI-search scope, so only its company needs new aggregates
+    assert company_ids == {7}
+
+def test_rescore_chunk_update_scores_includes_score_moves():
+    rows = [_row(1, [0.9, 0.1], "core_ai_search", 0.7)]
+    updates, transitions, _ = rescore_chunk(FakeClassifier(), rows, update_scores=True)
+    assert len(updates) == 1
+    assert abs(updates[0][1] - 0.9) < 1e-6
+    assert not transitions
@@ -0,0 +1,64 @@
+import pytest
+from unittest.mock import MagicMock
+
+from src.api import search
+from src.api.search import rrf_fuse, rerank
+
+def test_rrf_rewards_agreement_between_lists():
+    scores = rrf_fuse([1, 2, 3], [3, 4, 1], k=60)
+    # 1 and 3 appear in both lists and beat single-list hits
+    order = rerank(scores, {})
+    assert set(order[:2]) == {1, 3}
+    assert scores[1] == pytest.approx(1 / 61 + 1 / 63)
+    assert scores[4] == pytest.approx(1 / 62)
+
+def test_relevance_weight_reorders_close_scores():
+    scores = rrf_fuse([1, 2], [2, 1], k=60)  # tie
+    relevance = {1: 0.2, 2: 0.9}
+    assert rerank(scores, relevance, relevance_weight=0.0) == [2, 1]  # tie broken by id
+    assert rerank(scores, relevance, relevance_weight=0.5)[0] == 2
+    relevance = {1: 0.9, 2: 0.2}
+    assert rerank(scores, relevance, relevance_weight=0.5)[0] == 1
+
+@pytest.mark.asyncio
+async def test_hybrid_search_fuses_both_candidate_lists(monkeypatch):
+    def rows(*pairs):
+        return [MagicMock(id=i, relevance_score=r) for i, r in pairs]
+
+    async def fake_text(q, filters, n):
+        return rows((10, 0.6), (11, 0.5))
+
+    async def fake_vector(q, filters, n):
+        return rows((12, 0.9), (10, 0.6))
+
+    monkeypatch.setattr(search, "text_candidates", fake_text)
+    monkeypatch.setattr(search, "vector_candidates", fake_vector)
+
+    ids = await search.hybrid_search("aeo lead", filters=None, limit=2)
+    assert ids[0] == 10
+    assert len(ids) == 2
+
+@pytest.mark.asyncio
+async def test_hybrid_mode_endpoint_keeps_fused_order(app_client, mock_session, monkeypatch):
+    from src.api.routers import jobs as jobs_router
+
+    async def fake_hybrid(q, filters, limit, relevance_weight):
+        assert relevance_weight == 0.3
+        return [5, 2]
+
+    monkeypatch.setattr(jobs_router, "hybrid_search", fake_hybrid)
+    mock_result = MagicMock()
+    mock_result.mappings.return_value.all.return_value = [
+        {"id": i, "title": f"Job {i}", "company_name": "Co", "location": None, "posted_at": None,
+         "url": None, "relevance_score": 0.5, "source": "test", "is_ai_search": True,
+         "role_tier": "core_ai_search", "remote_flag": None, "employment_type": None,
+         "seniority": None, "ai_forward": None, "opp_athena_view": None, "opp_role_type": None,
+         "opp_confidence": None}
+        for i in (2, 5)
+    ]
+    mock_session.execute.return_value = mock_result
+
+    async with app_client as client:
+        resp = await client.get("/api/jobs/", params={"q": "aeo", "mode": "hybrid", "relevance_weight": 0.3})
+    assert resp.status_code == 200
+    assert [j["id"] for j in resp.json()] == [5, 2]
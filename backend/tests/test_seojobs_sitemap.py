@@ -0,0 +1,164 @@
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+import pytest
+from selectolax.lexbor import LexborHTMLParser
+
+from src.ingestion.crawl_state import CrawlEntry
+from src.ingestion.sources.base import Source
+from src.ingestion.sources.seojobs import SEOJobsSource, parse_job_posting, parse_lastmod
+
+FIXTURES = Path(__file__).parent / "fixtures" / "seojobs"
+
+ACME = "https://seojobs.com/job/head-of-ai-search-acme/"
+GLOBEX = "https://seojobs.com/job/seo-manager-globex/"
+INITECH = "https://seojobs.com/job/search-engineer-initech/"
+
+class FakeState:
+    def __init__(self, entries=()):
+        self.entries = {e.url: e for e in entries}
+        self.saved = []
+
+    async def load(self, source):
+        return dict(self.entries)
+
+    async def save(self, source, entries):
+        self.saved.extend(entries)
+
+def replay(requests, broken=()):
+    """Serves the recorded seojobs.com responses; anything else is a 404."""
+    def handler(request: httpx.Request):
+        requests.append(str(request.url))
+        name = request.url.path.strip("/").rsplit("/", 1)[-1]
+        if name in broken:
+            return httpx.Response(503)
+        if name.endswith(".xml.gz"):
+            # Served as a file, not Content-Encoding: the source must gunzip it
+            return httpx.Response(200, content=(FIXTURES / name).read_bytes(), headers={"Content-Type": "application/x-gzip"})
+        for candidate in (name, f"{name}.html"):
+            path = FIXTURES / candidate
+            if candidate and path.exists():
+                return httpx.Response(200, content=path.read_bytes())
+        return httpx.Response(404)
+    return httpx.MockTransport(handler)
+
+async def _run(source):
+    return [job async for job in source.fetch()]
+
+def test_parse_lastmod_normalizes_to_naive_utc():
+    assert parse_lastmod("2026-03-01T09:00:00+01:00") == datetime(2026, 3, 1, 8, 0)
+    assert parse_lastmod("2026-02-10") == datetime(2026, 2, 10)
+    assert parse_lastmod("not a date") is None
+    assert parse_lastmod(None) is None
+
+def test_parse_job_posting_reads_json_ld():
+    posting = parse_job_posting(LexborHTMLParser((FIXTURES / "seo-manager-globex.html").read_text()))
+    assert posting["title"] == "Senior SEO Manager"
+    assert posting["company"] == "Globex"
+    assert posting["location"] == "Austin, TX, US"
+    assert posting["posted_at"] == "2026-02-28"
+
+    posting = parse_job_posting(LexborHTMLParser((FIXTURES / "head-of-ai-search-acme.html").read_text()))
+    assert (posting["company"], posting["location"]) == ("Acme Inc.", "Remote")
+    assert parse_job_posting(LexborHTMLParser("<html><body>nothing</body></html>")) is None
+
+@pytest.mark.asyncio
+async def test_first_sitemap_crawl_fetches_every_job_page():
+    requests = []
+    state = FakeState()
+    source = SEOJobsSource(discovery="sitemap", transport=replay(requests), state=state, delay=(0, 0))
+
+    jobs = await _run(source)
+
+    # Non-job pages are filtered out; the 404 job page yields nothing
+    assert sorted((j.title, j.company, j.location) for j in jobs) == [
+        ("Head of AI Search", "Acme Inc.", "Remote"),
+        ("Senior SEO Manager", "Globex", "Austin, TX, US"),
+    ]
+    assert not any(u in requests for u in ("https://seojobs.com/", "https://seojobs.com/about/"))
+    assert INITECH in requests
+    assert source.complete_listing is True
+
+    # Nothing is remembered until the pipeline commits the jobs
+    assert state.saved == []
+    await source.commit(jobs)
+
+    # Only pages that were parsed are remembered, with the sitemap's lastmod
+    saved = {e.url: e for e in state.saved}
+    assert set(saved) == {ACME, GLOBEX}
+    assert saved[GLOBEX].lastmod == datetime(2026, 3, 1, 8, 0)
+    assert saved[GLOBEX].title == "Senior SEO Manager"
+
+@pytest.mark.asyncio
+async def test_sitemap_crawl_skips_pages_with_unchanged_lastmod():
+    requests = []
+    state = FakeState([
+        CrawlEntry(ACME, datetime(2026, 3, 5, 10, 30), "Head of AI Search", "Acme Inc.", "Remote"),
+        CrawlEntry(GLOBEX, datetime(2026, 2, 1), "SEO Manager", "Globex", "Austin, TX, US"),
+    ])
+    source = SEOJobsSource(discovery="sitemap", transport=replay(requests), state=state, delay=(0, 0))
+    listed = []
+
+    async def on_listing(listings):
+        listed.extend(listings)
+        return None
+
+    source.on_listing = on_listing
+    jobs = await _run(source)
+
+    # Unchanged page: listed with its stored identity, never fetched
+    by_url = {l["url"]: l for l in listed}
+    assert by_url[ACME]["changed"] is False
+    assert by_url[ACME]["title"] == "Head of AI Search"
+    assert ACME not in requests
+    # Newer lastmod and unknown URL are fetched
+    assert by_url[GLOBEX]["changed"] is True
+    assert by_url[INITECH] == {**by_url[INITECH], "changed": True, "title": None}
+    assert GLOBEX in requests and INITECH in requests
+    assert [j.title for j in jobs] == ["Senior SEO Manager"]
+
+    # A job whose upsert failed is left out of the commit: refetched next run
+    await source.commit([])
+    assert state.saved == []
+    await source.commit(jobs)
+    assert [e.url for e in state.saved] == [GLOBEX]
+
+@pytest.mark.asyncio
+async def test_unreadable_child_sitemap_makes_listing_incomplete():
+    requests = []
+    source = SEOJobsSource(
+        discovery="sitemap", transport=replay(requests, broken={"job-sitemap.xml.gz"}), state=FakeState(), delay=(0, 0)
+    )
+    assert await _run(source) == []
+    assert source.complete_listing is False
+
+    source = SEOJobsSource(
+        discovery="sitemap", transport=replay([], broken={"sitemap_index.xml"}), state=FakeState(), delay=(0, 0)
+    )
+    with pytest.raises(httpx.HTTPStatusError):
+        await _run(source)
+
+@pytest.mark.asyncio
+async def test_folded_page_is_refetched_to_keep_its_job_listed(ingest):
+    # Run N folds Globex's page into a stored job; run N+1 must mark that job
+    # seen again, so the page can't be recorded as crawled
+    state = FakeState()
+    for _ in range(2):
+        requests = []
+        source = SEOJobsSource(discovery="sitemap", transport=replay(requests), state=state, delay=(0, 0))
+        seen = await ingest([source], duplicates={GLOBEX: "kept-key"})
+
+        assert GLOBEX in requests
+        assert "kept-key" in seen["seojobs"]
+        assert GLOBEX not in {e.url for e in state.saved}
+        state = FakeState(state.saved)
+    # Acme was committed in run N, so run N+1 didn't fetch it again
+    assert ACME not in requests
+
+def test_listing_discovery_is_not_a_complete_listing():
+    # Sweeping is opt-in per source
+    assert Source.complete_listing is False
+    assert SEOJobsSource(discovery="listing").complete_listing is False
+    with pytest.raises(ValueError):
+        SEOJobsSource(discovery="rss")
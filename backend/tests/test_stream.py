@@ -0,0 +1,116 @@
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.api.stream import JobBroadcaster, KEEPALIVE, format_event
+
+def _parse(chunk: bytes) -> tuple[str, dict]:
+    lines = dict(line.split(": ", 1) for line in chunk.decode().strip().split("\n"))
+    return lines["id"], json.loads(lines["data"])
+
+def test_replay_after_last_event_id():
+    b = JobBroadcaster(replay_size=3, queue_size=10, epoch="boot1")
+    for i in range(5):
+        b.publish(json.dumps({"id": i}).encode())
+
+    _, backlog = b.subscribe(last_event_id="boot1-3")
+    assert [seq for seq, _ in backlog] == [4, 5]
+
+    # Older than the buffer: best effort, everything still buffered
+    _, backlog = b.subscribe(last_event_id="boot1-0")
+    assert [seq for seq, _ in backlog] == [3, 4, 5]
+
+    # Id from another worker / before a restart: nothing to replay, even when
+    # its sequence number happens to be in range here
+    for other in ("boot1-99", "boot2-3", "3", "garbage", ""):
+        _, backlog = b.subscribe(last_event_id=other)
+        assert backlog == []
+
+def test_event_ids_differ_per_broadcaster():
+    a, b = JobBroadcaster(), JobBroadcaster()
+    assert a.epoch != b.epoch
+    a.publish(b"{}")
+    b.publish(b"{}")
+    assert b.parse_event_id(a.event_id(1)) is None
+    assert b.parse_event_id(b.event_id(1)) == 1
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_is_dropped():
+    b = JobBroadcaster(queue_size=2)
+    slow, _ = b.subscribe()
+    fast, _ = b.subscribe()
+    b.publish(b"1")
+    b.publish(b"2")
+    fast.get_nowait()
+    fast.get_nowait()
+    b.publish(b"3")
+
+    assert b.subscriber_count == 1
+    assert slow.get_nowait() is None  # close sentinel
+    assert fast.get_nowait() == (3, b"3")
+
+@pytest.mark.asyncio
+async def test_events_stream_backlog_then_live():
+    b = JobBroadcaster(queue_size=10, epoch="e")
+    b.publish(b'{"id": 1}')
+    connected = [False, False, False, True]
+
+    async def is_disconnected():
+        return connected.pop(0)
+
+    received = []
+    async def consume():
+        async for chunk in b.events(is_disconnected, last_event_id="e-0", keepalive_seconds=0.05):
+            received.append(chunk)
+
+    task = asyncio.create_task(consume())
+    await asyncio.sleep(0)
+    b.publish(b'{"id": 2}')
+    await asyncio.wait_for(task, timeout=1)
+
+    assert _parse(received[0]) == ("e-1", {"id": 1})
+    assert _parse(received[1]) == ("e-2", {"id": 2})
+    assert KEEPALIVE in received
+    assert b.subscriber_count == 0
+
+@pytest.mark.asyncio
+async def test_notifications_are_batched_into_one_query():
+    b = JobBroadcaster(batch_seconds=0)
+    queue, _ = b.subscribe()
+
+    result = MagicMock()
+    result.mappings.return_value.all.return_value = [
+        {"id": i, "title": f"Job {i}", "company_name": "Co", "location": None, "posted_at": None,
+         "url": None, "relevance_score": 0.9, "source": "test", "is_ai_search": True,
+         "role_tier": "core_ai_search", "remote_flag": None, "employment_type": None,
+         "seniority": None, "ai_forward": None, "opp_athena_view": None, "opp_role_type": None,
+         "opp_confidence": None}
+        for i in (5, 6)
+    ]
+    session = AsyncMock()
+    session.execute.return_value = result
+    session_cm = MagicMock()
+    session_cm.__aenter__ = AsyncMock(return_value=session)
+    session_cm.__aexit__ = AsyncMock(return_value=False)
+
+    with patch("src.api.stream.AsyncSessionLocal", return_value=session_cm):
+        b.on_notify("5")
+        b.on_notify("6")
+        b.on_notify(None)  # reconnect marker is ignored
+        await b._flush_task
+
+    assert session.execute.call_count == 1
+    first = queue.get_nowait()
+    assert first[0] == 1 and json.loads(first[1])["id"] == 5
+    assert json.loads(queue.get_nowait()[1])["title"] == "Job 6"
+
+def test_format_event():
+    assert format_event("e-7", b"{}") == b"id: e-7\nevent: job\ndata: {}\n\n"
+
+def test_notify_many_is_one_statement():
+    from sqlalchemy.dialects import postgresql
+    from src.db.listener import JOBS_CHANNEL, notify_many_stmt
+
+    sql = str(notify_many_stmt(JOBS_CHANNEL, ["5", "6"]).compile(dialect=postgresql.dialect()))
+    assert "pg_notify" in sql and "unnest" in sql and "p(value)" in sql
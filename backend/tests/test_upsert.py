@@ -2,8 +2,11 @@ import pytest
 from unittest.mock import MagicMock, AsyncMock, patch
 from datetime import datetime
 from src.ingestion.sources.base import RawJob
-from src.ingestion.upsert import upsert_raw_job
+from src.ingestion.upsert import upsert_raw_job, content_fingerprint
+from src.ingestion.run import IngestRun
+from src.ingestion.company_cache import CachedCompany, CompanyCache
 from src.db.models import Job, Company
+from src.ingestion.descriptions import description_hash
 
 @pytest.mark.asyncio
 @patch("src.ingestion.upsert.classifier")
@@ -11,8 +14,8 @@ from src.db.models import Job, Company
 @patch("src.ingestion.upsert.company_classifier")
 async def test_upsert_update_description(mock_company_clf, mock_opp_clf, mock_classifier):
     # Setup mocks
-    mock_classifier.score.return_value = 0.9
-    mock_classifier.tier.return_value = "Core AI Search"
+    mock_classifier.score_vector.return_value = 0.9
+    mock_classifier.tier_for_score.return_value = "Core AI Search"
     mock_opp_clf.return_value = None # No opportunity -> No OPP_META
     mock_company_clf.classify.return_value = "Client"
     
@@ -20,8 +23,8 @@ async def test_upsert_update_description(mock_company_clf, mock_opp_clf, mock_cl
     
     # Mock Company check (return existing company)
     mock_company = Company(id=1, name="Test Co", classification="Client")
-    # First execute is for Company inquiry
-    # Second execute is for Job inquiry
+    # First execute is for Job inquiry (fingerprint check)
+    # Second execute is for Company inquiry
     
     # We need to control the return values of session.execute
     # Result of simple scalars().first()
@@ -30,11 +33,11 @@ async def test_upsert_update_description(mock_company_clf, mock_opp_clf, mock_cl
     mock_result_company.scalars.return_value.first.return_value = mock_company
     
     # Existing job with old description
-    existing_job = Job(description="Old Description", dedupe_key="fake-key")
+    existing_job = Job(description_hash=description_hash("Old Description"), dedupe_key="fake-key")
     mock_result_job = MagicMock()
     mock_result_job.scalars.return_value.first.return_value = existing_job
     
-    session.execute.side_effect = [mock_result_company, mock_result_job]
+    session.execute.side_effect = [mock_result_job, mock_result_company] + [MagicMock() for _ in range(3)]
     
     # Input
     raw = RawJob(
@@ -50,8 +53,10 @@ async def test_upsert_update_description(mock_company_clf, mock_opp_clf, mock_cl
     # Action
     await upsert_raw_job(session, raw)
     
-    # Assert
-    assert existing_job.description == "New Description"
+    # Assert: the new body is stored and the job points at it
+    assert existing_job.description_hash == description_hash("New Description")
+    stored = session.execute.call_args_list[2].args[0]
+    assert stored.table.name == "job_descriptions"
     assert session.commit.called
 
 @pytest.mark.asyncio
@@ -59,8 +64,8 @@ async def test_upsert_update_description(mock_company_clf, mock_opp_clf, mock_cl
 @patch("src.ingestion.upsert.classify_opportunity_async")
 @patch("src.ingestion.upsert.company_classifier")
 async def test_upsert_no_update_if_same(mock_company_clf, mock_opp_clf, mock_classifier):
-    mock_classifier.score.return_value = 0.9
-    mock_classifier.tier.return_value = "Core AI Search"
+    mock_classifier.score_vector.return_value = 0.9
+    mock_classifier.tier_for_score.return_value = "Core AI Search"
     mock_opp_clf.return_value = None
     mock_company_clf.classify.return_value = "Client"
     # Setup
@@ -70,15 +75,12 @@ async def test_upsert_no_update_if_same(mock_company_clf, mock_opp_clf, mock_cla
     mock_result_company = MagicMock()
     mock_result_company.scalars.return_value.first.return_value = mock_company
     
-    existing_job = Job(description="Same Description", dedupe_key="fake-key")
-    # Make sure we can track assignment. Actually in Python if we assign, the obj changes.
-    # We can wrap description in a property mock if we really strictly want to check assignment count,
-    # but checking value is enough.
+    existing_job = Job(description_hash=description_hash("Same Description"), dedupe_key="fake-key")
     
     mock_result_job = MagicMock()
     mock_result_job.scalars.return_value.first.return_value = existing_job
     
-    session.execute.side_effect = [mock_result_company, mock_result_job]
+    session.execute.side_effect = [mock_result_job, mock_result_company] + [MagicMock() for _ in range(3)]
     
     # Input
     raw = RawJob(
@@ -94,20 +96,20 @@ async def test_upsert_no_update_if_same(mock_company_clf, mock_opp_clf, mock_cla
     # Action
     await upsert_raw_job(session, raw)
     
-    # Assert
-    assert existing_job.description == "Same Description"
-    # To be sure it wasn't re-assigned, we'd need to mock the attribute, but logic is verified 
-    # if we verify the previous test DID update it.
-    
+    # Assert: unchanged body -> no description write
+    assert existing_job.description_hash == description_hash("Same Description")
+    for call in session.execute.call_args_list:
+        assert getattr(getattr(call.args[0], "table", None), "name", None) != "job_descriptions"
+
     assert session.commit.called
 
 @pytest.mark.asyncio
 @patch("src.ingestion.upsert.classifier")
 @patch("src.ingestion.upsert.company_classifier")
 @patch("src.ingestion.upsert.classify_opportunity_async", new_callable=AsyncMock)
-async def test_upsert_appends_opp_meta(mock_opp_clf, mock_company_clf, mock_classifier):
-    mock_classifier.score.return_value = 0.9
-    mock_classifier.tier.return_value = "Core AI Search"
+async def test_upsert_keeps_opp_meta_out_of_description(mock_opp_clf, mock_company_clf, mock_classifier):
+    mock_classifier.score_vector.return_value = 0.9
+    mock_classifier.tier_for_score.return_value = "Core AI Search"
     from src.semantic.opportunity_classifier import OpportunityClassification
     
     mock_company_clf.classify.return_value = "Client"
@@ -126,11 +128,11 @@ async def test_upsert_appends_opp_meta(mock_opp_clf, mock_company_clf, mock_clas
     mock_result_company = MagicMock()
     mock_result_company.scalars.return_value.first.return_value = mock_company
 
-    existing_job = Job(description="Original Description", dedupe_key="fake-key")
+    existing_job = Job(description_hash=description_hash("Original Description"), dedupe_key="fake-key")
     mock_result_job = MagicMock()
     mock_result_job.scalars.return_value.first.return_value = existing_job
 
-    session.execute.side_effect = [mock_result_company, mock_result_job]
+    session.execute.side_effect = [mock_result_job, mock_result_company] + [MagicMock() for _ in range(3)]
 
     raw = RawJob(
         external_id="123",
@@ -144,5 +146,287 @@ async def test_upsert_appends_opp_meta(mock_opp_clf, mock_company_clf, mock_clas
 
     await upsert_raw_job(session, raw)
 
-    assert "OPP_META:" in existing_job.description
-    assert "athena_view=Client" in existing_job.description
+    # Opportunity metadata lives in the structured columns only
+    assert raw.description == "Original Description"
+    assert existing_job.description_hash == description_hash("Original Description")
+    assert existing_job.opp_athena_view == "Client"
+    assert existing_job.opp_role_type == "BrandBuyer"
+    assert existing_job.opp_confidence == 0.9
+
+@pytest.mark.asyncio
+@patch("src.ingestion.upsert.classifier")
+@patch("src.ingestion.upsert.classify_opportunity_async", new_callable=AsyncMock)
+@patch("src.ingestion.upsert.company_classifier")
+async def test_upsert_skips_unchanged_job(mock_company_clf, mock_opp_clf, mock_classifier):
+    raw = RawJob(
+        external_id="123",
+        company="Test Co",
+        title="AI Search Engineer",
+        location="Remote",
+        url="http://example.com/job",
+        source="test",
+        description="Same Description"
+    )
+    existing_job = Job(
+        id=7,
+        company_id=1,
+        dedupe_key="fake-key",
+        description_hash=description_hash("Same Description"),
+        content_hash=content_fingerprint(raw, "Test", description_hash("Same Description")),
+    )
+    mock_result_job = MagicMock()
+    mock_result_job.scalars.return_value.first.return_value = existing_job
+
+    session = AsyncMock()
+    session.execute.side_effect = [mock_result_job]
+    run = IngestRun()
+
+    status = await upsert_raw_job(session, raw, run=run)
+
+    # Only the fingerprint lookup ran; the touch is deferred to the run
+    assert status == "unchanged"
+    assert session.execute.call_count == 1
+    assert not session.commit.called
+    assert run.unchanged_job_ids == {7}
+    assert run.company_ids == {1}
+    mock_opp_clf.assert_not_called()
+    mock_classifier.embed.assert_not_called()
+
+@pytest.mark.asyncio
+@patch("src.ingestion.upsert.classifier")
+@patch("src.ingestion.upsert.classify_opportunity_async", new_callable=AsyncMock)
+@patch("src.ingestion.upsert.company_classifier")
+async def test_upsert_changed_fingerprint_updates(mock_company_clf, mock_opp_clf, mock_classifier):
+    mock_classifier.score_vector.return_value = 0.9
+    mock_classifier.tier_for_score.return_value = "Core AI Search"
+    mock_opp_clf.return_value = None
+    mock_company_clf.classify.return_value = "Client"
+
+    raw = RawJob(
+        external_id="123",
+        company="Test Co",
+        title="AI Search Engineer",
+        location="Remote",
+        url="http://example.com/job",
+        source="test",
+        description="Same Description",
+        seniority="Senior",
+    )
+    stale = content_fingerprint(raw.model_copy(update={"seniority": None}), "Test", description_hash("Same Description"))
+    existing_job = Job(id=7, dedupe_key="fake-key", description_hash=description_hash("Same Description"), content_hash=stale)
+    mock_result_job = MagicMock()
+    mock_result_job.scalars.return_value.first.return_value = existing_job
+    company = Company(id=1, name="Test Co", classification="Client")
+    mock_result_company = MagicMock()
+    mock_result_company.scalars.return_value.first.return_value = company
+
+    session = AsyncMock()
+    session.execute.side_effect = [mock_result_job, mock_result_company] + [MagicMock() for _ in range(3)]
+    run = IngestRun()
+
+    status = await upsert_raw_job(session, raw, run=run)
+
+    assert status == "updated"
+    assert existing_job.seniority == "Senior"
+    assert existing_job.content_hash == content_fingerprint(raw, "Test", description_hash("Same Description"))
+    assert not run.unchanged_job_ids
+    # last_seen is buffered on the run instead of written on the company row
+    assert run.company_ids == {1} and run.changed_company_ids == {1}
+    assert company.last_seen is None
+
+@pytest.mark.asyncio
+async def test_ingest_run_flush_is_set_based():
+    session = AsyncMock()
+    run = IngestRun()
+    for job_id, company_id in ((3, 20), (1, 10), (2, 10), (3, 20)):
+        run.touch(job_id, company_id)
+    run.touch_company(30, changed=True)
+
+    assert await run.flush(session) == 3
+
+    # One UPDATE for jobs and one for companies, whatever the count
+    assert session.execute.call_count == 2
+    jobs_stmt, params = session.execute.call_args_list[0].args
+    assert jobs_stmt.table.name == "jobs"
+    assert params == {"ids": [1, 2, 3]}
+    companies_stmt, params = session.execute.call_args_list[1].args
+    assert companies_stmt.table.name == "companies"
+    assert params == {"ids": [10, 20, 30]}
+    assert not run.unchanged_job_ids and not run.company_ids
+    assert run.changed_company_ids == {30}
+    assert await run.flush(session) == 0
+
+def _rowcount(n):
+    result = MagicMock()
+    result.rowcount = n
+    return result
+
+@pytest.mark.asyncio
+async def test_finish_source_marks_and_sweeps_set_based():
+    session = AsyncMock()
+    session.execute.side_effect = [MagicMock(), _rowcount(3), _rowcount(2), MagicMock()]
+    run = IngestRun()
+    for key in ("a", "b", "c", "a"):
+        run.see("seo_jobs", key)
+    run.see("other", "z")
+
+    stats = await run.finish_source(session, "seo_jobs", sweep=True)
+
+    # stage, mark, sweep, clear: the same four statements for any listing size
+    assert stats == {"seen": 3, "marked": 3, "closed": 2}
+    stage, mark, sweep, clear = [c.args[0] for c in session.execute.call_args_list]
+    assert stage.table.name == "ingest_seen_keys"
+    assert stage.compile().params["keys"] == ["a", "b", "c"]
+    assert "FROM ingest_seen_keys" in str(mark)
+    assert "jobs.closed_at IS NULL" in str(sweep)
+    assert clear.table.name == "ingest_seen_keys"
+    assert session.commit.called
+    assert "seo_jobs" not in run.seen and "other" in run.seen
+
+@pytest.mark.asyncio
+async def test_finish_source_without_sweep_only_marks():
+    session = AsyncMock()
+    session.execute.side_effect = [MagicMock(), _rowcount(1), MagicMock()]
+    run = IngestRun()
+    run.see("linkedin", "a")
+
+    stats = await run.finish_source(session, "linkedin", sweep=False)
+
+    assert stats["closed"] == 0
+    assert session.execute.call_count == 3
+
+@pytest.mark.asyncio
+async def test_finish_source_never_sweeps_an_empty_listing():
+    session = AsyncMock()
+    run = IngestRun()
+
+    stats = await run.finish_source(session, "seo_jobs", sweep=True)
+
+    assert stats == {"seen": 0, "marked": 0, "closed": 0}
+    session.execute.assert_not_called()
+
+@pytest.mark.asyncio
+@patch("src.ingestion.upsert.classifier")
+@patch("src.ingestion.upsert.classify_opportunity_async", new_callable=AsyncMock)
+@patch("src.ingestion.upsert.company_classifier")
+async def test_upsert_resolves_company_from_run_cache(mock_company_clf, mock_opp_clf, mock_classifier):
+    mock_classifier.score_vector.return_value = 0.9
+    mock_classifier.tier_for_score.return_value = "Core AI Search"
+    mock_opp_clf.return_value = None
+    mock_company_clf.classify.return_value = "Client"
+
+    run = IngestRun()
+    run.companies.put(CachedCompany(5, "Test", "test co", "Client", None, "SaaS / Tools"))
+
+    no_job = MagicMock()
+    no_job.scalars.return_value.first.return_value = None
+    session = AsyncMock()
+    session.add = MagicMock()
+    session.execute.side_effect = [no_job] + [MagicMock() for _ in range(4)]
+
+    raw = RawJob(
+        external_id="1", company="Test Co", title="AI Search Engineer", location="Remote",
+        url="http://example.com/job", source="test", description="Body",
+    )
+    assert await upsert_raw_job(session, raw, run=run) == "inserted"
+
+    # No companies lookup: the job row points at the cached id
+    for call in session.execute.call_args_list:
+        assert not str(call.args[0]).startswith("SELECT companies.id")
+    session.get.assert_not_called()
+    new_job = session.add.call_args.args[0]
+    assert new_job.company_id == 5
+    assert run.companies.hits == 1
+
+@pytest.mark.asyncio
+@patch("src.ingestion.upsert.classifier")
+@patch("src.ingestion.upsert.classify_opportunity_async", new_callable=AsyncMock)
+@patch("src.ingestion.upsert.company_classifier")
+async def test_upsert_caches_company_only_after_commit(mock_company_clf, mock_opp_clf, mock_classifier):
+    mock_classifier.score_vector.return_value = 0.9
+    mock_classifier.tier_for_score.return_value = "Core AI Search"
+    mock_opp_clf.return_value = None
+    mock_company_clf.classify.return_value = "Client"
+
+    no_row = MagicMock()
+    no_row.scalars.return_value.first.return_value = None
+    session = AsyncMock()
+    session.add = MagicMock()
+    session.execute.side_effect = [no_row, no_row] + [MagicMock() for _ in range(4)]
+    session.commit.side_effect = RuntimeError("connection lost")
+    run = IngestRun()
+    raw = RawJob(
+        external_id="1", company="Test Co", title="AI Search Engineer", location="Remote",
+        url="http://example.com/job", source="test", description="Body",
+    )
+
+    # The new company was rolled back with the job: it must not be reused
+    with pytest.raises(RuntimeError):
+        await upsert_raw_job(session, raw, run=run)
+    assert "test co" not in run.companies
+
+    # A cached company whose row is gone is dropped by the failing job
+    run.companies.put(CachedCompany(5, "Test", "test co", None, None, None))
+    session.execute.side_effect = [no_row] + [MagicMock() for _ in range(4)]
+    session.get.return_value = None
+    session.commit.side_effect = None
+    with pytest.raises(AttributeError):
+        await upsert_raw_job(session, raw, run=run)
+    assert "test co" not in run.companies
+
+@pytest.mark.asyncio
+async def test_company_cache_primes_in_one_query_and_evicts_lru():
+    cache = CompanyCache(maxsize=2)
+    rows = MagicMock()
+    rows.all.return_value = [
+        MagicMock(id=1, name_key="acme", classification="Client", industry=None, category=None),
+        MagicMock(id=2, name_key="beta", classification=None, industry=None, category=None),
+    ]
+    rows.all.return_value[0].name = "Acme"
+    rows.all.return_value[1].name = "Beta"
+    session = AsyncMock()
+    session.execute.return_value = rows
+
+    assert await cache.prime(session, ["acme", "beta", "acme", "gamma", ""]) == 2
+    assert session.execute.call_count == 1
+    assert session.execute.call_args.args[0].compile().params["keys"] == ["acme", "beta", "gamma"]
+
+    # Already cached keys are not looked up again
+    assert await cache.prime(session, ["acme"]) == 0
+    assert session.execute.call_count == 1
+
+    cache.get("acme")
+    cache.put(CachedCompany(3, "Gamma", "gamma", None, None, None))
+    assert "acme" in cache and "gamma" in cache and "beta" not in cache
+
+@pytest.mark.asyncio
+@patch("src.ingestion.upsert.classifier")
+@patch("src.ingestion.upsert.classify_opportunity_async", new_callable=AsyncMock)
+@patch("src.ingestion.upsert.company_classifier")
+async def test_upsert_writes_minhash_bands_with_new_job(mock_company_clf, mock_opp_clf, mock_classifier):
+    from src.ingestion.minhash import minhasher
+
+    mock_classifier.score_vector.return_value = 0.1
+    mock_classifier.tier_for_score.return_value = "out_of_scope"
+    mock_opp_clf.return_value = None
+
+    run = IngestRun()
+    run.companies.put(CachedCompany(5, "Test", "test co", "Client", None, "SaaS / Tools"))
+    no_job = MagicMock()
+    no_job.scalars.return_value.first.return_value = None
+    session = AsyncMock()
+    session.add = MagicMock()
+    session.execute.side_effect = [no_job] + [MagicMock() for _ in range(3)]
+
+    signature = minhasher.signature("ai search lead")
+    raw = RawJob(
+        external_id="1", company="Test Co", title="AI Search Lead", location=None,
+        url="http://example.com/job", source="test", description="Body", minhash=signature.tolist(),
+    )
+    await upsert_raw_job(session, raw, run=run)
+
+    new_job = session.add.call_args.args[0]
+    assert new_job.minhash == signature.tobytes()
+    bands = session.execute.call_args_list[-1].args[0]
+    assert bands.table.name == "job_minhash_bands"
+    assert len(bands.compile().params) == 3 * minhasher.bands
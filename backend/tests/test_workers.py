@@ -0,0 +1,54 @@
+import asyncio
+import pytest
+
+from src.ingestion import workers as workers_mod
+from src.ingestion.workers import UpsertWorkers, partition_for
+from src.ingestion.sources.base import RawJob
+
+def _job(company, n):
+    return RawJob(external_id=str(n), title=f"Job {n}", company=company, location=None, url=f"https://x/{n}", source="test")
+
+def test_partition_for_groups_company_name_variants():
+    assert partition_for("Acme Inc.", 8) == partition_for("acme", 8) == partition_for(" ACME LLC ", 8)
+    assert all(0 <= partition_for(f"Company {i}", 8) < 8 for i in range(50))
+
+@pytest.mark.asyncio
+async def test_upsert_workers_serialize_each_company(monkeypatch):
+    active = {}
+    overlaps = []
+    done = []
+
+    async def fake_process(job, stats, run=None):
+        if active.get(job.company):
+            overlaps.append(job.company)
+        active[job.company] = True
+        await asyncio.sleep(0)
+        active[job.company] = False
+        done.append(job.external_id)
+        stats["upserted"] += 1
+        return "inserted"
+
+    monkeypatch.setattr(workers_mod, "process_job_safe", fake_process)
+    stats = {"upserted": 0}
+    workers = UpsertWorkers(4, stats)
+    for n in range(40):
+        workers.submit(_job(["Acme", "Beta", "Gamma"][n % 3], n))
+    await workers.join()
+
+    assert stats["upserted"] == 40
+    assert sorted(done, key=int) == [str(n) for n in range(40)]
+    assert overlaps == []
+
+@pytest.mark.asyncio
+async def test_upsert_workers_report_only_persisted_jobs(monkeypatch):
+    async def fake_process(job, stats, run=None):
+        # process_job_safe swallows the error and returns None
+        return None if job.external_id == "1" else "updated"
+
+    monkeypatch.setattr(workers_mod, "process_job_safe", fake_process)
+    workers = UpsertWorkers(2, {})
+    for n in range(3):
+        workers.submit(_job("Acme", n))
+    await workers.join()
+
+    assert [j.external_id for j in workers.persisted] == ["0", "2"]
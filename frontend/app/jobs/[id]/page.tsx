@@ -12,6 +12,14 @@ type JobDetail = {
     dedupe_key: string;
     company_classification: string | null;
     company_category: string | null;
+    remote_flag: string | null;
+    employment_type: string | null;
+    seniority: string | null;
+    ai_forward: boolean | null;
+    opp_athena_view: string | null;
+    opp_role_type: string | null;
+    opp_buyer_or_seller: string | null;
+    opp_confidence: number | null;
 };
 
 import { API_BASE } from "../../../lib/api";
@@ -49,31 +57,32 @@ export default async function JobDetailPage({
         ? new Date(job.posted_at).toLocaleString()
         : "Unknown";
 
-    // Helper to separate raw signals from clean description
-    const parseDescription = (desc: string | null) => {
-        if (!desc) return { clean: null, signals: [] };
-
-        // Split by " || " which seems to be the separator used by the backend
-        const parts = desc.split(" || ");
+    // Raw signals come from the structured metadata columns
+    const buildSignals = (job: JobDetail) => {
         const signals: string[] = [];
-        const cleanParts: string[] = [];
-
-        parts.forEach(part => {
-            const trimmed = part.trim();
-            if (trimmed.startsWith("META:") || trimmed.startsWith("OPP_META:")) {
-                signals.push(trimmed);
-            } else {
-                cleanParts.push(trimmed);
-            }
-        });
-
-        return {
-            clean: cleanParts.join("\n\n").trim(),
-            signals
-        };
+
+        const meta = [
+            job.remote_flag && `remote=${job.remote_flag}`,
+            job.employment_type && `type=${job.employment_type}`,
+            job.seniority && `seniority=${job.seniority}`,
+            job.ai_forward && "ai_forward=true",
+        ].filter(Boolean);
+        if (meta.length > 0) {
+            signals.push(`META: ${meta.join(" | ")}`);
+        }
+
+        if (job.opp_athena_view) {
+            signals.push(
+                `OPP_META: athena_view=${job.opp_athena_view}; role_type=${job.opp_role_type ?? "-"}; ` +
+                `buyer_or_seller=${job.opp_buyer_or_seller ?? "-"}; confidence=${job.opp_confidence?.toFixed(2) ?? "-"}`
+            );
+        }
+
+        return signals;
     };
 
-    const { clean: cleanDescription, signals } = parseDescription(job.description);
+    const cleanDescription = job.description?.trim() || null;
+    const signals = buildSignals(job);
 
     return (
         <main className="min-h-screen bg-gray-50">
@@ -1,4 +1,4 @@
-import CompanyTable from "@/components/CompanyTable";
+import CompanyTable, { Company } from "@/components/CompanyTable";
 import StatsBar, { Stats } from "@/components/StatsBar";
 
 // Function to fetch data. In production this would handle errors/timeouts better.
@@ -9,20 +9,29 @@ const API_URL = API_BASE;
 
 // Function to fetch data. In production this would handle errors/timeouts better.
 // Assuming backend runs on localhost:8000
-async function getCompanies() {
+async function getCompanies(): Promise<Company[]> {
+  // The endpoint is keyset-paginated: follow X-Next-Cursor until the last page
+  const companies: Company[] = [];
+  let cursor: string | null = null;
   try {
-    const res = await fetch(`${API_URL}/api/companies?min_roles=1`, {
-      cache: "no-store",
-    });
+    do {
+      const params = new URLSearchParams({ min_roles: "1", limit: "1000" });
+      if (cursor) params.set("cursor", cursor);
+      const res: Response = await fetch(`${API_URL}/api/companies?${params}`, {
+        cache: "no-store",
+      });
 
-    if (!res.ok) {
-      console.error("Failed to fetch companies", res.status);
-      return [];
-    }
-    return res.json();
+      if (!res.ok) {
+        console.error("Failed to fetch companies", res.status);
+        return companies;
+      }
+      companies.push(...(await res.json()));
+      cursor = res.headers.get("X-Next-Cursor");
+    } while (cursor);
+    return companies;
   } catch (e) {
     console.error("Error fetching companies:", e);
-    return [];
+    return companies;
   }
 }
 
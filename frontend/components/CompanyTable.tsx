@@ -7,7 +7,7 @@ import Link from "next/link";
 
 import { API_BASE } from "../lib/api";
 
-interface Company {
+export interface Company {
     id: number;
     name: string;
     website: string | null;